@@ -0,0 +1,245 @@
+"""
+Industry peer benchmarks, precomputed for every peer group at load time.
+
+Each company's peer group is its primary SIC industry: the first
+``is_primary == 1`` row in ``industries_data`` with a valid industry code
+(``level="industry"``), or that code's two-digit SIC major group
+(``level="major_group"``). For every peer group, statement line item (or
+financial metric) and year we precompute the quartiles, the number of peers
+with a value and each member's percentile rank, so a request only slices arrays.
+Ranks are kept as exact small integers (see :func:`_doubled_ranks`) rather than
+floats to keep the arrays compact.
+"""
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from metrics import METRIC_NAMES, FinancialMetrics
+from screener import Screener
+from search_index import normalize_industry_code
+from statement_store import year_bounds
+
+LEVELS = ("industry", "major_group")
+
+def primary_industry(industries: Sequence[Dict[str, Any]]) -> Optional[Tuple[str, Optional[str]]]:
+    """Return ``(code, description)`` of a company's primary SIC industry, or None."""
+    for industry in industries:
+        if industry.get("is_primary") != 1:
+            continue
+        code = normalize_industry_code(industry.get("industry_code"))
+        if code is not None:
+            description = industry.get("industry_description")
+            return code, description if isinstance(description, str) else None
+    return None
+
+def group_code(code: str, level: str) -> str:
+    """Return the peer group of an industry code at a level."""
+    return code[:2] if level == "major_group" else code
+
+def _quartiles(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the q1/median/q3 (linear interpolation, ignoring NaN) along axis 0 and
+    the number of values present. A sort-based equivalent of ``np.nanpercentile``,
+    which is much slower on many small columns.
+    """
+    ordered = np.sort(values, axis=0)  # NaN sorts last
+    counts = (~np.isnan(values)).sum(axis=0)
+    quartiles = np.full((3,) + values.shape[1:], np.nan)
+    has_values = counts > 0
+    for i, fraction in enumerate((0.25, 0.5, 0.75)):
+        rank = np.where(has_values, (counts - 1) * fraction, 0)
+        low = np.floor(rank).astype(np.int64)
+        high = np.ceil(rank).astype(np.int64)
+        low_values = np.take_along_axis(ordered, low[None], axis=0)[0]
+        high_values = np.take_along_axis(ordered, high[None], axis=0)[0]
+        quartiles[i] = np.where(has_values, low_values + (high_values - low_values) * (rank - low), np.nan)
+    return quartiles, counts
+
+def _doubled_ranks(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Twice each member's percentile rank numerator along axis 0: two times the
+    number of peers with a lower value plus the number with an equal one (itself
+    included). Returns the doubled ranks and where values are present.
+
+    Ranks come from one sort: in sorted order, a value's tie run starts at the
+    number of lower values and spans the equal ones, so this is O(n log n).
+    """
+    present = ~np.isnan(values)
+    order = np.argsort(values, axis=0, kind="stable")  # NaN sorts last
+    ordered = np.take_along_axis(values, order, axis=0)
+    index = np.broadcast_to(np.arange(len(values)).reshape((-1,) + (1,) * (values.ndim - 1)), values.shape)
+
+    run_starts = np.ones(values.shape, dtype=bool)
+    run_starts[1:] = ordered[1:] != ordered[:-1]
+    run_ends = np.ones(values.shape, dtype=bool)
+    run_ends[:-1] = run_starts[1:]
+    lower = np.maximum.accumulate(np.where(run_starts, index, 0), axis=0)
+    last = np.minimum.accumulate(np.where(run_ends, index, len(values) - 1)[::-1], axis=0)[::-1]
+
+    doubled = np.empty(values.shape, dtype=np.int64)
+    np.put_along_axis(doubled, order, lower + last + 1, axis=0)
+    return doubled, present
+
+def _percentile_ranks(values: np.ndarray) -> np.ndarray:
+    """
+    Percentile rank of each member along axis 0: the share of peers with a lower
+    value plus half of those with an equal one (itself included), NaN if missing.
+    """
+    doubled, present = _doubled_ranks(values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ranks = doubled / (2 * present.sum(axis=0)) * 100
+    ranks[~present] = np.nan
+    return ranks
+
+def _missing_rank(dtype: np.dtype) -> int:
+    """The doubled rank stored for a missing value: the largest value of the type."""
+    return int(np.iinfo(dtype).max)
+
+def _group_distributions(
+    values: np.ndarray, groups: Sequence[np.ndarray], company_count: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Precompute peer group distributions of a (company x item x year) array.
+
+    Returns the q1/median/q3 of each group (group x 3 x item x year), the number of
+    peers with a value (group x item x year) and each company's doubled rank within
+    its group (company x item x year, :func:`_missing_rank` where it has no value).
+    Counts and ranks use the smallest unsigned type that fits.
+    """
+    count_dtype = np.min_scalar_type(company_count)
+    rank_dtype = np.min_scalar_type(2 * company_count + 1)
+    quartiles = np.empty((len(groups), 3) + values.shape[1:])
+    counts = np.empty((len(groups),) + values.shape[1:], dtype=count_dtype)
+    ranks = np.full(values.shape, _missing_rank(rank_dtype), dtype=rank_dtype)
+    for number, positions in enumerate(groups):
+        group_values = values[positions]
+        quartiles[number], counts[number] = _quartiles(group_values)
+        doubled, present = _doubled_ranks(group_values)
+        ranks[positions] = np.where(present, doubled, _missing_rank(rank_dtype))
+    return quartiles, counts, ranks
+
+class PeerBenchmarks:
+    """
+    Per-industry distributions of statement values and metrics for every year.
+
+    Every peer group's quartiles, peer counts and percentile ranks are computed
+    when the benchmarks are built, which :func:`data_loader.derive_indexes` does
+    at load and reload time.
+    """
+
+    def __init__(self, screener: Screener, financial_metrics: FinancialMetrics, industries_data: Mapping):
+        self.duns_order = screener.duns_order
+        self.years = screener.years
+        self.reported = screener.reported
+        self._positions: Dict[str, int] = {duns: i for i, duns in enumerate(self.duns_order)}
+        self.screener = screener
+        self.financial_metrics = financial_metrics
+        # source -> item names in index order
+        self.item_names: Dict[str, List[str]] = {
+            statement: screener.line_items(statement) for statement in screener.statements
+        }
+        self.item_names["metrics"] = METRIC_NAMES
+
+        self.industries: List[Optional[Tuple[str, Optional[str]]]] = [
+            primary_industry(industries_data.get(duns, [])) for duns in self.duns_order
+        ]
+
+        # (level, group) -> member positions, ascending, and the group's number within its level
+        self.groups: Dict[Tuple[str, str], np.ndarray] = {}
+        self.group_numbers: Dict[Tuple[str, str], int] = {}
+        # (level, source) -> (q1/median/q3, peers with a value, doubled ranks); see _group_distributions
+        self.stats: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+        all_positions = np.arange(len(self.duns_order))
+        source_values = {source: self.values(source, all_positions) for source in self.item_names}
+        for level in LEVELS:
+            members: Dict[str, List[int]] = {}
+            for position, industry in enumerate(self.industries):
+                if industry is not None:
+                    members.setdefault(group_code(industry[0], level), []).append(position)
+            level_groups = []
+            for number, (group, positions) in enumerate(members.items()):
+                self.groups[(level, group)] = np.array(positions)
+                self.group_numbers[(level, group)] = number
+                level_groups.append(self.groups[(level, group)])
+            for source, values in source_values.items():
+                self.stats[(level, source)] = _group_distributions(values, level_groups, len(self.duns_order))
+
+    def values(self, source: str, positions: np.ndarray) -> np.ndarray:
+        """Return a source's (company x item x year) values for the companies at ``positions``."""
+        if source == "metrics":
+            return np.stack([self.financial_metrics.values[name][positions] for name in METRIC_NAMES], axis=1)
+        return self.screener.values(source, positions)
+
+    def item_index(self, source: str, name: str) -> Optional[int]:
+        """Return an item's index given its name (or a statement line item's taxonomy id), or None."""
+        if source == "metrics":
+            return METRIC_NAMES.index(name) if name in METRIC_NAMES else None
+        try:
+            return self.screener.item_index(source, name)
+        except ValueError:
+            return None
+
+    def company(
+        self,
+        duns: str,
+        source: str,
+        line_items: Optional[Sequence[str]] = None,
+        level: str = "industry",
+        year: Optional[int] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return a company's benchmarks against its peer group, or None if it has
+        no primary industry. Years are those the company reports, newest first;
+        line items are exact names or taxonomy ids, and unknown ones are skipped.
+        """
+        position = self._positions.get(duns)
+        industry = self.industries[position] if position is not None else None
+        if industry is None:
+            return None
+
+        code, description = industry
+        group = group_code(code, level)
+        quartiles, counts, doubled = self.stats[(level, source)]
+        number = self.group_numbers[(level, group)]
+        quartiles, counts, doubled = quartiles[number], counts[number], doubled[position]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ranks = doubled / (2 * counts) * 100
+        ranks[doubled == _missing_rank(doubled.dtype)] = np.nan
+
+        columns = self.reported[position].copy()
+        low, high = year_bounds(year, year_from, year_to)
+        if low is not None:
+            columns &= self.years >= low
+        if high is not None:
+            columns &= self.years <= high
+        columns = np.flatnonzero(columns)[::-1]
+
+        def as_list(values: np.ndarray) -> List[Optional[float]]:
+            return np.where(np.isnan(values), None, values).tolist()
+
+        benchmarks = []
+        item_names = self.item_names[source]
+        values = self.values(source, np.array([position]))[0]
+        for name in line_items if line_items else item_names:
+            item = self.item_index(source, name)
+            if item is None:
+                continue
+            benchmarks.append({
+                "line_item": item_names[item],
+                "value": as_list(values[item, columns]),
+                "percentile_rank": as_list(ranks[item, columns]),
+                "peer_count": counts[item, columns].tolist(),
+                "q1": as_list(quartiles[0, item, columns]),
+                "median": as_list(quartiles[1, item, columns]),
+                "q3": as_list(quartiles[2, item, columns]),
+            })
+
+        return {
+            "industry_code": group,
+            "industry_description": description if level == "industry" else None,
+            "peer_group_size": len(self.groups[(level, group)]),
+            "years": self.years[columns].tolist(),
+            "benchmarks": benchmarks,
+        }
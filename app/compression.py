@@ -0,0 +1,178 @@
+"""
+HTTP response compression: gzip, plus brotli and zstd when their packages are installed.
+
+The encoding is negotiated from ``Accept-Encoding`` (q-values are honoured; among
+equally acceptable encodings the server prefers br, then zstd, then gzip).
+Responses are compressed on one of two paths:
+
+* cached endpoints (:func:`response_cache.cached_response`) store each compressed
+  variant in the response cache next to the raw body, so a hot response is
+  compressed once rather than per request, and send an ETag per encoding
+* :class:`CompressionMiddleware` compresses everything else as it is sent,
+  including streamed exports, chunk by chunk, and gives the ETag of a body it
+  compresses the encoding's suffix
+
+Responses that already carry a ``Content-Encoding`` pass through the middleware
+untouched, so nothing is compressed twice.
+"""
+import gzip
+import os
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Optional dependency: br is not offered
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency: zstd is not offered
+    zstandard = None
+
+# Encodings this server can produce, most preferred first
+AVAILABLE_ENCODINGS = [
+    encoding for encoding, available in (("br", brotli is not None), ("zstd", zstandard is not None), ("gzip", True))
+    if available
+]
+
+# Encodings to offer, most preferred first (RESPONSE_COMPRESSION=off disables compression)
+_configured = os.environ.get("RESPONSE_COMPRESSION", ",".join(AVAILABLE_ENCODINGS)).lower()
+COMPRESSION_ENCODINGS: List[str] = [
+    encoding for encoding in (part.strip() for part in _configured.split(",")) if encoding in AVAILABLE_ENCODINGS
+]
+
+# Bodies smaller than this are sent uncompressed
+COMPRESSION_MIN_BYTES = int(os.environ.get("RESPONSE_COMPRESSION_MIN_BYTES", "500"))
+
+# Levels for bodies compressed once and cached, and for bodies compressed as they are sent
+CACHED_LEVELS: Dict[str, int] = {"br": 9, "zstd": 12, "gzip": 9}
+STREAM_LEVELS: Dict[str, int] = {"br": 4, "zstd": 3, "gzip": 6}
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Return the content coding to use for an Accept-Encoding header, or None for identity."""
+    if not accept_encoding or not COMPRESSION_ENCODINGS:
+        return None
+
+    qualities: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, *parameters = (piece.strip() for piece in part.split(";"))
+        quality = 1.0
+        for parameter in parameters:
+            if parameter.startswith("q="):
+                try:
+                    quality = float(parameter[2:])
+                except ValueError:
+                    quality = 0.0
+        if name:
+            qualities[name.lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in COMPRESSION_ENCODINGS:
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+def encoded_etag(etag: str, encoding: Optional[str]) -> str:
+    """Derive the ETag of a compressed variant from the strong ETag of its raw body."""
+    return etag if encoding is None else f'{etag[:-1]}-{encoding}"'
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """Compress a whole body (at the cached level unless ``level`` is given)."""
+    level = CACHED_LEVELS[encoding] if level is None else level
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(body)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+def _stream_compressor(encoding: str) -> Tuple[Callable[[bytes], bytes], Callable[[], bytes]]:
+    """Return ``(compress_chunk, finish)`` functions for compressing a body sent in chunks."""
+    level = STREAM_LEVELS[encoding]
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=level)
+        return compressor.process, compressor.finish
+    if encoding == "zstd":
+        compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        return compressor.compress, compressor.flush
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress, compressor.flush
+
+class CompressionMiddleware:
+    """Compress responses with the negotiated encoding, unless already encoded or too small."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding")) if scope["type"] == "http" else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressionResponder(self.app, encoding, self.minimum_size)(scope, receive, send)
+
+class _CompressionResponder:
+    """Compresses one response, holding back its start message until the first body chunk."""
+
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send: Optional[Send] = None
+        self.start_message: Optional[Message] = None
+        self.passthrough = False
+        self.compressor: Optional[Tuple[Callable[[bytes], bytes], Callable[[], bytes]]] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            self.passthrough = "content-encoding" in Headers(raw=message["headers"])
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start_message is not None:
+            start_message, self.start_message = self.start_message, None
+            if self.passthrough or (not more_body and len(body) < self.minimum_size):
+                self.passthrough = True
+                await self.send(start_message)
+                await self.send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            if "etag" in headers:
+                headers["ETag"] = encoded_etag(headers["etag"], self.encoding)
+            if "accept-encoding" not in headers.get("vary", "").lower():
+                headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                # Streamed: compress chunk by chunk, length unknown up front
+                del headers["Content-Length"]
+                self.compressor = _stream_compressor(self.encoding)
+            else:
+                body = compress(body, self.encoding, STREAM_LEVELS[self.encoding])
+                headers["Content-Length"] = str(len(body))
+                await self.send(start_message)
+                await self.send({**message, "body": body})
+                return
+            await self.send(start_message)
+
+        if self.passthrough:
+            await self.send(message)
+            return
+        compress_chunk, finish = self.compressor
+        chunk = compress_chunk(body)
+        if not more_body:
+            chunk += finish()
+        await self.send({**message, "body": chunk})
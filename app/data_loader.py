@@ -1,20 +1,125 @@
 """
 Data loader module for loading company CSV data into memory.
+
+Loads never modify the served data in place: each one parses into a new state
+dict (module global name -> value), derives the indexes from it and then
+publishes everything with a single ``globals().update``. A reload therefore
+runs alongside request handling, and handlers always see fully built values.
+
+In lazy mode (DATA_LAZY) only company info and industries are loaded up front.
+The other categories and the indexes built from statements are left out of the
+module globals and loaded by the module ``__getattr__`` on first access, so
+``data_loader.balance_sheet_data`` works the same in both modes.
 """
+import hashlib
+import io
+import json
 import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
 import pandas as pd
+import snapshot
+from benchmarks import PeerBenchmarks
+from metrics import FinancialMetrics
+from screener import Screener
+from search_index import SearchIndex
+from statement_store import StatementStore
 
 # Global data storage
 company_data: Dict[str, Dict[str, str]] = {}
-balance_sheet_data: Dict[str, List[Dict]] = {}
-income_statement_data: Dict[str, List[Dict]] = {}
-cash_flow_data: Dict[str, List[Dict]] = {}
+balance_sheet_data: StatementStore = StatementStore.empty()
+income_statement_data: StatementStore = StatementStore.empty()
+cash_flow_data: StatementStore = StatementStore.empty()
 industries_data: Dict[str, List[Dict]] = {}
 people_data: Dict[str, List[Dict]] = {}
 operations_data: Dict[str, List[Dict]] = {}
 
+# Content hash of each loaded CSV file: category folder -> DUNS -> version
+data_versions: Dict[str, Dict[str, str]] = {}
+# Hash over every file version, for responses that depend on the whole dataset
+dataset_version: str = ""
+# Incremented on every (re)load so caches of derived responses know to drop their entries
+data_version: int = 0
+# (size, mtime_ns) of each loaded CSV file, so reloads can skip files that have not changed
+file_signatures: Dict[str, Dict[str, Tuple[int, int]]] = {}
+
+# Indexes derived from the data above, rebuilt whenever it is (re)loaded
+search_index: SearchIndex = SearchIndex({}, {})
+# Industry roll-up for GET /industries, sorted by company count (descending)
+industry_summary: List[Dict[str, Any]] = []
+# Statement cubes aligned to company_data order, for POST /screen
+screener: Screener = Screener([], {})
+# Ratios and growth metrics for every company and year, for the metrics endpoints
+financial_metrics: FinancialMetrics = FinancialMetrics(screener)
+# Per-industry distributions and percentile ranks, for the benchmark endpoint
+peer_benchmarks: PeerBenchmarks = PeerBenchmarks(screener, financial_metrics, {})
+
+# Wall-clock seconds spent on each category during the last load
+load_timings: Dict[str, float] = {}
+# Whether the last load_all_data() deferred categories (lazy mode), reported by /health
+lazy_loading: bool = False
+
+# Outcome of the most recent reload_data() call, reported by /health
+last_reload: Optional[Dict[str, Any]] = None
+
+# Snapshot this process serves and keeps in step with other workers: (path, shared), or None
+serving_snapshot: Optional[Tuple[str, bool]] = None
+# Fingerprint of the CSV data behind the loaded snapshot (None if unknown)
+snapshot_fingerprint: Optional[str] = None
+
+# Serializes reloads; publishing a new state and lazily loading a global hold the publish lock
+_reload_lock = threading.Lock()
+_publish_lock = threading.RLock()
+
+# Parallel loading: pool size (0 or 1 loads sequentially) and pool type ("thread" or "process")
+LOADER_WORKERS = int(os.environ.get("DATA_LOADER_WORKERS", "0"))
+LOADER_EXECUTOR = os.environ.get("DATA_LOADER_EXECUTOR", "thread")
+
+# Binary snapshot of the parsed data, reused across restarts while the CSVs are unchanged
+SNAPSHOT_PATH = os.environ.get("DATA_SNAPSHOT_PATH")
+
+# Serve data from a memory-mapped snapshot shared by all workers instead of per-worker copies
+SHARED_MMAP = os.environ.get("DATA_SHARED_MMAP", "").lower() in ("1", "true", "yes")
+
+# Load categories other than EAGER_CATEGORIES (and the indexes built from them) on first access
+LAZY_LOADING = os.environ.get("DATA_LAZY", "").lower() in ("1", "true", "yes")
+# In lazy mode, read people and operations files per company, keeping at most this many
+# companies per category (0 loads each of those categories whole)
+LAZY_COMPANY_CACHE_SIZE = int(os.environ.get("DATA_LAZY_COMPANY_CACHE", "0"))
+
+# Categories that listing and search need, loaded up front even in lazy mode
+EAGER_CATEGORIES = ("company_info", "industries")
+# Categories that can be read per company in lazy mode
+PER_COMPANY_CATEGORIES = ("people", "operations")
+# Indexes built from the statement categories, which lazy mode builds on first access
+STATEMENT_INDEXES = ("screener", "financial_metrics", "peer_benchmarks")
+
+FINANCIAL_FOLDERS = ("balance_sheet", "income_statement", "cash_flow_statement")
+
+# Statement type names used by the API -> category folder holding that statement
+STATEMENT_TYPES = {
+    "balance_sheet": "balance_sheet",
+    "income_statement": "income_statement",
+    "cash_flow": "cash_flow_statement",
+}
+
+# Category folders in load order: (folder name, module global it populates, label for messages)
+CATEGORIES = [
+    ("company_info", "company_data", "company info"),
+    ("balance_sheet", "balance_sheet_data", "balance sheets"),
+    ("income_statement", "income_statement_data", "income statements"),
+    ("cash_flow_statement", "cash_flow_data", "cash flow statements"),
+    ("industries", "industries_data", "industries"),
+    ("people", "people_data", "people"),
+    ("operations", "operations_data", "operations"),
+]
+
 def get_data_path() -> Path:
     """Get the path to the CompanyData directory."""
     # From app/ directory, go up one level to project root, then into data/CompanyData
@@ -22,129 +127,767 @@ def get_data_path() -> Path:
     data_path = current_dir.parent / "data" / "CompanyData"
     return data_path
 
-def load_company_info():
-    """Load company info CSV files into memory."""
-    data_path = get_data_path() / "company_info"
+def get_default_snapshot_path() -> Path:
+    """Get the snapshot path used for shared memory-mapped data when none is configured."""
+    return get_data_path().parent / ".snapshot" / "company_data.snapshot"
 
-    if not data_path.exists():
-        print(f"Warning: {data_path} does not exist")
-        return
-
-    for csv_file in data_path.glob("*.csv"):
-        duns = csv_file.stem  # filename without extension
-
-        try:
-            df = pd.read_csv(csv_file)
-            # Convert field/value pairs to dictionary
-            company_info = {}
-            for _, row in df.iterrows():
-                field = row['field']
-                value = row['value']
-                company_info[field] = value
-
-            company_data[duns] = company_info
-        except Exception as e:
-            print(f"Error loading {csv_file}: {e}")
-
-def load_financial_data(folder_name: str, target_dict: Dict[str, List[Dict]]):
-    """Load financial statement CSV files (balance sheet, income statement, cash flow)."""
+def list_csv_files(folder_name: str) -> List[Path]:
+    """List the CSV files in a category folder (one file per DUNS number)."""
     data_path = get_data_path() / folder_name
 
     if not data_path.exists():
         print(f"Warning: {data_path} does not exist")
-        return
+        return []
 
-    for csv_file in data_path.glob("*.csv"):
-        duns = csv_file.stem
+    return list(data_path.glob("*.csv"))
 
-        try:
-            df = pd.read_csv(csv_file)
-            # Convert to list of dictionaries
-            records = df.to_dict('records')
-            target_dict[duns] = records
-        except Exception as e:
-            print(f"Error loading {csv_file}: {e}")
+def parse_csv(folder_name: str, csv_file: Path, content: Optional[bytes] = None) -> Optional[Any]:
+    """
+    Read one CSV file into the form stored for its category (None if it fails to load).
 
-def load_industries():
-    """Load industry classification CSV files."""
-    data_path = get_data_path() / "industries"
+    ``content`` is the file's bytes, when the caller has already read them.
+    """
+    source = io.BytesIO(content) if content is not None else csv_file
+    try:
+        if folder_name in FINANCIAL_FOLDERS:
+            # Keep values as raw strings; the store parses them into a float column
+            return pd.read_csv(source, dtype={"line_item": str, "value": str})
 
-    if not data_path.exists():
-        print(f"Warning: {data_path} does not exist")
+        df = pd.read_csv(source)
+        if folder_name == "company_info":
+            # Convert field/value pairs to dictionary
+            return dict(zip(df['field'], df['value']))
+        return df.to_dict('records')
+    except Exception as e:
+        print(f"Error loading {csv_file}: {e}")
+        return None
+
+def content_version(content: bytes) -> str:
+    """Short content hash of a CSV file, used as its data version (e.g. in ETags)."""
+    return hashlib.blake2b(content, digest_size=12).hexdigest()
+
+def _read_and_parse_csv(
+    folder_name: str, csv_file: Path, known_version: Optional[str] = None
+) -> Tuple[Optional[Any], Optional[str]]:
+    """
+    Parse one CSV file, returning the result and its content version (runs in pool workers).
+
+    If the content still has ``known_version`` it is not parsed and the result is None.
+    """
+    try:
+        content = csv_file.read_bytes()
+    except OSError as e:
+        print(f"Error loading {csv_file}: {e}")
+        return None, None
+    version = content_version(content)
+    if version == known_version:
+        return None, version
+    return parse_csv(folder_name, csv_file, content), version
+
+def file_signature(csv_file: Path) -> Optional[Tuple[int, int]]:
+    """Return a file's (size, mtime_ns), or None if it cannot be read."""
+    try:
+        stat = csv_file.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+def _start_category(
+    folder_name: str, executor: Optional[Executor], workers: int = 1
+) -> Tuple[List[Path], Iterator]:
+    """Start parsing a category's files, on the executor if one is given."""
+    csv_files = list_csv_files(folder_name)
+    return csv_files, _start_files(folder_name, csv_files, executor, workers)
+
+def _start_files(
+    folder_name: str,
+    csv_files: List[Path],
+    executor: Optional[Executor],
+    workers: int = 1,
+    known_versions: Optional[List[Optional[str]]] = None,
+) -> Iterator:
+    """
+    Start parsing the given files of a category, on the executor if one is given.
+
+    ``known_versions`` holds each file's loaded content version, so unchanged files are not parsed.
+    """
+    parse = partial(_read_and_parse_csv, folder_name)
+    if known_versions is None:
+        known_versions = [None] * len(csv_files)
+
+    if executor is None:
+        return map(parse, csv_files, known_versions)
+
+    # Executor.map submits every file up front, so categories are read concurrently
+    # (batched so process pools do not pay one round trip per small file)
+    chunksize = max(1, len(csv_files) // (workers * 4))
+    return executor.map(parse, csv_files, known_versions, chunksize=chunksize)
+
+def _build_category(folder_name: str, parsed: Dict[str, Any]) -> Any:
+    """Turn a category's parsed files into the structure kept in memory."""
+    if folder_name in FINANCIAL_FOLDERS:
+        return StatementStore.from_frames(parsed.items())
+    return parsed
+
+def _update_category(folder_name: str, previous: Any, duns_order: List[str], parsed: Dict[str, Any]) -> Any:
+    """
+    Build a category of the ``duns_order`` companies from newly ``parsed`` files,
+    keeping the ``previous`` data of the others.
+    """
+    if folder_name in FINANCIAL_FOLDERS:
+        return previous.updated(duns_order, parsed)
+    return {duns: parsed[duns] if duns in parsed else previous[duns] for duns in duns_order}
+
+class LazyRecords(Mapping):
+    """
+    A category's records read from each company's CSV on first access, keeping
+    the ``max_companies`` most recently used (lazy mode with DATA_LAZY_COMPANY_CACHE).
+
+    Membership and length come from the file listing, so they need no parsing.
+    """
+
+    def __init__(self, folder_name: str, csv_files: List[Path], max_companies: int):
+        self.folder_name = folder_name
+        self.max_companies = max_companies
+        self._files: Dict[str, Path] = {csv_file.stem: csv_file for csv_file in csv_files}
+        self._records: "OrderedDict[str, Any]" = OrderedDict()
+        self._versions: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, duns: str) -> Any:
+        with self._lock:
+            if duns in self._records:
+                self._records.move_to_end(duns)
+                return self._records[duns]
+
+        result, version = _read_and_parse_csv(self.folder_name, self._files[duns])
+        with self._lock:
+            self._versions[duns] = version or ""
+            if result is not None:
+                self._records[duns] = result
+                while len(self._records) > self.max_companies:
+                    self._records.popitem(last=False)
+        return result
+
+    def __getitem__(self, duns: str) -> Any:
+        result = self._load(duns) if duns in self._files else None
+        if result is None:
+            raise KeyError(duns)
+        return result
+
+    def __contains__(self, duns: object) -> bool:
+        return duns in self._files
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._files)
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def version(self, duns: str) -> str:
+        """Content version of a company's file, reading it if it has not been."""
+        if duns not in self._versions and duns in self._files:
+            self._load(duns)
+        return self._versions.get(duns, "")
+
+    @property
+    def resident_companies(self) -> int:
+        """Number of companies whose records are in memory."""
+        return len(self._records)
+
+def load_category(folder_name: str, executor: Optional[Executor] = None) -> Any:
+    """Load a single category folder (e.g. "balance_sheet") and return its in-memory form."""
+    csv_files, results = _start_category(folder_name, executor)
+    parsed = {
+        csv_file.stem: result
+        for csv_file, (result, _) in zip(csv_files, results)
+        if result is not None
+    }
+    return _build_category(folder_name, parsed)
+
+def _pool_size(workers: int) -> int:
+    """Cap a requested pool size at the CPU count; 1 means load sequentially."""
+    return max(1, min(workers, os.cpu_count() or 1))
+
+def _create_executor(workers: int, executor_type: str) -> Optional[Executor]:
+    """Create the pool used for parallel loading, or None to load sequentially."""
+    if executor_type not in ("thread", "process"):
+        raise ValueError(f"Unknown loader executor type: {executor_type!r} (expected 'thread' or 'process')")
+    if workers <= 1:
+        return None
+    if executor_type == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=workers)
+
+def _parse_categories(
+    workers: int, executor_type: str, reuse: bool = False, folders: Optional[Sequence[str]] = None
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Parse every category from CSV into a new state dict, leaving the module globals alone.
+
+    With ``reuse``, the loaded data is kept for files whose size and modification
+    time are unchanged (which are not read) or whose content hash is unchanged
+    (which are read but not parsed), and categories without changes keep their
+    loaded object. Returns the state and counts of files ``parsed``, ``reused`` and
+    ``removed``, plus the ``changed`` category globals.
+
+    Categories not in ``folders`` (default: all) are only listed: the state records
+    their file signatures, keeps a loaded value while they are unchanged and leaves
+    them out (to load on first access) otherwise.
+    """
+    workers = _pool_size(workers)
+    executor = _create_executor(workers, executor_type)
+    state: Dict[str, Any] = {"data_versions": {}, "file_signatures": {}, "load_timings": {}}
+    stats: Dict[str, Any] = {"parsed": 0, "reused": 0, "removed": 0, "changed": set()}
+
+    try:
+        # Submit every category before collecting any, so a pool works on all of them at once
+        category_start = time.perf_counter()
+        started = []
+        for folder_name, global_name, label in CATEGORIES:
+            csv_files = list_csv_files(folder_name)
+            signatures = {csv_file.stem: file_signature(csv_file) for csv_file in csv_files}
+            if folders is not None and folder_name not in folders:
+                state["file_signatures"][folder_name] = signatures
+                if not reuse or signatures != file_signatures.get(folder_name):
+                    stats["changed"].add(global_name)
+                elif global_name in globals():
+                    state[global_name] = globals()[global_name]
+                continue
+            loaded_versions = data_versions.get(folder_name, {}) if reuse else {}
+            loaded_signatures = file_signatures.get(folder_name, {}) if reuse else {}
+            unchanged = {
+                duns for duns, signature in signatures.items()
+                if signature is not None and duns in loaded_versions and loaded_signatures.get(duns) == signature
+            }
+            to_read = [csv_file for csv_file in csv_files if csv_file.stem not in unchanged]
+            known_versions = [loaded_versions.get(csv_file.stem) for csv_file in to_read]
+            results = _start_files(folder_name, to_read, executor, workers, known_versions)
+            started.append((folder_name, global_name, label, csv_files, signatures, unchanged, to_read, results))
+
+        for folder_name, global_name, label, csv_files, signatures, unchanged, to_read, results in started:
+            loaded_versions = data_versions.get(folder_name, {}) if reuse else {}
+            parsed = {}
+            versions = {}
+            category_signatures = {}
+            for csv_file, (result, version) in zip(to_read, results):
+                duns = csv_file.stem
+                if result is not None:
+                    parsed[duns] = result
+                    stats["parsed"] += 1
+                elif version is None or version != loaded_versions.get(duns):
+                    continue  # Unreadable, or failed to parse
+                versions[duns] = version
+                category_signatures[duns] = signatures[duns]
+            for duns in unchanged:
+                versions[duns] = loaded_versions[duns]
+                category_signatures[duns] = signatures[duns]
+            stats["reused"] += len(versions) - len(parsed)
+            stats["removed"] += len(loaded_versions.keys() - versions.keys())
+
+            # Companies in file order, as a full load would have them
+            duns_order = [csv_file.stem for csv_file in csv_files if csv_file.stem in versions]
+            # Wall time waiting for this category's files (in a pool, others are parsed meanwhile)
+            build_start = time.perf_counter()
+            parse_seconds = build_start - category_start
+            if not reuse:
+                state[global_name] = _build_category(folder_name, parsed)
+            elif parsed or versions.keys() != loaded_versions.keys():
+                state[global_name] = _update_category(folder_name, globals()[global_name], duns_order, parsed)
+            else:
+                state[global_name] = globals()[global_name]
+            if state[global_name] is not globals().get(global_name):
+                stats["changed"].add(global_name)
+            category_end = time.perf_counter()
+            build_seconds = category_end - build_start
+
+            state["data_versions"][folder_name] = versions
+            state["file_signatures"][folder_name] = category_signatures
+            state["load_timings"][folder_name] = category_end - category_start
+            print(
+                f"Loaded {label} for {len(versions)} companies, {len(parsed)} parsed "
+                f"(parse {parse_seconds:.2f}s, build {build_seconds:.2f}s)"
+            )
+            category_start = category_end
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return state, stats
+
+def _load_from_csv(workers: int, executor_type: str, folders: Optional[Sequence[str]] = None) -> str:
+    """Parse the categories in ``folders`` (default: all) from CSV and publish them; returns a description of the mode."""
+    state, _ = _parse_categories(workers, executor_type, folders=folders)
+    _publish(state)
+    workers = _pool_size(workers)
+    return f"{workers} {executor_type} workers" if workers > 1 else "sequential"
+
+def summarize_industries(industries: Dict[str, List[Dict]]) -> List[Dict[str, Any]]:
+    """Aggregate industry classifications across companies, sorted by company count."""
+    industry_map: Dict[str, Dict] = {}
+
+    for duns, industries_list in industries.items():
+        for industry_item in industries_list:
+            code = industry_item.get("industry_code", "")
+            description = industry_item.get("industry_description", "")
+
+            # Convert code to string and skip NaN or empty values
+            code = str(code) if code is not None and str(code) != "nan" else ""
+            description = str(description) if description is not None and str(description) != "nan" else ""
+
+            if code:
+                if code not in industry_map:
+                    industry_map[code] = {
+                        "industry_code": code,
+                        "industry_description": description,
+                        "company_count": 0
+                    }
+                industry_map[code]["company_count"] += 1
+
+    return sorted(industry_map.values(), key=lambda item: item["company_count"], reverse=True)
+
+def derive_indexes(state: Dict[str, Any], changed: Optional[Set[str]] = None) -> Dict[str, Any]:
+    """
+    Build the lookup indexes for a state dict holding the loaded categories and their data versions.
+
+    ``changed`` names the category globals that differ from the loaded ones; indexes
+    built only from other categories are kept. None rebuilds everything. Statement
+    indexes are left out (to build on first access) while a statement category is.
+    """
+    start = time.perf_counter()
+    statement_globals = [
+        next(name for folder, name, _ in CATEGORIES if folder == folder_name)
+        for folder_name in STATEMENT_TYPES.values()
+    ]
+
+    def stale(*global_names: str) -> bool:
+        return changed is None or not changed.isdisjoint(global_names)
+
+    # The whole-dataset hash also covers categories not loaded yet, through their file signatures
+    versions = {
+        folder_name: state["data_versions"].get(folder_name) or state["file_signatures"].get(folder_name, {})
+        for folder_name, _, _ in CATEGORIES
+    }
+    indexes = {"dataset_version": content_version(json.dumps(versions, sort_keys=True).encode())}
+    if stale("company_data", "industries_data"):
+        indexes["search_index"] = SearchIndex(state["company_data"], state["industries_data"])
+        indexes["industry_summary"] = summarize_industries(state["industries_data"])
+    else:
+        indexes["search_index"], indexes["industry_summary"] = search_index, industry_summary
+
+    statements_loaded = all(name in state for name in statement_globals)
+    if not stale("company_data", "industries_data", *statement_globals):
+        indexes.update({name: globals()[name] for name in STATEMENT_INDEXES if name in globals()})
+    elif statements_loaded:
+        if stale("company_data", *statement_globals) or "screener" not in globals():
+            indexes["screener"] = Screener(
+                indexes["search_index"].duns_order,
+                {statement: state[name] for statement, name in zip(STATEMENT_TYPES, statement_globals)}
+            )
+            indexes["financial_metrics"] = FinancialMetrics(indexes["screener"])
+        else:
+            indexes["screener"], indexes["financial_metrics"] = screener, financial_metrics
+        indexes["peer_benchmarks"] = PeerBenchmarks(
+            indexes["screener"], indexes["financial_metrics"], state["industries_data"]
+        )
+    print(f"Built indexes in {time.perf_counter() - start:.2f}s")
+    return indexes
+
+def _publish(state: Dict[str, Any], changed: Optional[Set[str]] = None):
+    """
+    Derive indexes for a newly loaded state and swap it in as the module globals.
+
+    Every value is built before the swap, which is a single ``globals().update``.
+    ``changed`` limits which indexes are rebuilt (see :func:`derive_indexes`).
+    Categories and statement indexes missing from the state are removed, to be
+    loaded on first access.
+    """
+    state = {**state, **derive_indexes(state, changed)}
+    with _publish_lock:
+        state["data_version"] = data_version + 1
+        globals().update(state)
+        for name in [global_name for _, global_name, _ in CATEGORIES] + list(STATEMENT_INDEXES):
+            if name not in state:
+                globals().pop(name, None)
+
+def _resident_categories() -> Dict[str, Any]:
+    """The category globals currently in memory, keyed by global name."""
+    return {global_name: globals()[global_name] for _, global_name, _ in CATEGORIES if global_name in globals()}
+
+def build_indexes():
+    """Rebuild the lookup indexes derived from the loaded data."""
+    _publish({
+        **_resident_categories(),
+        "data_versions": data_versions,
+        "file_signatures": file_signatures,
+    })
+
+def save_snapshot(path: Path, fingerprint: str):
+    """Write the currently loaded data to a snapshot file."""
+    arrays = {}
+    stores = {}
+    record_keys = {}
+    for folder_name, global_name, _ in CATEGORIES:
+        value = _loaded(global_name)
+        if folder_name in FINANCIAL_FOLDERS:
+            store_arrays, stores[folder_name] = value.to_snapshot()
+            arrays.update({f"{folder_name}.{name}": array for name, array in store_arrays.items()})
+        else:
+            # One JSON document per company, packed so workers can decode records on access
+            record_keys[folder_name] = list(value.keys())
+            documents = [json.dumps(record) for record in value.values()]
+            arrays[f"{folder_name}.offsets"], arrays[f"{folder_name}.data"] = snapshot.pack_strings(documents)
+
+    objects = {
+        "stores": stores,
+        "record_keys": record_keys,
+        "data_versions": data_versions,
+        "file_signatures": file_signatures,
+    }
+    snapshot.write_snapshot(path, fingerprint, arrays, objects)
+
+def load_snapshot(path: Path, fingerprint: Optional[str], shared: bool = False) -> bool:
+    """
+    Replace the loaded data with a snapshot's contents; False if there is no valid snapshot.
+    A ``fingerprint`` of None accepts a snapshot of older CSV data.
+
+    With ``shared``, records and strings are read through the memory map on access
+    instead of being decoded into per-process dicts and lists.
+    """
+    loaded = snapshot.read_snapshot(path, fingerprint)
+    if loaded is None:
+        return False
+
+    arrays, objects = loaded
+    state: Dict[str, Any] = {}
+    for folder_name, global_name, _ in CATEGORIES:
+        prefix = f"{folder_name}."
+        category_arrays = {
+            name[len(prefix):]: array for name, array in arrays.items() if name.startswith(prefix)
+        }
+        if folder_name in FINANCIAL_FOLDERS:
+            value = StatementStore.from_snapshot(category_arrays, objects["stores"][folder_name], shared)
+        else:
+            documents = snapshot.StringTable(category_arrays["offsets"], category_arrays["data"])
+            value = snapshot.MappedRecords(objects["record_keys"][folder_name], documents)
+            if not shared:
+                value = dict(value)
+        state[global_name] = value
+
+    state["data_versions"] = objects["data_versions"]
+    # JSON stores each (size, mtime_ns) signature as a list
+    state["file_signatures"] = {
+        folder_name: {duns: tuple(signature) if signature is not None else None for duns, signature in signatures.items()}
+        for folder_name, signatures in objects.get("file_signatures", {}).items()
+    }
+    state["snapshot_fingerprint"] = fingerprint
+    _publish(state)
+    return True
+
+def _write_snapshot(path: Path, fingerprint: str, shared: bool):
+    """Write the loaded data to the snapshot and, when ``shared``, serve the new mapping."""
+    global snapshot_fingerprint
+    try:
+        save_snapshot(path, fingerprint)
+        print(f"Wrote snapshot {path}")
+    except OSError as e:
+        print(f"Warning: could not write snapshot {path}: {e}")
         return
+    if shared:
+        # Swap this worker's private copy for the mapped one the other workers use
+        load_snapshot(path, fingerprint, shared)
+    else:
+        with _publish_lock:
+            snapshot_fingerprint = fingerprint
+
+def sync_snapshot() -> bool:
+    """
+    Load the snapshot again if another worker has rewritten it since this one loaded it.
+
+    Returns whether new data was swapped in. Cheap when nothing changed: only the
+    snapshot header is read.
+    """
+    if serving_snapshot is None:
+        return False
+    path, shared = serving_snapshot
+    fingerprint = snapshot.read_fingerprint(path)
+    if fingerprint is None or fingerprint == snapshot_fingerprint:
+        return False
+
+    with _reload_lock:
+        if fingerprint == snapshot_fingerprint:
+            return False
+        # False if the file was replaced again meanwhile; the next check picks that one up
+        if not load_snapshot(path, fingerprint, shared):
+            return False
+    print(f"Loaded snapshot {path} rewritten by another worker")
+    return True
+
+def load_all_data(
+    workers: Optional[int] = None,
+    executor_type: Optional[str] = None,
+    snapshot_path: Optional[str] = None,
+    shared: Optional[bool] = None,
+    lazy: Optional[bool] = None,
+):
+    """
+    Load all CSV data into memory.
+
+    With more than one worker, files from every category are parsed concurrently on a
+    thread or process pool; defaults come from DATA_LOADER_WORKERS / DATA_LOADER_EXECUTOR.
+
+    If a snapshot path is given (or DATA_SNAPSHOT_PATH is set), a snapshot built from the
+    same CSV contents is memory-mapped instead of parsing. A stale snapshot is loaded and
+    only the CSV files changed since are parsed; either way it is then rewritten.
+
+    With ``shared`` (DATA_SHARED_MMAP), every worker serves the dataset through a
+    read-only mapping of one snapshot file (DATA_SNAPSHOT_PATH, or a default path next
+    to the CSV data) instead of holding its own copy.
+
+    With ``lazy`` (DATA_LAZY), only ``EAGER_CATEGORIES`` are loaded now; the other
+    categories and the statement indexes load on first access, and snapshots are not used.
+    """
+    workers = LOADER_WORKERS if workers is None else workers
+    executor_type = executor_type or LOADER_EXECUTOR
+    global serving_snapshot, lazy_loading
+    shared = SHARED_MMAP if shared is None else shared
+    lazy = LAZY_LOADING if lazy is None else lazy
+    snapshot_path = snapshot_path or SNAPSHOT_PATH or (get_default_snapshot_path() if shared else None)
+    serving_snapshot = None
+    lazy_loading = lazy
 
-    for csv_file in data_path.glob("*.csv"):
-        duns = csv_file.stem
-
-        try:
-            df = pd.read_csv(csv_file)
-            records = df.to_dict('records')
-            industries_data[duns] = records
-        except Exception as e:
-            print(f"Error loading {csv_file}: {e}")
-
-def load_people():
-    """Load people/personnel CSV files."""
-    data_path = get_data_path() / "people"
+    print("Loading company data...")
+    load_start = time.perf_counter()
 
-    if not data_path.exists():
-        print(f"Warning: {data_path} does not exist")
+    if lazy:
+        if snapshot_path:
+            print("Warning: snapshots are not used in lazy loading mode")
+        mode = _load_from_csv(workers, executor_type, folders=EAGER_CATEGORIES)
+        print(f"Data loading complete in {time.perf_counter() - load_start:.2f}s ({mode}, lazy)")
         return
 
-    for csv_file in data_path.glob("*.csv"):
-        duns = csv_file.stem
-
-        try:
-            df = pd.read_csv(csv_file)
-            records = df.to_dict('records')
-            people_data[duns] = records
-        except Exception as e:
-            print(f"Error loading {csv_file}: {e}")
-
-def load_operations():
-    """Load operations description CSV files."""
-    data_path = get_data_path() / "operations"
-
-    if not data_path.exists():
-        print(f"Warning: {data_path} does not exist")
+    if not snapshot_path:
+        mode = _load_from_csv(workers, executor_type)
+        print(f"Data loading complete in {time.perf_counter() - load_start:.2f}s ({mode})")
         return
 
-    for csv_file in data_path.glob("*.csv"):
-        duns = csv_file.stem
-
-        try:
-            df = pd.read_csv(csv_file)
-            records = df.to_dict('records')
-            operations_data[duns] = records
-        except Exception as e:
-            print(f"Error loading {csv_file}: {e}")
-
-def load_all_data():
-    """Load all CSV data into memory."""
-    print("Loading company data...")
-
-    load_company_info()
-    print(f"Loaded {len(company_data)} companies")
-
-    load_financial_data("balance_sheet", balance_sheet_data)
-    print(f"Loaded balance sheets for {len(balance_sheet_data)} companies")
-
-    load_financial_data("income_statement", income_statement_data)
-    print(f"Loaded income statements for {len(income_statement_data)} companies")
-
-    load_financial_data("cash_flow_statement", cash_flow_data)
-    print(f"Loaded cash flow statements for {len(cash_flow_data)} companies")
-
-    load_industries()
-    print(f"Loaded industries for {len(industries_data)} companies")
-
-    load_people()
-    print(f"Loaded people for {len(people_data)} companies")
-
-    load_operations()
-    print(f"Loaded operations for {len(operations_data)} companies")
+    # Reloads go through the snapshot too, so every worker serves the same data
+    serving_snapshot = (str(snapshot_path), shared)
+
+    # Workers starting together wait here while the first one builds the snapshot
+    with snapshot.build_lock(snapshot_path):
+        fingerprint = snapshot.source_fingerprint(get_data_path())
+        if load_snapshot(snapshot_path, fingerprint, shared):
+            globals()["load_timings"] = {"snapshot": time.perf_counter() - load_start}
+            print(f"Loaded {len(company_data)} companies from snapshot {snapshot_path}")
+            print(f"Data loading complete in {load_timings['snapshot']:.2f}s (snapshot)")
+            return
+
+        if load_snapshot(snapshot_path, None):
+            # A snapshot of older CSV data: parse only the files changed since it was written
+            result = _finish_reload(_reload_from_csv(workers, executor_type), load_start)
+            mode = f"snapshot plus {result['parsed_files']} changed files"
+        else:
+            mode = _load_from_csv(workers, executor_type)
+        _write_snapshot(snapshot_path, fingerprint, shared)
+
+    print(f"Data loading complete in {time.perf_counter() - load_start:.2f}s ({mode})")
+
+def reload_data(workers: Optional[int] = None, executor_type: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Reload the dataset from CSV while the current one keeps serving, then swap it in.
+
+    Only new files and files whose content changed are parsed (see
+    :func:`_parse_categories`); files that were removed drop their companies. Only
+    the categories and indexes affected are rebuilt, and if nothing changed the
+    loaded data (and every cache derived from it) is kept. Concurrent calls run one
+    after another.
+
+    When the data is served from a snapshot, the reload rewrites it under the
+    snapshot's build lock, and the other workers load the new one (see
+    :func:`sync_snapshot`). A worker that finds the snapshot already rebuilt from
+    the current files loads it instead of parsing.
+    """
+    workers = LOADER_WORKERS if workers is None else workers
+    executor_type = executor_type or LOADER_EXECUTOR
+
+    with _reload_lock:
+        start = time.perf_counter()
+        print("Reloading company data...")
+        if serving_snapshot is None:
+            result = _reload_from_csv(workers, executor_type)
+        else:
+            result = _reload_through_snapshot(*serving_snapshot, workers, executor_type)
+        return _finish_reload(result, start)
+
+def _reload_from_csv(workers: int, executor_type: str) -> Dict[str, Any]:
+    """Parse the CSV files changed since the last load and publish the result, if any."""
+    # Categories left out by a lazy load (or read per company) stay that way
+    resident = [
+        folder_name for folder_name, global_name, _ in CATEGORIES
+        if global_name in globals() and not isinstance(globals()[global_name], LazyRecords)
+    ]
+    state, stats = _parse_categories(workers, executor_type, reuse=True, folders=resident)
+
+    changed = bool(stats["changed"])
+    if changed:
+        _publish(state, stats["changed"])
+    else:
+        # Same content (e.g. files that were only touched): remember the new signatures
+        with _publish_lock:
+            globals()["file_signatures"] = state["file_signatures"]
+    return {
+        "changed": changed,
+        "changed_categories": [folder for folder, name, _ in CATEGORIES if name in stats["changed"]],
+        "parsed_files": stats["parsed"],
+        "reused_files": stats["reused"],
+        "removed_files": stats["removed"],
+    }
+
+def _reload_through_snapshot(path: str, shared: bool, workers: int, executor_type: str) -> Dict[str, Any]:
+    """Reload from CSV and rewrite the snapshot, or load the snapshot another worker rewrote."""
+    with snapshot.build_lock(path):
+        fingerprint = snapshot.source_fingerprint(get_data_path())
+        previous_versions = data_versions
+        if fingerprint != snapshot_fingerprint and load_snapshot(path, fingerprint, shared):
+            print(f"Loaded snapshot {path}, already rebuilt from the current files")
+            changed_categories = [
+                folder_name for folder_name, _, _ in CATEGORIES
+                if previous_versions.get(folder_name) != data_versions.get(folder_name)
+            ]
+            return {
+                "changed": True,
+                "changed_categories": changed_categories,
+                "parsed_files": 0,
+                "reused_files": sum(len(versions) for versions in data_versions.values()),
+                "removed_files": sum(
+                    len(versions.keys() - data_versions.get(folder_name, {}).keys())
+                    for folder_name, versions in previous_versions.items()
+                ),
+            }
+
+        result = _reload_from_csv(workers, executor_type)
+        if result["changed"] or snapshot.read_fingerprint(path) != fingerprint:
+            _write_snapshot(Path(path), fingerprint, shared)
+        return result
+
+def _finish_reload(result: Dict[str, Any], start: float) -> Dict[str, Any]:
+    """Record a reload's outcome for /health and log it."""
+    global last_reload
+    last_reload = {
+        **result,
+        "seconds": round(time.perf_counter() - start, 3),
+        "finished_at": time.time(),
+    }
+    print(f"Reload complete in {last_reload['seconds']:.2f}s ({result['parsed_files']} files parsed, "
+          f"{result['reused_files']} reused, {result['removed_files']} removed"
+          f"{'' if result['changed'] else ', no changes'})")
+    return last_reload
+
+def _load_lazy_category(folder_name: str, global_name: str, label: str):
+    """
+    Read a category left out of a lazy load and publish it with its data versions.
+
+    The version and signature dicts are replaced, not updated, so readers holding
+    the published ones never see them change. Call with ``_publish_lock`` held.
+    """
+    start = time.perf_counter()
+    csv_files = list_csv_files(folder_name)
+    if folder_name in PER_COMPANY_CATEGORIES and LAZY_COMPANY_CACHE_SIZE > 0:
+        print(f"Reading {label} per company (keeping up to {LAZY_COMPANY_CACHE_SIZE})")
+        globals()[global_name] = LazyRecords(folder_name, csv_files, LAZY_COMPANY_CACHE_SIZE)
+        return
 
-    print("Data loading complete!")
+    parsed = {}
+    versions = {}
+    for csv_file, (result, version) in zip(csv_files, _start_files(folder_name, csv_files, None)):
+        if result is not None:
+            parsed[csv_file.stem] = result
+            versions[csv_file.stem] = version
+    seconds = time.perf_counter() - start
+    # No derived index reads a category that was not loaded, so none is rebuilt
+    _publish({
+        **_resident_categories(),
+        global_name: _build_category(folder_name, parsed),
+        "data_versions": {**data_versions, folder_name: versions},
+        "file_signatures": {
+            **file_signatures,
+            folder_name: {csv_file.stem: file_signature(csv_file) for csv_file in csv_files},
+        },
+        "load_timings": {**load_timings, folder_name: seconds},
+    }, changed=set())
+    print(f"Loaded {label} for {len(parsed)} companies on first access ({seconds:.2f}s)")
+
+def _load_lazy_index(name: str) -> Any:
+    """Build an index over the statements on first access."""
+    if name == "screener":
+        return Screener(
+            search_index.duns_order,
+            {statement: get_statement_store(statement) for statement in STATEMENT_TYPES}
+        )
+    if name == "financial_metrics":
+        return FinancialMetrics(_loaded("screener"))
+    return PeerBenchmarks(_loaded("screener"), _loaded("financial_metrics"), industries_data)
+
+def __getattr__(name: str) -> Any:
+    """Load a category or index that a lazy load left out, on first access."""
+    category = next((category for category in CATEGORIES if category[1] == name), None)
+    if category is None and name not in STATEMENT_INDEXES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    with _publish_lock:
+        # Another request may have loaded it while this one waited
+        if name not in globals():
+            if category:
+                _load_lazy_category(*category)
+            else:
+                globals()[name] = _load_lazy_index(name)
+        return globals()[name]
+
+def _loaded(name: str) -> Any:
+    """Get a data or index global, loading it first if a lazy load left it out."""
+    value = globals().get(name)
+    return value if value is not None else __getattr__(name)
+
+def resident_data() -> Dict[str, Any]:
+    """Report which categories and statement indexes are in memory (everything unless lazy)."""
+    categories = {}
+    for folder_name, global_name, _ in CATEGORIES:
+        value = globals().get(global_name)
+        if isinstance(value, LazyRecords):
+            categories[folder_name] = {
+                "resident": True,
+                "companies": len(value),
+                "resident_companies": value.resident_companies,
+                "max_companies": value.max_companies,
+            }
+        else:
+            categories[folder_name] = {"resident": value is not None, "companies": category_size(folder_name)}
+    return {
+        "lazy": lazy_loading,
+        "categories": categories,
+        "indexes": {name: name in globals() for name in STATEMENT_INDEXES},
+    }
+
+def category_size(folder_name: str) -> int:
+    """Number of companies in a category, without loading it."""
+    global_name = next(name for folder, name, _ in CATEGORIES if folder == folder_name)
+    value = globals().get(global_name)
+    return len(value) if value is not None else len(file_signatures.get(folder_name, {}))
+
+def get_data_version(folder_name: str, duns: str) -> str:
+    """Get the content version of one company's file in a category ("" if it has none)."""
+    global_name = next(name for folder, name, _ in CATEGORIES if folder == folder_name)
+    value = _loaded(global_name)
+    if isinstance(value, LazyRecords):
+        return value.version(duns)
+    return data_versions.get(folder_name, {}).get(duns, "")
+
+def get_statement_store(statement_type: str) -> StatementStore:
+    """Get the loaded store for a statement type ("balance_sheet", "income_statement" or "cash_flow")."""
+    folder_name = STATEMENT_TYPES[statement_type]
+    global_name = next(name for folder, name, _ in CATEGORIES if folder == folder_name)
+    return _loaded(global_name)
 
 def get_all_duns_numbers() -> List[str]:
     """Get list of all DUNS numbers."""
@@ -0,0 +1,51 @@
+"""
+JSON encoding of API responses.
+
+``JSON_ENCODER`` picks the encoder: ``orjson`` (the default when the package is
+installed) or ``standard`` (the stdlib ``json`` module). It backs both the
+app's default response class and :func:`json_response`, the model-free path
+used by the data-heavy endpoints: they build plain dicts and return them
+encoded, skipping response model validation and ``jsonable_encoder``. Those
+endpoints keep ``response_model`` in their route decorators, so the OpenAPI
+schema is unchanged; the payloads must match those models' output.
+"""
+import json
+import os
+from typing import Any
+from fastapi import Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+try:
+    import orjson
+except ImportError:  # Optional dependency: responses are encoded with the stdlib json module
+    orjson = None
+
+JSON_ENCODER = os.environ.get("JSON_ENCODER", "orjson" if orjson is not None else "standard")
+if JSON_ENCODER == "orjson" and orjson is None:
+    print("Warning: JSON_ENCODER=orjson but orjson is not installed; using the standard encoder")
+    JSON_ENCODER = "standard"
+
+# Response class for JSON bodies, used as the app's default_response_class
+JSON_RESPONSE_CLASS = ORJSONResponse if JSON_ENCODER == "orjson" else JSONResponse
+
+def dumps(content: Any) -> bytes:
+    """Encode ``content`` as compact UTF-8 JSON; NaN and infinities become null as with Pydantic."""
+    if JSON_ENCODER == "orjson":
+        return orjson.dumps(content)
+    return json.dumps(
+        _nan_to_none(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+def _nan_to_none(content: Any) -> Any:
+    """Replace non-finite floats with None throughout lists and dicts (orjson does this itself)."""
+    if isinstance(content, float):
+        return content if content - content == 0 else None
+    if isinstance(content, dict):
+        return {key: _nan_to_none(value) for key, value in content.items()}
+    if isinstance(content, (list, tuple)):
+        return [_nan_to_none(value) for value in content]
+    return content
+
+def json_response(content: Any, status_code: int = 200) -> Response:
+    """Return ``content`` (plain dicts, lists and scalars) as a JSON response, without validation."""
+    return Response(content=dumps(content), status_code=status_code, media_type="application/json")
@@ -4,8 +4,13 @@ FastAPI application for Company Financial Data API.
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import data_loader
-from routers import companies, financials, industries
+import reloader
+from compression import CompressionMiddleware
+from json_encoding import JSON_RESPONSE_CLASS
+from response_cache import response_cache
+from routers import admin, batch, companies, export, financials, industries, line_items, screen
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -14,9 +19,21 @@ async def lifespan(app: FastAPI):
     """
     # Startup: Load all CSV data into memory
     data_loader.load_all_data()
+
+    # Reload the data when the CSV files change (DATA_WATCH), and follow snapshots
+    # rewritten by other workers' reloads
+    stop_watching = asyncio.Event()
+    watchers = []
+    if reloader.WATCH_ENABLED:
+        watchers.append(asyncio.create_task(reloader.watch_data_files(stop_watching)))
+    if data_loader.serving_snapshot is not None and reloader.SNAPSHOT_POLL_SECONDS > 0:
+        watchers.append(asyncio.create_task(reloader.watch_snapshot(stop_watching)))
     yield
     # Shutdown: cleanup if needed
     print("Shutting down...")
+    stop_watching.set()
+    for watcher in watchers:
+        await watcher
 
 # Create FastAPI app
 app = FastAPI(
@@ -46,6 +63,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=JSON_RESPONSE_CLASS,
     lifespan=lifespan
 )
 
@@ -58,10 +76,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress responses that cached endpoints have not already compressed (e.g. exports)
+app.add_middleware(CompressionMiddleware)
+
 # Include routers
 app.include_router(companies.router)
 app.include_router(financials.router)
 app.include_router(industries.router)
+app.include_router(line_items.router)
+app.include_router(batch.router)
+app.include_router(export.router)
+app.include_router(screen.router)
+app.include_router(admin.router)
 
 # Root endpoint
 @app.get(
@@ -88,7 +114,16 @@ def root():
             "industries": "/companies/{duns}/industries",
             "people": "/companies/{duns}/people",
             "operations": "/companies/{duns}/operations",
-            "all_industries": "/industries"
+            "metrics": "/companies/{duns}/metrics",
+            "benchmark": "/companies/{duns}/benchmark",
+            "all_industries": "/industries",
+            "line_items": "/line-items",
+            "companies_batch": "POST /companies/batch",
+            "financials_batch": "POST /financials/batch",
+            "metrics_batch": "POST /metrics/batch",
+            "export": "/export/{statement}",
+            "screen": "POST /screen",
+            "reload": "POST /admin/reload"
         }
     }
 
@@ -103,15 +138,23 @@ def health_check():
     return {
         "status": "healthy",
         "companies_loaded": len(data_loader.company_data),
+        # Counted without loading categories that a lazy load left out
         "data_sources": {
-            "company_info": len(data_loader.company_data),
-            "balance_sheets": len(data_loader.balance_sheet_data),
-            "income_statements": len(data_loader.income_statement_data),
-            "cash_flows": len(data_loader.cash_flow_data),
-            "industries": len(data_loader.industries_data),
-            "people": len(data_loader.people_data),
-            "operations": len(data_loader.operations_data)
-        }
+            "company_info": data_loader.category_size("company_info"),
+            "balance_sheets": data_loader.category_size("balance_sheet"),
+            "income_statements": data_loader.category_size("income_statement"),
+            "cash_flows": data_loader.category_size("cash_flow_statement"),
+            "industries": data_loader.category_size("industries"),
+            "people": data_loader.category_size("people"),
+            "operations": data_loader.category_size("operations")
+        },
+        "resident": data_loader.resident_data(),
+        "load_seconds": {
+            category: round(seconds, 3)
+            for category, seconds in data_loader.load_timings.items()
+        },
+        "last_reload": data_loader.last_reload,
+        "response_cache": response_cache.stats()
     }
 
 if __name__ == "__main__":
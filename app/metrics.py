@@ -0,0 +1,114 @@
+"""
+Financial ratios and growth metrics, computed for every company and year at load time.
+
+Each metric is one vectorized expression over the (company x year) matrices of
+:class:`screener.Screener`. A metric is None (NaN internally) for a year when
+any input is missing or a denominator is zero. An input may be a sum of line
+items (e.g. current plus non-current borrowings), missing if any term is.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from screener import Screener, safe_divide
+from statement_store import year_bounds
+
+REVENUE = ("income_statement", "Revenue from continuing operations ($000s)")
+GROSS_PROFIT = ("income_statement", "Gross profit ($000s)")
+EBITDA = ("income_statement", "EBITDA ($000s)")
+EBIT = ("income_statement", "EBIT ($000s)")
+NET_PROFIT = ("income_statement", "Net profit for the period ($000s)")
+CURRENT_ASSETS = ("balance_sheet", "Total current assets ($000s)")
+CURRENT_LIABILITIES = ("balance_sheet", "Total current liabilities ($000s)")
+TOTAL_ASSETS = ("balance_sheet", "TOTAL ASSETS ($000s)")
+CURRENT_BORROWINGS = ("balance_sheet", "Total current interest-bearing loans and borrowings ($000s)")
+NON_CURRENT_BORROWINGS = ("balance_sheet", "Total non-current interest-bearing loans and borrowings ($000s)")
+TOTAL_EQUITY = ("balance_sheet", "TOTAL EQUITY ($000s)")
+OPERATING_CASH_FLOW = ("cash_flow", "Net cashflow from/(used in) operating activities ($000s)")
+
+# Interest-bearing debt: current plus non-current loans and borrowings
+BORROWINGS = (CURRENT_BORROWINGS, NON_CURRENT_BORROWINGS)
+
+# A (statement, line item) pair, or a tuple of them to add up
+MetricInput = Union[Tuple[str, str], Tuple[Tuple[str, str], ...]]
+
+# Metric name -> (numerator, denominator)
+RATIOS: Dict[str, Tuple[MetricInput, MetricInput]] = {
+    "gross_margin": (GROSS_PROFIT, REVENUE),
+    "ebitda_margin": (EBITDA, REVENUE),
+    "ebit_margin": (EBIT, REVENUE),
+    "net_margin": (NET_PROFIT, REVENUE),
+    "operating_cash_flow_margin": (OPERATING_CASH_FLOW, REVENUE),
+    "current_ratio": (CURRENT_ASSETS, CURRENT_LIABILITIES),
+    "debt_to_equity": (BORROWINGS, TOTAL_EQUITY),
+    "return_on_assets": (NET_PROFIT, TOTAL_ASSETS),
+    "return_on_equity": (NET_PROFIT, TOTAL_EQUITY),
+}
+
+# Metric name -> line item whose year-over-year relative change it is
+GROWTH: Dict[str, Tuple[str, str]] = {
+    "revenue_growth": REVENUE,
+    "ebitda_growth": EBITDA,
+    "net_profit_growth": NET_PROFIT,
+    "total_assets_growth": TOTAL_ASSETS,
+    "total_equity_growth": TOTAL_EQUITY,
+}
+
+METRIC_NAMES: List[str] = list(RATIOS) + list(GROWTH)
+
+def _input(screener: Screener, line_item: MetricInput) -> np.ndarray:
+    """
+    A metric input's (company x year) values; all missing if the line item is not in
+    the data. A tuple of line items is their sum, missing where any term is.
+    """
+    if isinstance(line_item[0], tuple):
+        return np.sum([_input(screener, term) for term in line_item], axis=0)
+    try:
+        return screener.matrix(*line_item)
+    except ValueError:
+        return np.full((len(screener.duns_order), len(screener.years)), np.nan)
+
+class FinancialMetrics:
+    """Precomputed (company x year) matrices of every metric in ``METRIC_NAMES``."""
+
+    def __init__(self, screener: Screener):
+        self.duns_order = screener.duns_order
+        self.years = screener.years
+        self.reported = screener.reported
+        self._positions: Dict[str, int] = {duns: i for i, duns in enumerate(self.duns_order)}
+        self.values: Dict[str, np.ndarray] = {}
+        for name, (numerator, denominator) in RATIOS.items():
+            self.values[name] = safe_divide(_input(screener, numerator), _input(screener, denominator))
+        for name, line_item in GROWTH.items():
+            self.values[name] = screener.year_change(_input(screener, line_item), relative=True)
+
+    def company(
+        self,
+        duns: str,
+        names: Optional[Sequence[str]] = None,
+        year: Optional[int] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Return ``{"years": [...], "metrics": {name: [...]}}`` for one company.
+
+        Years are those the company reports statements for, newest first, narrowed
+        by the year filters; each metric list is aligned with ``years``.
+        """
+        names = list(names) if names else METRIC_NAMES
+        position = self._positions.get(duns)
+        if position is None:
+            return {"years": [], "metrics": {name: [] for name in names}}
+
+        columns = self.reported[position].copy()
+        low, high = year_bounds(year, year_from, year_to)
+        if low is not None:
+            columns &= self.years >= low
+        if high is not None:
+            columns &= self.years <= high
+        columns = np.flatnonzero(columns)[::-1]
+
+        metrics = {}
+        for name in names:
+            values = self.values[name][position, columns]
+            metrics[name] = np.where(np.isnan(values), None, values).tolist()
+        return {"years": self.years[columns].tolist(), "metrics": metrics}
@@ -1,8 +1,27 @@
 """
 Pydantic models for API request/response validation.
 """
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Literal, Optional, Any
 from pydantic import BaseModel, Field
+from metrics import METRIC_NAMES
+
+# Largest number of DUNS numbers accepted by the batch endpoints
+MAX_BATCH_SIZE = 1000
+
+StatementType = Literal["balance_sheet", "income_statement", "cash_flow"]
+
+MetricName = Literal[tuple(METRIC_NAMES)]
+
+BenchmarkSource = Literal["balance_sheet", "income_statement", "cash_flow", "metrics"]
+
+# Industry peer group: the primary 4-digit SIC code or its 2-digit major group
+PeerLevel = Literal["industry", "major_group"]
+
+# Long: one object per (line item, year); wide: a line items x years matrix
+StatementLayout = Literal["long", "wide"]
+
+# Keys of a long-layout statement row, for ?fields= projection
+RecordField = Literal["duns", "line_item", "year", "value", "raw_value"]
 
 # Company Info Models
 class CompanyInfoResponse(BaseModel):
@@ -35,6 +54,9 @@ class CompanyListResponse(BaseModel):
     """Response for list of companies."""
     total: int
     companies: List[CompanyListItem]
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as cursor to get the next page; null on the last page"
+    )
 
 # Financial Statement Models
 class FinancialLineItem(BaseModel):
@@ -42,7 +64,13 @@ class FinancialLineItem(BaseModel):
     duns: str
     line_item: str
     year: Optional[int] = None
-    value: Optional[str] = None
+    value: Optional[float] = Field(
+        None, description="Parsed value in units (thousands-scaled line items multiplied out); "
+                          "a '-' (nil) is 0, a blank is null"
+    )
+    raw_value: Optional[str] = Field(
+        None, description="Original value string, only returned when include_raw=true"
+    )
 
     class Config:
         json_schema_extra = {
@@ -50,7 +78,8 @@ class FinancialLineItem(BaseModel):
                 "duns": "740039581",
                 "line_item": "Total Assets ($000s)",
                 "year": 2024,
-                "value": "$56,136"
+                "value": 56136000.0,
+                "raw_value": "$56,136"
             }
         }
 
@@ -60,6 +89,32 @@ class FinancialStatementResponse(BaseModel):
     statement_type: str
     data: List[Dict[str, Any]]
 
+class WideStatement(BaseModel):
+    """A statement pivoted into a line items x years matrix."""
+    line_items: List[str] = Field(description="Row labels, in statement order")
+    years: List[int] = Field(description="Column labels, newest first")
+    values: List[List[Optional[float]]] = Field(
+        description="values[i][j] is line_items[i] in years[j]; 0 for '-' (nil), null when blank or missing"
+    )
+    raw_values: Optional[List[List[Optional[str]]]] = Field(
+        None, description="Original value strings in the same shape, only returned when include_raw=true"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "line_items": ["TOTAL ASSETS ($000s)", "TOTAL LIABILITIES ($000s)"],
+                "years": [2024, 2023],
+                "values": [[56136000.0, 51200000.0], [30110000.0, None]]
+            }
+        }
+
+class WideStatementResponse(BaseModel):
+    """Response for financial statement data in the wide layout."""
+    duns: str
+    statement_type: str
+    data: WideStatement
+
 # Industry Models
 class IndustryItem(BaseModel):
     """Industry classification item."""
@@ -135,6 +190,13 @@ class CombinedFinancialResponse(BaseModel):
     income_statement: List[Dict[str, Any]]
     cash_flow: List[Dict[str, Any]]
 
+class WideCombinedFinancialResponse(BaseModel):
+    """Response for all financial statements combined, in the wide layout."""
+    duns: str
+    balance_sheet: WideStatement
+    income_statement: WideStatement
+    cash_flow: WideStatement
+
 # Industry Summary
 class IndustryInfo(BaseModel):
     """Industry information with company count."""
@@ -147,6 +209,235 @@ class IndustryListResponse(BaseModel):
     total_industries: int
     industries: List[IndustryInfo]
 
+# Line Item Taxonomy Models
+class LineItemInfo(BaseModel):
+    """A statement line item in the canonical taxonomy."""
+    id: str = Field(description="Canonical id, unique within the statement; accepted wherever line items are named")
+    statement: StatementType
+    name: str = Field(description="Line-item name as it appears in the data")
+    label: str = Field(description="Name without its unit suffix")
+    section: Optional[str] = Field(None, description="Id of the section header the line item appears under")
+    is_section: bool = Field(description="True for section headers, which never have values")
+    unit: Optional[str] = Field(
+        None, description="'dollars', 'cents', 'count' or 'percent' (null for section headers)"
+    )
+    scale: float = Field(description="Multiplier applied to the reported figures to give the served values")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "id": "total_current_assets",
+                "statement": "balance_sheet",
+                "name": "Total current assets ($000s)",
+                "label": "Total current assets",
+                "section": "current_assets",
+                "is_section": False,
+                "unit": "dollars",
+                "scale": 1000.0
+            }
+        }
+
+class LineItemListResponse(BaseModel):
+    """Response for the line-item taxonomy."""
+    total: int
+    line_items: List[LineItemInfo]
+
+# Batch Models
+class CompanyBatchRequest(BaseModel):
+    """Request for several companies' information at once."""
+    duns: List[str] = Field(
+        min_length=1, max_length=MAX_BATCH_SIZE, description="DUNS numbers to look up"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {"duns": ["740039581", "742298797"]}
+        }
+
+class CompanyBatchResponse(BaseModel):
+    """Response for a company batch lookup."""
+    companies: List[CompanyInfoResponse]
+    not_found: List[str] = Field(description="Requested DUNS numbers with no company data")
+
+class FinancialBatchRequest(BaseModel):
+    """Request for several companies' financial statements at once."""
+    duns: List[str] = Field(
+        min_length=1, max_length=MAX_BATCH_SIZE, description="DUNS numbers to look up"
+    )
+    statements: List[StatementType] = Field(
+        default=["balance_sheet", "income_statement", "cash_flow"],
+        description="Statements to include for each company"
+    )
+    year: Optional[int] = Field(None, description="Filter by specific year")
+    year_from: Optional[int] = Field(None, description="Filter to years from this year onwards")
+    year_to: Optional[int] = Field(None, description="Filter to years up to and including this year")
+    line_items: Optional[List[str]] = Field(None, description="Only return these line items: exact names, ids from /line-items or case-insensitive glob patterns")
+    include_raw: bool = Field(False, description="Also return each original value string as raw_value")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "duns": ["740039581", "742298797"],
+                "statements": ["income_statement"],
+                "year_from": 2022,
+                "line_items": ["Revenue from continuing operations ($000s)"]
+            }
+        }
+
+class CompanyFinancials(BaseModel):
+    """Requested financial statements for one company in a batch."""
+    duns: str
+    balance_sheet: Optional[List[Dict[str, Any]]] = None
+    income_statement: Optional[List[Dict[str, Any]]] = None
+    cash_flow: Optional[List[Dict[str, Any]]] = None
+
+class FinancialBatchResponse(BaseModel):
+    """Response for a financial statement batch lookup."""
+    results: List[CompanyFinancials]
+    not_found: List[str] = Field(description="Requested DUNS numbers with no company data")
+
+# Metrics Models
+class CompanyMetrics(BaseModel):
+    """Financial ratios and growth metrics for one company."""
+    duns: str
+    years: List[int] = Field(description="Years the company reports statements for, newest first")
+    metrics: Dict[str, List[Optional[float]]] = Field(
+        description="Metric name -> values aligned with years; null when an input is missing or a denominator is zero"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "duns": "740039581",
+                "years": [2024, 2023],
+                "metrics": {"net_margin": [0.0918, 0.1194], "revenue_growth": [0.0423, None]}
+            }
+        }
+
+class MetricsBatchRequest(BaseModel):
+    """Request for several companies' metrics at once."""
+    duns: List[str] = Field(
+        min_length=1, max_length=MAX_BATCH_SIZE, description="DUNS numbers to look up"
+    )
+    metrics: Optional[List[MetricName]] = Field(None, description="Metrics to return (default: all)")
+    year: Optional[int] = Field(None, description="Filter by specific year")
+    year_from: Optional[int] = Field(None, description="Filter to years from this year onwards")
+    year_to: Optional[int] = Field(None, description="Filter to years up to and including this year")
+
+class MetricsBatchResponse(BaseModel):
+    """Response for a metrics batch lookup."""
+    results: List[CompanyMetrics]
+    not_found: List[str] = Field(description="Requested DUNS numbers with no company data")
+
+# Benchmark Models
+class PeerBenchmark(BaseModel):
+    """Where a company's value sits among its industry peers, per year."""
+    line_item: str = Field(description="Line item, or metric name for source=metrics")
+    value: List[Optional[float]] = Field(description="The company's values, aligned with years")
+    percentile_rank: List[Optional[float]] = Field(
+        description="0-100: share of peers with a lower value plus half of those with an equal one"
+    )
+    peer_count: List[int] = Field(description="Peers (including the company) with a value that year")
+    q1: List[Optional[float]]
+    median: List[Optional[float]]
+    q3: List[Optional[float]]
+
+class PeerBenchmarkResponse(BaseModel):
+    """Response for a company's industry peer benchmarks."""
+    duns: str
+    source: str
+    level: str
+    industry_code: str = Field(description="Peer group: SIC code, or 2-digit major group")
+    industry_description: Optional[str] = None
+    peer_group_size: int = Field(description="Companies whose primary industry is in the peer group")
+    years: List[int] = Field(description="Years the company reports statements for, newest first")
+    benchmarks: List[PeerBenchmark]
+
+# Screening Models
+class ScreenField(BaseModel):
+    """A value to screen or sort on: one line item of one statement in one year."""
+    statement: StatementType
+    line_item: str = Field(description="Exact line-item name, e.g. 'TOTAL ASSETS ($000s)', or its id from /line-items, e.g. 'total_assets'")
+    year: int
+    metric: Literal["value", "yoy_change", "yoy_growth"] = Field(
+        "value",
+        description="'value', 'yoy_change' (difference from the previous year) or "
+                    "'yoy_growth' (change relative to the previous year's absolute value)"
+    )
+
+class ScreenFilter(ScreenField):
+    """A condition on a screen field; companies with a missing value never match."""
+    op: Literal[">", ">=", "<", "<=", "==", "!="]
+    value: float
+
+class ScreenRequest(BaseModel):
+    """Request for a cross-company screen."""
+    filters: List[ScreenFilter] = Field(default=[], max_length=50, description="Conditions that must all hold")
+    company_type: Optional[str] = Field(None, description="Only screen companies of this type")
+    industry_code: Optional[str] = Field(None, description="Only screen companies with this industry code")
+    sort_by: Optional[ScreenField] = Field(None, description="Order results by this field (missing values last)")
+    sort_order: Literal["asc", "desc"] = "desc"
+    limit: int = Field(100, ge=1, le=1000, description="Maximum number of results to return")
+    offset: int = Field(0, ge=0, description="Number of results to skip")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "filters": [
+                    {"statement": "income_statement", "line_item": "Revenue from continuing operations ($000s)",
+                     "year": 2024, "op": ">", "value": 10000000},
+                    {"statement": "balance_sheet", "line_item": "TOTAL ASSETS ($000s)",
+                     "year": 2024, "metric": "yoy_growth", "op": ">", "value": 0}
+                ],
+                "sort_by": {"statement": "income_statement",
+                            "line_item": "Revenue from continuing operations ($000s)", "year": 2024},
+                "limit": 20
+            }
+        }
+
+class ScreenResult(BaseModel):
+    """A company matching a screen, with the values of the screened fields."""
+    duns: str
+    values: List[Optional[float]] = Field(description="Values of the response's columns, in order")
+
+class ScreenResponse(BaseModel):
+    """Response for a cross-company screen."""
+    total: int
+    columns: List[ScreenField] = Field(description="The filter fields, then the sort field")
+    results: List[ScreenResult]
+
+# Admin Models
+class ReloadResult(BaseModel):
+    """Outcome of a data reload."""
+    changed: bool = Field(description="Whether new data was swapped in")
+    changed_categories: List[str] = Field(description="Category folders that were rebuilt")
+    parsed_files: int = Field(description="CSV files parsed because they were new or their content changed")
+    reused_files: int = Field(description="Unchanged CSV files whose loaded data was kept")
+    removed_files: int = Field(description="CSV files that were removed, dropping their companies")
+    seconds: float
+    finished_at: float = Field(description="Unix time the reload finished")
+
+class ReloadResponse(BaseModel):
+    """Response for a reload request."""
+    status: Literal["completed", "started"]
+    result: Optional[ReloadResult] = Field(None, description="The reload's outcome, when waited for")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "status": "completed",
+                "result": {
+                    "changed": True,
+                    "changed_categories": ["balance_sheet", "income_statement"],
+                    "parsed_files": 2,
+                    "reused_files": 1550,
+                    "removed_files": 0,
+                    "seconds": 1.84,
+                    "finished_at": 1760700000.0
+                }
+            }
+        }
+
 # Error Response
 class ErrorResponse(BaseModel):
     """Error response model."""
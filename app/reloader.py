@@ -0,0 +1,66 @@
+"""
+Watch the CSV data directory and reload the dataset when files change.
+
+Enabled with DATA_WATCH=1. Uses ``watchfiles`` (installed with uvicorn[standard]),
+which batches bursts of file events, so copying in a set of files triggers one
+reload. Each reload runs in a thread via :func:`data_loader.reload_data`; the
+current data keeps serving until the new state is swapped in.
+
+When the data is served from a snapshot, every worker also polls the snapshot's
+header (:func:`watch_snapshot`): a reload in any worker rewrites the snapshot,
+and the others load it, so all workers serve the same data and ETags.
+"""
+import asyncio
+import os
+from pathlib import Path
+import data_loader
+
+try:
+    from watchfiles import awatch
+except ImportError:  # pragma: no cover - optional dependency
+    awatch = None
+
+WATCH_ENABLED = os.environ.get("DATA_WATCH", "").lower() in ("1", "true", "yes")
+
+# Milliseconds to wait for file events to settle before reloading
+WATCH_DEBOUNCE_MS = int(os.environ.get("DATA_WATCH_DEBOUNCE_MS", "1600"))
+
+# Seconds between checks for a snapshot rewritten by another worker (0 disables)
+SNAPSHOT_POLL_SECONDS = float(os.environ.get("DATA_SNAPSHOT_POLL_SECONDS", "2"))
+
+def _is_csv(_change, path: str) -> bool:
+    """Only CSV files affect the loaded data."""
+    return Path(path).suffix == ".csv"
+
+async def watch_data_files(stop_event: asyncio.Event):
+    """Reload the data whenever CSV files under the data directory change, until ``stop_event`` is set."""
+    if awatch is None:
+        print("Warning: DATA_WATCH is set but watchfiles is not installed; file watching disabled")
+        return
+
+    data_path = data_loader.get_data_path()
+    print(f"Watching {data_path} for data changes")
+    async for changes in awatch(
+        data_path, watch_filter=_is_csv, debounce=WATCH_DEBOUNCE_MS, stop_event=stop_event
+    ):
+        print(f"Detected {len(changes)} changed data files")
+        try:
+            await asyncio.to_thread(data_loader.reload_data)
+        except Exception as e:
+            # Keep serving the current data and keep watching
+            print(f"Warning: data reload failed: {e}")
+
+async def watch_snapshot(stop_event: asyncio.Event):
+    """Load the snapshot whenever another worker rewrites it, until ``stop_event`` is set."""
+    while not stop_event.is_set():
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=SNAPSHOT_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        else:
+            return
+        try:
+            await asyncio.to_thread(data_loader.sync_snapshot)
+        except Exception as e:
+            # Keep serving the current data and keep polling
+            print(f"Warning: loading the rewritten snapshot failed: {e}")
@@ -0,0 +1,221 @@
+"""
+Cache of pre-serialized JSON responses for endpoints over static data.
+
+Responses are stored as ready-to-send bytes keyed by route name and the
+endpoint's arguments (DUNS and query parameters), so a hit skips building and
+validating response models as well as JSON encoding. The cache is bounded by
+total body size with LRU eviction and is emptied whenever the data is reloaded.
+
+Endpoints may return a ready-made ``Response`` instead of a model: JSON built
+without models (see :func:`json_encoding.json_response`), or Arrow/Parquet for
+endpoints taking a ``format`` argument (see :mod:`tabular`). Its body is cached
+under the same key, which includes the format.
+
+Cached endpoints also get content-derived ETags: a hash of the route, its
+arguments and the content versions of the CSV files the response is built
+from. A request whose ``If-None-Match`` matches gets a 304 before the
+endpoint or the cache is touched, unless it names an unknown DUNS number;
+``If-None-Match: *`` is answered only once the endpoint has produced a body,
+so a missing resource still gets its 404.
+
+Bodies are compressed with the encoding negotiated from ``Accept-Encoding``
+(see :mod:`compression`) and each compressed variant is cached next to the raw
+body, so a hot response is compressed once; every variant has its own ETag.
+Bodies under ``COMPRESSION_MIN_BYTES`` are sent as is, under the raw body's ETag.
+"""
+import hashlib
+import inspect
+import os
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence
+from fastapi import Request, Response
+import data_loader
+from compression import COMPRESSION_MIN_BYTES, STREAM_LEVELS, compress, encoded_etag, negotiate_encoding
+from tabular import MEDIA_TYPES
+
+class ResponseCache:
+    """Thread-safe LRU cache of response bodies, bounded by their total size in bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._data_version = data_loader.data_version
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _check_data_version(self):
+        """Drop every entry if the data has been reloaded since they were stored."""
+        if self._data_version != data_loader.data_version:
+            self._entries.clear()
+            self.current_bytes = 0
+            self._data_version = data_loader.data_version
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Return the cached body for ``key`` (marking it recently used), or None."""
+        with self._lock:
+            self._check_data_version()
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: Hashable, body: bytes, data_version: Optional[int] = None):
+        """
+        Store a body, evicting least recently used entries to stay within ``max_bytes``.
+
+        ``data_version`` is the data version the body was built from; a body built
+        before a reload finished is not stored.
+        """
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            self._check_data_version()
+            if data_version is not None and data_version != self._data_version:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= len(previous)
+            self._entries[key] = body
+            self.current_bytes += len(body)
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache size and hit counters."""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+# Total size of cached bodies; set RESPONSE_CACHE_MAX_BYTES=0 to disable caching
+response_cache = ResponseCache(int(os.environ.get("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))))
+
+def compute_etag(route_name: str, categories: Optional[Sequence[str]], arguments: Dict[str, Any]) -> str:
+    """
+    Build a strong ETag for a response.
+
+    ``categories`` lists the category folders a per-company response is built from;
+    None means the response depends on the whole dataset (e.g. listings and search).
+    """
+    if categories is None:
+        versions = [data_loader.dataset_version]
+    else:
+        duns = arguments.get("duns", "")
+        versions = [data_loader.get_data_version(category, duns) for category in categories]
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((route_name, sorted(arguments.items()), versions)).encode())
+    return f'"{digest.hexdigest()}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header (a list of possibly weak ETags, or "*") against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+def _cache_key(route_name: str, arguments: Dict[str, Any]) -> Hashable:
+    """Build a hashable cache key from a route's arguments (list query parameters become tuples)."""
+    return (route_name, tuple(sorted(
+        (name, tuple(value) if isinstance(value, list) else value) for name, value in arguments.items()
+    )))
+
+def _company_known(arguments: Dict[str, Any]) -> bool:
+    """False for a per-company route asked about a DUNS number that is not loaded."""
+    return "duns" not in arguments or arguments["duns"] in data_loader.company_data
+
+def cached_response(route_name: str, categories: Optional[Sequence[str]] = None) -> Callable:
+    """
+    Serve an endpoint from the response cache, with ETag / If-None-Match support.
+
+    The endpoint must return a Pydantic model or a ``Response`` (model-free JSON, or a
+    non-JSON ``format``); on a miss it is serialized once and the bytes are cached,
+    as is each compressed variant of them the first time a client asks for it.
+    ``categories`` names the category folders the response is built from (see
+    :func:`compute_etag`). Use below ``@router.get`` so FastAPI still reads the
+    endpoint's own parameters and ``response_model`` for OpenAPI.
+    """
+    def decorator(endpoint: Callable) -> Callable:
+        @wraps(endpoint)
+        def wrapper(request: Request, **kwargs):
+            encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+            if_none_match = request.headers.get("if-none-match")
+            plain_etag = compute_etag(route_name, categories, kwargs)
+            # Only a body that is actually compressed gets the encoding's ETag; a client can
+            # only hold that tag for a body large enough to compress, so it is checked first
+            etag = encoded_etag(plain_etag, encoding)
+            # The format may come from the Accept header
+            headers = {"ETag": etag, "Vary": "Accept, Accept-Encoding" if "format" in kwargs else "Accept-Encoding"}
+
+            key = _cache_key(route_name, kwargs)
+            media_type = MEDIA_TYPES[kwargs.get("format", "json")]
+
+            def respond(body: bytes) -> Response:
+                if etag_matches(if_none_match, headers["ETag"]):
+                    return Response(status_code=304, headers={"ETag": headers["ETag"], "Vary": headers["Vary"]})
+                return Response(content=body, media_type=media_type, headers=headers)
+
+            # A 304 needs an existing resource: a specific tag is answered here for a known
+            # company only, and "*" once the endpoint has produced a body (or raised its 404)
+            if _company_known(kwargs) and (if_none_match or "").strip() != "*" and etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers=headers)
+
+            data_version = data_loader.data_version
+            if encoding is not None and response_cache.enabled:
+                compressed = response_cache.get((key, encoding))
+                if compressed is not None:
+                    headers["Content-Encoding"] = encoding
+                    return respond(compressed)
+
+            body = response_cache.get(key) if response_cache.enabled else None
+            if body is None:
+                result = endpoint(**kwargs)
+                body = result.body if isinstance(result, Response) else result.model_dump_json().encode()
+                if response_cache.enabled:
+                    response_cache.put(key, body, data_version)
+
+            if encoding is not None and len(body) >= COMPRESSION_MIN_BYTES:
+                if response_cache.enabled:
+                    body = compress(body, encoding)
+                    response_cache.put((key, encoding), body, data_version)
+                else:
+                    body = compress(body, encoding, STREAM_LEVELS[encoding])
+                headers["Content-Encoding"] = encoding
+            else:
+                # Too small to compress (or not negotiated): sent as is, under the raw body's ETag
+                headers["ETag"] = plain_etag
+            return respond(body)
+
+        # Expose the endpoint's parameters plus the request, so FastAPI injects both
+        signature = inspect.signature(endpoint)
+        request_parameter = inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+        wrapper.__signature__ = signature.replace(
+            parameters=[*signature.parameters.values(), request_parameter]
+        )
+        return wrapper
+    return decorator
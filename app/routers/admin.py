@@ -0,0 +1,53 @@
+"""
+Admin endpoints router: operations on the running service.
+
+Disabled unless ADMIN_TOKEN is set; requests must send the token in the
+``X-Admin-Token`` header.
+"""
+import os
+import secrets
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, Query, Response
+from typing import Optional
+import data_loader
+from models import ReloadResponse, ReloadResult, ErrorResponse
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+
+def _check_token(token: Optional[str]):
+    """Reject the request unless admin endpoints are enabled and the token matches."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if token is None or not secrets.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+@router.post(
+    "/reload",
+    response_model=ReloadResponse,
+    summary="Reload the data from CSV",
+    description="Re-read the CSV data without restarting: only new or modified files are parsed, "
+                "removed files drop their companies, and the new data replaces the old in one step "
+                "while requests keep being served. By default the reload runs in the background "
+                "(202); with `wait=true` the response reports its outcome.",
+    responses={
+        202: {"model": ReloadResponse, "description": "Reload started"},
+        401: {"model": ErrorResponse, "description": "Invalid admin token"},
+        403: {"model": ErrorResponse, "description": "Admin endpoints are disabled"},
+    }
+)
+def reload(
+    response: Response,
+    background_tasks: BackgroundTasks,
+    wait: bool = Query(False, description="Wait for the reload to finish"),
+    x_admin_token: Optional[str] = Header(None)
+):
+    """Reload the data from CSV."""
+    _check_token(x_admin_token)
+
+    if not wait:
+        background_tasks.add_task(data_loader.reload_data)
+        response.status_code = 202
+        return ReloadResponse(status="started")
+
+    return ReloadResponse(status="completed", result=ReloadResult(**data_loader.reload_data()))
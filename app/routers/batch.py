@@ -0,0 +1,105 @@
+"""
+Batch endpoints router: data for many companies in one request.
+
+Responses are built as plain dicts and encoded directly (see :mod:`json_encoding`);
+the response models document them in the OpenAPI schema.
+"""
+from fastapi import APIRouter
+from typing import List, Tuple
+import data_loader
+from json_encoding import json_response
+from models import (
+    CompanyBatchRequest,
+    CompanyBatchResponse,
+    FinancialBatchRequest,
+    FinancialBatchResponse,
+    MetricsBatchRequest,
+    MetricsBatchResponse
+)
+
+router = APIRouter(tags=["batch"])
+
+def _split_known(duns_list: List[str]) -> Tuple[List[str], List[str]]:
+    """De-duplicate DUNS numbers (keeping request order) and split them into known and unknown."""
+    found, not_found = [], []
+    for duns in dict.fromkeys(duns_list):
+        (found if duns in data_loader.company_data else not_found).append(duns)
+    return found, not_found
+
+@router.post(
+    "/companies/batch",
+    response_model=CompanyBatchResponse,
+    summary="Get details for several companies",
+    description="Get company information for a list of DUNS numbers in one request. "
+                "Unknown DUNS numbers are listed in `not_found` instead of failing the request."
+)
+def get_companies_batch(request: CompanyBatchRequest):
+    """Get company details for several DUNS numbers."""
+    found, not_found = _split_known(request.duns)
+
+    return json_response({
+        "companies": [{"duns": duns, "data": data_loader.company_data[duns]} for duns in found],
+        "not_found": not_found
+    })
+
+@router.post(
+    "/financials/batch",
+    response_model=FinancialBatchResponse,
+    summary="Get financial statements for several companies",
+    description="Get selected financial statements for a list of DUNS numbers in one request. "
+                "Optionally filter by year or year range and by line item. Statements that were "
+                "not requested are null; unknown DUNS numbers are listed in `not_found`."
+)
+def get_financials_batch(request: FinancialBatchRequest):
+    """Get financial statements for several DUNS numbers."""
+    found, not_found = _split_known(request.duns)
+    stores = {
+        statement: data_loader.get_statement_store(statement)
+        for statement in dict.fromkeys(request.statements)
+    }
+
+    results = []
+    for duns in found:
+        # Statements that were not requested stay null, as in CompanyFinancials
+        result = {"duns": duns, "balance_sheet": None, "income_statement": None, "cash_flow": None}
+        for statement, store in stores.items():
+            result[statement] = store.records(
+                duns,
+                year=request.year,
+                year_from=request.year_from,
+                year_to=request.year_to,
+                include_raw=request.include_raw,
+                line_items=request.line_items
+            )
+        results.append(result)
+
+    return json_response({
+        "results": results,
+        "not_found": not_found
+    })
+
+@router.post(
+    "/metrics/batch",
+    response_model=MetricsBatchResponse,
+    summary="Get financial metrics for several companies",
+    description="Get precomputed ratios and growth metrics for a list of DUNS numbers in one request. "
+                "Unknown DUNS numbers are listed in `not_found`."
+)
+def get_metrics_batch(request: MetricsBatchRequest):
+    """Get financial metrics for several DUNS numbers."""
+    found, not_found = _split_known(request.duns)
+    metrics = data_loader.financial_metrics
+
+    return json_response({
+        "results": [
+            {
+                "duns": duns,
+                **metrics.company(
+                    duns, request.metrics,
+                    year=request.year, year_from=request.year_from, year_to=request.year_to
+                )
+            }
+            for duns in found
+        ],
+        "not_found": not_found
+    })
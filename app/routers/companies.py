@@ -4,6 +4,8 @@ Company endpoints router.
 from fastapi import APIRouter, HTTPException, Query
 from typing import Optional
 import data_loader
+from response_cache import cached_response
+from search_index import decode_cursor, encode_cursor
 from models import (
     CompanyInfoResponse,
     CompanyListResponse,
@@ -18,89 +20,73 @@ from models import (
 
 router = APIRouter(prefix="/companies", tags=["companies"])
 
+CURSOR_DESCRIPTION = "Continue after the page that returned this next_cursor (offset then counts from there)"
+
+def _company_page(
+    query: Optional[str],
+    company_type: Optional[str],
+    industry_code: Optional[str],
+    cursor: Optional[str],
+    offset: int,
+    limit: int,
+) -> CompanyListResponse:
+    """Build one page of a company listing in DUNS order, continuing after ``cursor``."""
+    try:
+        after = decode_cursor(cursor) if cursor is not None else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Only the returned page is materialized, from the fields prebuilt in the search index
+    index = data_loader.search_index
+    positions, total, has_more = index.page(
+        query=query, company_type=company_type, industry_code=industry_code,
+        after=after, offset=offset, limit=limit
+    )
+    companies = [CompanyListItem(**index.list_items[position]) for position in positions]
+
+    return CompanyListResponse(
+        total=total,
+        companies=companies,
+        next_cursor=encode_cursor(companies[-1].duns) if has_more else None
+    )
+
 @router.get(
     "",
     response_model=CompanyListResponse,
     summary="List all companies",
-    description="Get a list of all companies with basic information. Supports pagination."
+    description="Get a list of all companies with basic information, in DUNS order. Page with offset, "
+                "or pass each response's next_cursor as cursor, which stays cheap however deep the page.",
+    responses={400: {"model": ErrorResponse, "description": "Invalid cursor"}}
 )
+@cached_response("list_companies")
 def list_companies(
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of results to return"),
-    offset: int = Query(0, ge=0, description="Number of results to skip")
+    offset: int = Query(0, ge=0, description="Number of results to skip"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION)
 ):
     """List all companies with pagination."""
-    all_duns = data_loader.get_all_duns_numbers()
-
-    # Apply pagination
-    paginated_duns = all_duns[offset:offset + limit]
-
-    companies = []
-    for duns in paginated_duns:
-        company_info = data_loader.company_data.get(duns, {})
-        companies.append(CompanyListItem(
-            duns=duns,
-            address=company_info.get("Physical Address"),
-            telephone=company_info.get("Telephone Number"),
-            company_type=company_info.get("Company Type")
-        ))
-
-    return CompanyListResponse(
-        total=len(all_duns),
-        companies=companies
-    )
+    return _company_page(None, None, None, cursor, offset, limit)
 
 @router.get(
     "/search",
     response_model=CompanyListResponse,
     summary="Search companies",
-    description="Search companies by query string (matches address), company type, or industry code."
+    description="Search companies by query string (matches address), company type, or industry code. "
+                "Results are in DUNS order and page like the company listing (offset or cursor).",
+    responses={400: {"model": ErrorResponse, "description": "Invalid cursor"}}
 )
+@cached_response("search_companies")
 def search_companies(
     query: Optional[str] = Query(None, description="Search in company address"),
     company_type: Optional[str] = Query(None, description="Filter by company type (e.g., 'Private', 'Publicly Unlisted')"),
     industry_code: Optional[str] = Query(None, description="Filter by industry code (e.g., '7389')"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of results"),
-    offset: int = Query(0, ge=0, description="Number of results to skip")
+    offset: int = Query(0, ge=0, description="Number of results to skip"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION)
 ):
     """Search companies by various criteria."""
-    all_duns = data_loader.get_all_duns_numbers()
-    filtered_companies = []
-
-    for duns in all_duns:
-        company_info = data_loader.company_data.get(duns, {})
-
-        # Apply filters
-        if query:
-            address = company_info.get("Physical Address", "").lower()
-            if query.lower() not in address:
-                continue
-
-        if company_type:
-            if company_info.get("Company Type") != company_type:
-                continue
-
-        if industry_code:
-            industries = data_loader.industries_data.get(duns, [])
-            industry_codes = [ind.get("industry_code") for ind in industries]
-            if industry_code not in industry_codes:
-                continue
-
-        # Company matches all filters
-        filtered_companies.append(CompanyListItem(
-            duns=duns,
-            address=company_info.get("Physical Address"),
-            telephone=company_info.get("Telephone Number"),
-            company_type=company_info.get("Company Type")
-        ))
-
-    # Apply pagination
-    total = len(filtered_companies)
-    paginated = filtered_companies[offset:offset + limit]
-
-    return CompanyListResponse(
-        total=total,
-        companies=paginated
-    )
+    # Filters are answered from the prebuilt search index
+    return _company_page(query, company_type, industry_code, cursor, offset, limit)
 
 @router.get(
     "/{duns}",
@@ -109,6 +95,7 @@ def search_companies(
     description="Get detailed information for a specific company by DUNS number.",
     responses={404: {"model": ErrorResponse, "description": "Company not found"}}
 )
+@cached_response("get_company", categories=("company_info",))
 def get_company(duns: str):
     """Get company details by DUNS number."""
     if duns not in data_loader.company_data:
@@ -126,6 +113,7 @@ def get_company(duns: str):
     description="Get industry classifications for a specific company.",
     responses={404: {"model": ErrorResponse, "description": "Company not found"}}
 )
+@cached_response("get_company_industries", categories=("industries",))
 def get_company_industries(duns: str):
     """Get industry classifications for a company."""
     if duns not in data_loader.company_data:
@@ -145,6 +133,7 @@ def get_company_industries(duns: str):
     description="Get list of people/personnel for a specific company.",
     responses={404: {"model": ErrorResponse, "description": "Company not found"}}
 )
+@cached_response("get_company_people", categories=("people",))
 def get_company_people(duns: str):
     """Get company personnel."""
     if duns not in data_loader.company_data:
@@ -164,6 +153,7 @@ def get_company_people(duns: str):
     description="Get operations descriptions for a specific company.",
     responses={404: {"model": ErrorResponse, "description": "Company not found"}}
 )
+@cached_response("get_company_operations", categories=("operations",))
 def get_company_operations(duns: str):
     """Get company operations descriptions."""
     if duns not in data_loader.company_data:
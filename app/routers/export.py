@@ -0,0 +1,140 @@
+"""
+Bulk export endpoints router: every company's statements in one streamed response.
+"""
+import csv
+import io
+from fastapi import APIRouter, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import Iterator, List, Literal, Optional
+import data_loader
+from compression import encoded_etag, negotiate_encoding
+from json_encoding import dumps
+from models import StatementType
+from response_cache import compute_etag, etag_matches
+from statement_store import StatementStore
+from tabular import MEDIA_TYPES as TABULAR_MEDIA_TYPES, negotiate, require_pyarrow, statement_table, stream_tables
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "arrow": TABULAR_MEDIA_TYPES["arrow"],
+    "parquet": TABULAR_MEDIA_TYPES["parquet"],
+}
+
+# Companies per Arrow record batch / Parquet row group
+TABLE_BATCH_COMPANIES = 50
+
+CSV_COLUMNS = ["duns", "line_item", "year", "value"]
+
+def _company_chunks(
+    store: StatementStore,
+    year: Optional[int],
+    year_from: Optional[int],
+    year_to: Optional[int],
+    line_items: Optional[List[str]],
+    include_raw: bool,
+) -> Iterator[List[dict]]:
+    """Yield the filtered rows of one company at a time, skipping companies with no matching rows."""
+    for duns in store.duns_order:
+        rows = store.records(
+            duns, year=year, year_from=year_from, year_to=year_to,
+            include_raw=include_raw, line_items=line_items
+        )
+        if rows:
+            yield rows
+
+def _ndjson_lines(chunks: Iterator[List[dict]]) -> Iterator[bytes]:
+    """Encode each row as one JSON document per line."""
+    for rows in chunks:
+        yield b"".join(dumps(row) + b"\n" for row in rows)
+
+def _csv_lines(chunks: Iterator[List[dict]], include_raw: bool) -> Iterator[str]:
+    """Encode rows as CSV, header first; blank values are written as empty fields."""
+    columns = CSV_COLUMNS + (["raw_value"] if include_raw else [])
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, lineterminator="\n")
+    writer.writeheader()
+    yield buffer.getvalue()
+    for rows in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue()
+
+def _table_batches(
+    store: StatementStore,
+    year: Optional[int],
+    year_from: Optional[int],
+    year_to: Optional[int],
+    line_items: Optional[List[str]],
+    include_raw: bool,
+) -> Iterator:
+    """Yield Arrow tables covering ``TABLE_BATCH_COMPANIES`` companies each."""
+    for first in range(0, len(store.duns_order), TABLE_BATCH_COMPANIES):
+        company_rows = [
+            (duns, store.row_indices(duns, year, year_from, year_to, line_items))
+            for duns in store.duns_order[first:first + TABLE_BATCH_COMPANIES]
+        ]
+        yield statement_table(store, [(duns, rows) for duns, rows in company_rows if len(rows)], include_raw)
+
+@router.get(
+    "/{statement}",
+    summary="Export a statement for all companies",
+    description="Stream every company's rows for one statement as NDJSON (one row per line), CSV, "
+                "an Arrow IPC stream or Parquet, chosen by `format` or the Accept header. Optionally "
+                "filter by year or year range and by line items (exact names, ids from /line-items or "
+                "case-insensitive glob patterns such as 'Revenue*'). Rows are encoded a few companies "
+                "at a time, so the full export is never held in memory.",
+    response_class=StreamingResponse,
+    responses={200: {"content": {media_type: {} for media_type in MEDIA_TYPES.values()}}}
+)
+def export_statement(
+    request: Request,
+    statement: StatementType,
+    format: Optional[Literal["ndjson", "csv", "arrow", "parquet"]] = Query(
+        None, description="Output format: 'ndjson', 'csv', 'arrow' or 'parquet'. Defaults to the Accept header, then NDJSON"
+    ),
+    year: Optional[int] = Query(None, description="Filter by specific year (e.g., 2024)"),
+    year_from: Optional[int] = Query(None, description="Filter to years from this year onwards (e.g., 2020)"),
+    year_to: Optional[int] = Query(None, description="Filter to years up to and including this year (e.g., 2024)"),
+    line_items: Optional[List[str]] = Query(None, description="Only export these line items: exact names, ids from /line-items or case-insensitive glob patterns (repeat the parameter for several)"),
+    include_raw: bool = Query(False, description="Also export each original value string as raw_value")
+):
+    """Stream a statement for all companies."""
+    if format is None:
+        format = negotiate(request.headers.get("accept"), MEDIA_TYPES, "ndjson")
+    require_pyarrow(format)
+
+    arguments = {
+        "statement": statement, "format": format, "year": year, "year_from": year_from,
+        "year_to": year_to, "line_items": tuple(line_items or ()), "include_raw": include_raw,
+    }
+    # CompressionMiddleware adds the encoding's suffix to the ETag when it compresses the
+    # stream; an export too small to compress keeps the plain one, so accept either
+    etag = compute_etag("export_statement", None, arguments)
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    for candidate in (encoded_etag(etag, encoding), etag):
+        if etag_matches(request.headers.get("if-none-match"), candidate):
+            return Response(status_code=304, headers={"ETag": candidate, "Vary": "Accept, Accept-Encoding"})
+
+    # Bind the store now so a reload during the stream cannot mix two datasets
+    store = data_loader.get_statement_store(statement)
+    if format in ("arrow", "parquet"):
+        schema = statement_table(store, [], include_raw).schema
+        batches = _table_batches(store, year, year_from, year_to, line_items, include_raw)
+        content = stream_tables(batches, schema, format)
+    else:
+        chunks = _company_chunks(store, year, year_from, year_to, line_items, include_raw)
+        content = _csv_lines(chunks, include_raw) if format == "csv" else _ndjson_lines(chunks)
+
+    return StreamingResponse(
+        content,
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "ETag": etag,
+            "Vary": "Accept, Accept-Encoding",
+            "Content-Disposition": f'attachment; filename="{statement}.{format}"',
+        }
+    )
@@ -1,123 +1,270 @@
 """
 Financial data endpoints router.
 """
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional
+from dataclasses import dataclass
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional, Sequence, Tuple, Union
 import data_loader
-from models import FinancialStatementResponse, CombinedFinancialResponse, ErrorResponse
+from json_encoding import json_response
+from response_cache import cached_response
+from statement_store import StatementStore
+from tabular import MEDIA_TYPES, response_format, statement_response
+from models import (
+    FinancialStatementResponse,
+    CombinedFinancialResponse,
+    WideStatementResponse,
+    WideCombinedFinancialResponse,
+    CompanyMetrics,
+    MetricName,
+    PeerBenchmarkResponse,
+    BenchmarkSource,
+    PeerLevel,
+    StatementLayout,
+    RecordField,
+    ErrorResponse
+)
 
 router = APIRouter(prefix="/companies", tags=["financials"])
 
+LINE_ITEMS_DESCRIPTION = (
+    "Only return these line items: exact names, ids from /line-items (e.g. 'total_assets') or "
+    "case-insensitive glob patterns such as 'Revenue*' or '*cash*' (repeat the parameter for "
+    "several; default: all)"
+)
+FIELDS_DESCRIPTION = (
+    "Only return these fields of each row (repeat the parameter for several; long layout and "
+    "Arrow/Parquet only). Asking for raw_value implies include_raw"
+)
+STATEMENT_DESCRIPTION = (
+    " Optionally filter by year or year range, select line items by name or pattern and project "
+    "row fields. Use `layout=wide` for a line items x years matrix, or `format` or the Accept "
+    "header for Arrow or Parquet."
+)
+LAYOUT_DESCRIPTION = "'long' for one object per line item and year, 'wide' for a line items x years matrix (JSON only)"
+
+# Statement endpoint names and the data_loader globals holding their stores
+STATEMENT_STORES = {
+    "balance_sheet": "balance_sheet_data",
+    "income_statement": "income_statement_data",
+    "cash_flow": "cash_flow_data",
+}
+
+@dataclass(frozen=True)
+class StatementParams:
+    """Year filters, line item and field selection and layout shared by the statement endpoints."""
+    year: Optional[int] = None
+    year_from: Optional[int] = None
+    year_to: Optional[int] = None
+    include_raw: bool = False
+    layout: str = "long"
+    line_items: Optional[Tuple[str, ...]] = None
+    fields: Optional[Tuple[str, ...]] = None
+
+    def filters(self) -> dict:
+        """Keyword arguments selecting rows from a :class:`StatementStore`."""
+        return {
+            "year": self.year,
+            "year_from": self.year_from,
+            "year_to": self.year_to,
+            "include_raw": self.include_raw,
+            "line_items": self.line_items,
+        }
+
+def statement_params(
+    year: Optional[int] = Query(None, description="Filter by specific year (e.g., 2024)"),
+    year_from: Optional[int] = Query(None, description="Filter to years from this year onwards (e.g., 2020)"),
+    year_to: Optional[int] = Query(None, description="Filter to years up to and including this year (e.g., 2024)"),
+    include_raw: bool = Query(False, description="Also return each original value string (e.g., '$56,136') as raw_value"),
+    layout: StatementLayout = Query("long", description=LAYOUT_DESCRIPTION),
+    line_items: Optional[List[str]] = Query(None, description=LINE_ITEMS_DESCRIPTION),
+    fields: Optional[List[RecordField]] = Query(None, description=FIELDS_DESCRIPTION)
+) -> StatementParams:
+    """Collect the statement endpoints' shared query parameters (lists become tuples, so they hash)."""
+    return StatementParams(
+        year=year,
+        year_from=year_from,
+        year_to=year_to,
+        include_raw=include_raw,
+        layout=layout,
+        line_items=tuple(line_items) if line_items is not None else None,
+        fields=tuple(fields) if fields is not None else None,
+    )
+
+def _wide_statement(wide: dict) -> dict:
+    """A :meth:`StatementStore.wide` result in the shape of the ``WideStatement`` model."""
+    return {**wide, "raw_values": wide.get("raw_values")}
+
+def _statement(store: StatementStore, duns: str, params: StatementParams) -> Union[list, dict]:
+    """One company's statement as JSON-ready data, in the requested layout."""
+    if params.layout == "wide":
+        # Sliced from the (company, line item, year) cube built at load time
+        return _wide_statement(store.wide(duns, **params.filters()))
+    # Served from the (DUNS, year) index when filtering by year or year range
+    return store.records(duns, **params.filters(), fields=params.fields)
+
+def _statements_response(duns: str, statements: Sequence[str], params: StatementParams, format: str):
+    """
+    Respond with one or more of a company's statements.
+
+    A single statement is wrapped with its ``statement_type``; several (the summary)
+    are keyed by name. Arrow and Parquet put all of them in one table.
+    """
+    if duns not in data_loader.company_data:
+        raise HTTPException(status_code=404, detail=f"Company with DUNS {duns} not found")
+    if params.fields is not None and params.layout == "wide":
+        # The wide matrix has no per-row fields to project
+        raise HTTPException(status_code=400, detail="fields applies to the long layout only")
+    if format != "json" and params.layout == "wide":
+        # Arrow and Parquet tables are always long rows
+        raise HTTPException(status_code=400, detail="layout=wide applies to JSON responses only")
+
+    stores = [(statement, getattr(data_loader, STATEMENT_STORES[statement])) for statement in statements]
+    if format != "json":
+        return statement_response(stores, duns, format, **params.filters(), fields=params.fields)
+
+    if len(stores) > 1:
+        return json_response({"duns": duns, **{name: _statement(store, duns, params) for name, store in stores}})
+    statement, store = stores[0]
+    return json_response({"duns": duns, "statement_type": statement, "data": _statement(store, duns, params)})
+
 @router.get(
     "/{duns}/balance-sheet",
-    response_model=FinancialStatementResponse,
+    response_model=Union[FinancialStatementResponse, WideStatementResponse],
     summary="Get balance sheet",
-    description="Get balance sheet data for a specific company. Optionally filter by year.",
-    responses={404: {"model": ErrorResponse, "description": "Company not found"}}
+    description="Get balance sheet data for a specific company." + STATEMENT_DESCRIPTION,
+    responses={
+        200: {"content": {MEDIA_TYPES["arrow"]: {}, MEDIA_TYPES["parquet"]: {}}},
+        404: {"model": ErrorResponse, "description": "Company not found"},
+        406: {"model": ErrorResponse, "description": "Arrow/Parquet support is not installed"}
+    }
 )
+@cached_response("get_balance_sheet", categories=("balance_sheet",))
 def get_balance_sheet(
     duns: str,
-    year: Optional[int] = Query(None, description="Filter by specific year (e.g., 2024)")
+    params: StatementParams = Depends(statement_params),
+    format: str = Depends(response_format)
 ):
     """Get balance sheet data for a company."""
-    if duns not in data_loader.company_data:
-        raise HTTPException(status_code=404, detail=f"Company with DUNS {duns} not found")
-
-    balance_sheet = data_loader.balance_sheet_data.get(duns, [])
-
-    # Filter by year if specified
-    if year is not None:
-        balance_sheet = [item for item in balance_sheet if item.get('year') == year]
-
-    return FinancialStatementResponse(
-        duns=duns,
-        statement_type="balance_sheet",
-        data=balance_sheet
-    )
+    return _statements_response(duns, ("balance_sheet",), params, format)
 
 @router.get(
     "/{duns}/income-statement",
-    response_model=FinancialStatementResponse,
+    response_model=Union[FinancialStatementResponse, WideStatementResponse],
     summary="Get income statement",
-    description="Get income statement data for a specific company. Optionally filter by year.",
-    responses={404: {"model": ErrorResponse, "description": "Company not found"}}
+    description="Get income statement data for a specific company." + STATEMENT_DESCRIPTION,
+    responses={
+        200: {"content": {MEDIA_TYPES["arrow"]: {}, MEDIA_TYPES["parquet"]: {}}},
+        404: {"model": ErrorResponse, "description": "Company not found"},
+        406: {"model": ErrorResponse, "description": "Arrow/Parquet support is not installed"}
+    }
 )
+@cached_response("get_income_statement", categories=("income_statement",))
 def get_income_statement(
     duns: str,
-    year: Optional[int] = Query(None, description="Filter by specific year (e.g., 2024)")
+    params: StatementParams = Depends(statement_params),
+    format: str = Depends(response_format)
 ):
     """Get income statement data for a company."""
-    if duns not in data_loader.company_data:
-        raise HTTPException(status_code=404, detail=f"Company with DUNS {duns} not found")
-
-    income_statement = data_loader.income_statement_data.get(duns, [])
-
-    # Filter by year if specified
-    if year is not None:
-        income_statement = [item for item in income_statement if item.get('year') == year]
-
-    return FinancialStatementResponse(
-        duns=duns,
-        statement_type="income_statement",
-        data=income_statement
-    )
+    return _statements_response(duns, ("income_statement",), params, format)
 
 @router.get(
     "/{duns}/cash-flow",
-    response_model=FinancialStatementResponse,
+    response_model=Union[FinancialStatementResponse, WideStatementResponse],
     summary="Get cash flow statement",
-    description="Get cash flow statement data for a specific company. Optionally filter by year.",
-    responses={404: {"model": ErrorResponse, "description": "Company not found"}}
+    description="Get cash flow statement data for a specific company." + STATEMENT_DESCRIPTION,
+    responses={
+        200: {"content": {MEDIA_TYPES["arrow"]: {}, MEDIA_TYPES["parquet"]: {}}},
+        404: {"model": ErrorResponse, "description": "Company not found"},
+        406: {"model": ErrorResponse, "description": "Arrow/Parquet support is not installed"}
+    }
 )
+@cached_response("get_cash_flow", categories=("cash_flow_statement",))
 def get_cash_flow(
     duns: str,
-    year: Optional[int] = Query(None, description="Filter by specific year (e.g., 2024)")
+    params: StatementParams = Depends(statement_params),
+    format: str = Depends(response_format)
 ):
     """Get cash flow statement data for a company."""
-    if duns not in data_loader.company_data:
-        raise HTTPException(status_code=404, detail=f"Company with DUNS {duns} not found")
-
-    cash_flow = data_loader.cash_flow_data.get(duns, [])
-
-    # Filter by year if specified
-    if year is not None:
-        cash_flow = [item for item in cash_flow if item.get('year') == year]
-
-    return FinancialStatementResponse(
-        duns=duns,
-        statement_type="cash_flow",
-        data=cash_flow
-    )
+    return _statements_response(duns, ("cash_flow",), params, format)
 
 @router.get(
     "/{duns}/financials/summary",
-    response_model=CombinedFinancialResponse,
+    response_model=Union[CombinedFinancialResponse, WideCombinedFinancialResponse],
     summary="Get all financial statements",
-    description="Get balance sheet, income statement, and cash flow data in a single response. Optionally filter by year.",
-    responses={404: {"model": ErrorResponse, "description": "Company not found"}}
+    description="Get balance sheet, income statement, and cash flow data in a single response." + STATEMENT_DESCRIPTION,
+    responses={
+        200: {"content": {MEDIA_TYPES["arrow"]: {}, MEDIA_TYPES["parquet"]: {}}},
+        404: {"model": ErrorResponse, "description": "Company not found"},
+        406: {"model": ErrorResponse, "description": "Arrow/Parquet support is not installed"}
+    }
 )
+@cached_response("get_financial_summary", categories=("balance_sheet", "income_statement", "cash_flow_statement"))
 def get_financial_summary(
     duns: str,
-    year: Optional[int] = Query(None, description="Filter by specific year (e.g., 2024)")
+    params: StatementParams = Depends(statement_params),
+    format: str = Depends(response_format)
 ):
     """Get all financial statements for a company in one response."""
+    return _statements_response(duns, tuple(STATEMENT_STORES), params, format)
+
+@router.get(
+    "/{duns}/metrics",
+    response_model=CompanyMetrics,
+    summary="Get financial ratios and growth metrics",
+    description="Get margins, liquidity, leverage and return ratios and year-over-year growth for a "
+                "specific company, per year. Metrics are precomputed for all companies at load time; "
+                "a value is null when an input is missing or a denominator is zero.",
+    responses={404: {"model": ErrorResponse, "description": "Company not found"}}
+)
+@cached_response("get_company_metrics", categories=("balance_sheet", "income_statement", "cash_flow_statement"))
+def get_company_metrics(
+    duns: str,
+    metrics: Optional[List[MetricName]] = Query(None, description="Metrics to return (repeat the parameter for several; default: all)"),
+    year: Optional[int] = Query(None, description="Filter by specific year (e.g., 2024)"),
+    year_from: Optional[int] = Query(None, description="Filter to years from this year onwards (e.g., 2020)"),
+    year_to: Optional[int] = Query(None, description="Filter to years up to and including this year (e.g., 2024)")
+):
+    """Get financial metrics for a company."""
     if duns not in data_loader.company_data:
         raise HTTPException(status_code=404, detail=f"Company with DUNS {duns} not found")
 
-    # Get all financial data
-    balance_sheet = data_loader.balance_sheet_data.get(duns, [])
-    income_statement = data_loader.income_statement_data.get(duns, [])
-    cash_flow = data_loader.cash_flow_data.get(duns, [])
+    return CompanyMetrics(
+        duns=duns,
+        **data_loader.financial_metrics.company(duns, metrics, year=year, year_from=year_from, year_to=year_to)
+    )
+
+@router.get(
+    "/{duns}/benchmark",
+    response_model=PeerBenchmarkResponse,
+    summary="Benchmark a company against its industry peers",
+    description="Get a company's percentile rank and the peer median and quartiles for selected line items "
+                "(or financial metrics) in each year, within its primary SIC industry or that industry's "
+                "2-digit major group. Distributions are precomputed for all industries at load time.",
+    responses={404: {"model": ErrorResponse, "description": "Company not found or has no primary industry"}}
+)
+@cached_response("get_company_benchmark")
+def get_company_benchmark(
+    duns: str,
+    source: BenchmarkSource = Query("metrics", description="Statement to benchmark line items from, or 'metrics' for ratios and growth"),
+    line_items: Optional[List[str]] = Query(None, description="Line items (exact names or ids from /line-items) or metric names (repeat the parameter for several; default: all)"),
+    level: PeerLevel = Query("industry", description="Peer group: 'industry' (primary SIC code) or 'major_group' (its first two digits)"),
+    year: Optional[int] = Query(None, description="Filter by specific year (e.g., 2024)"),
+    year_from: Optional[int] = Query(None, description="Filter to years from this year onwards (e.g., 2020)"),
+    year_to: Optional[int] = Query(None, description="Filter to years up to and including this year (e.g., 2024)")
+):
+    """Benchmark a company against its industry peers."""
+    if duns not in data_loader.company_data:
+        raise HTTPException(status_code=404, detail=f"Company with DUNS {duns} not found")
 
-    # Filter by year if specified
-    if year is not None:
-        balance_sheet = [item for item in balance_sheet if item.get('year') == year]
-        income_statement = [item for item in income_statement if item.get('year') == year]
-        cash_flow = [item for item in cash_flow if item.get('year') == year]
+    benchmark = data_loader.peer_benchmarks.company(
+        duns, source, line_items, level=level, year=year, year_from=year_from, year_to=year_to
+    )
+    if benchmark is None:
+        raise HTTPException(status_code=404, detail=f"Company with DUNS {duns} has no primary industry")
 
-    return CombinedFinancialResponse(
+    return PeerBenchmarkResponse(
         duns=duns,
-        balance_sheet=balance_sheet,
-        income_statement=income_statement,
-        cash_flow=cash_flow
+        source=source,
+        level=level,
+        **benchmark
     )
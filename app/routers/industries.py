@@ -2,8 +2,8 @@
 Industries endpoints router.
 """
 from fastapi import APIRouter, Query
-from typing import Dict
 import data_loader
+from response_cache import cached_response
 from models import IndustryListResponse, IndustryInfo
 
 router = APIRouter(prefix="/industries", tags=["industries"])
@@ -14,41 +14,18 @@ router = APIRouter(prefix="/industries", tags=["industries"])
     summary="List all industries",
     description="Get a list of all unique industries with company counts."
 )
+@cached_response("list_industries")
 def list_industries(
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of results"),
     offset: int = Query(0, ge=0, description="Number of results to skip")
 ):
     """List all industries with company counts."""
-    # Aggregate industries across all companies
-    industry_map: Dict[str, Dict] = {}
-
-    for duns, industries_list in data_loader.industries_data.items():
-        for industry_item in industries_list:
-            code = industry_item.get("industry_code", "")
-            description = industry_item.get("industry_description", "")
-
-            # Convert code to string and skip NaN or empty values
-            code = str(code) if code is not None and str(code) != "nan" else ""
-            description = str(description) if description is not None and str(description) != "nan" else ""
-
-            if code and code != "":  # Skip empty codes
-                if code not in industry_map:
-                    industry_map[code] = {
-                        "industry_code": code,
-                        "industry_description": description,
-                        "company_count": 0
-                    }
-                industry_map[code]["company_count"] += 1
-
-    # Convert to list and sort by company count (descending)
-    industries_list = [
-        IndustryInfo(**ind) for ind in industry_map.values()
-    ]
-    industries_list.sort(key=lambda x: x.company_count, reverse=True)
+    # The roll-up is computed and sorted once per data load; requests only slice it
+    industries_list = data_loader.industry_summary
 
     # Apply pagination
     total = len(industries_list)
-    paginated = industries_list[offset:offset + limit]
+    paginated = [IndustryInfo(**ind) for ind in industries_list[offset:offset + limit]]
 
     return IndustryListResponse(
         total_industries=total,
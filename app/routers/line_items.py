@@ -0,0 +1,38 @@
+"""
+Line-item taxonomy endpoint router.
+"""
+from fastapi import APIRouter, Query
+from typing import Optional
+import data_loader
+from response_cache import cached_response
+from models import LineItemListResponse, LineItemInfo, StatementType
+
+router = APIRouter(prefix="/line-items", tags=["line items"])
+
+@router.get(
+    "",
+    response_model=LineItemListResponse,
+    summary="List the line-item taxonomy",
+    description="Get every statement line item with its canonical id, section and unit, in statement order. "
+                "Ids (e.g. 'total_assets') can be used instead of names in line_items parameters, "
+                "batch requests and screen filters. The taxonomy is built once per data load.",
+)
+@cached_response("list_line_items")
+def list_line_items(
+    statement: Optional[StatementType] = Query(None, description="Only list this statement's line items"),
+    section: Optional[str] = Query(None, description="Only list line items directly under this section id"),
+    include_sections: bool = Query(True, description="Include section headers, which never have values")
+):
+    """List the canonical line-item taxonomy."""
+    statements = [statement] if statement else list(data_loader.STATEMENT_TYPES)
+    line_items = [
+        LineItemInfo(statement=statement_type, **entry)
+        for statement_type in statements
+        for entry in data_loader.get_statement_store(statement_type).taxonomy
+        if (include_sections or not entry["is_section"]) and (section is None or entry["section"] == section)
+    ]
+
+    return LineItemListResponse(
+        total=len(line_items),
+        line_items=line_items
+    )
@@ -0,0 +1,64 @@
+"""
+Cross-company screening endpoint router.
+"""
+import numpy as np
+from fastapi import APIRouter, HTTPException
+from typing import List
+import data_loader
+from models import ScreenField, ScreenRequest, ScreenResponse, ScreenResult, ErrorResponse
+
+router = APIRouter(tags=["screening"])
+
+@router.post(
+    "/screen",
+    response_model=ScreenResponse,
+    summary="Screen companies by financial values",
+    description="Find companies whose statement values meet every filter (e.g. revenue above a threshold "
+                "in 2024 and total assets growing year over year), optionally sorted by a field. "
+                "Filters are evaluated over all companies at once from the statement cubes built at load time.",
+    responses={400: {"model": ErrorResponse, "description": "Unknown line item"}}
+)
+def screen_companies(request: ScreenRequest):
+    """Screen all companies against financial filters."""
+    screener = data_loader.screener
+    columns: List[ScreenField] = [ScreenField(**f.model_dump(exclude={"op", "value"})) for f in request.filters]
+    if request.sort_by is not None and request.sort_by not in columns:
+        columns.append(request.sort_by)
+
+    try:
+        column_values = [
+            screener.column(field.statement, field.line_item, field.year, field.metric)
+            for field in columns
+        ]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    candidates = None
+    if request.company_type or request.industry_code:
+        positions = data_loader.search_index.search(
+            company_type=request.company_type, industry_code=request.industry_code
+        )
+        candidates = np.zeros(len(screener.duns_order), dtype=bool)
+        candidates[positions] = True
+
+    sort_values = column_values[columns.index(request.sort_by)] if request.sort_by is not None else None
+    matches = screener.screen(
+        [(values, f.op, f.value) for values, f in zip(column_values, request.filters)],
+        candidates=candidates,
+        sort_values=sort_values,
+        descending=request.sort_order == "desc",
+    )
+
+    # Apply pagination
+    page = matches[request.offset:request.offset + request.limit]
+    grid = np.stack(column_values, axis=1)[page] if column_values else np.empty((len(page), 0))
+    results = [
+        ScreenResult(duns=screener.duns_order[position], values=row)
+        for position, row in zip(page.tolist(), np.where(np.isnan(grid), None, grid).tolist())
+    ]
+
+    return ScreenResponse(
+        total=len(matches),
+        columns=columns,
+        results=results
+    )
@@ -0,0 +1,170 @@
+"""
+Cross-company screening over financial statement values.
+
+Built once per data load over each :class:`StatementStore` cube: the stores
+keep their own company and years axes, and the screener only maps its company
+axis (the order of ``company_data``) and one shared years axis onto them. Any
+(statement, line item) selection is then gathered into a (company x year)
+matrix, and every filter is one vectorized comparison over all companies.
+"""
+import operator
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+import numpy as np
+from statement_store import StatementStore
+
+OPERATORS: Dict[str, Callable[[np.ndarray, float], np.ndarray]] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+METRICS = ("value", "yoy_change", "yoy_growth")
+
+def safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Element-wise division giving NaN where either side is missing or the denominator is zero."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = numerator / denominator
+    result[denominator == 0] = np.nan
+    return result
+
+class Screener:
+    """Statement cubes viewed on one company and years axis, for evaluating screens across all companies."""
+
+    def __init__(self, duns_order: Sequence[str], stores: Mapping[str, StatementStore]):
+        self.duns_order: List[str] = list(duns_order)
+        self.years = np.unique(np.concatenate(
+            [store.cube_years for store in stores.values()] or [np.empty(0, dtype=np.int16)]
+        ))
+        # Years axis position of each year's previous year (-1 if not in the data)
+        previous = np.searchsorted(self.years, self.years - 1)
+        found = previous < len(self.years)
+        found[found] = self.years[previous[found]] == self.years[found] - 1
+        self._previous_positions = np.where(found, previous, -1)
+
+        # Companies reporting any statement row in a year
+        self.reported = np.zeros((len(self.duns_order), len(self.years)), dtype=bool)
+        self._stores: Dict[str, StatementStore] = dict(stores)
+        # statement type -> each company's position in the store (-1 if absent),
+        # and each of the store's cube years' position on the years axis
+        self._company_positions: Dict[str, np.ndarray] = {}
+        self._year_positions: Dict[str, np.ndarray] = {}
+        for statement, store in stores.items():
+            positions = np.array([
+                -1 if position is None else position
+                for position in map(store.position, self.duns_order)
+            ], dtype=np.int64)
+            year_positions = np.searchsorted(self.years, store.cube_years)
+            self._company_positions[statement] = positions
+            self._year_positions[statement] = year_positions
+            present = positions >= 0
+            self.reported[np.ix_(present, year_positions)] |= store.company_years[positions[present]]
+
+    @property
+    def statements(self) -> List[str]:
+        """Statement types with a cube."""
+        return list(self._stores)
+
+    def line_items(self, statement: str) -> List[str]:
+        """Return a statement's line-item names, in line item index order."""
+        return self._stores[statement].line_items
+
+    def item_index(self, statement: str, line_item: str) -> int:
+        """
+        Return a line item's index given its exact name or taxonomy id.
+        Raises ValueError for unknown names.
+        """
+        if statement not in self._stores:
+            raise ValueError(f"Unknown statement: {statement}")
+        item = self._stores[statement].line_item_id(line_item)
+        if item is None:
+            raise ValueError(f"Unknown line item for {statement}: {line_item}")
+        return item
+
+    def values(self, statement: str, positions: np.ndarray, items: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Gather a (company x line item x year) block of a statement's cube for the companies
+        at ``positions`` and the line item indexes ``items`` (default: all), on the years axis.
+        Cells a company or year has no row for are NaN.
+        """
+        store = self._stores[statement]
+        if items is None:
+            items = np.arange(len(store.line_items))
+        rows = self._company_positions[statement][positions]
+        present = rows >= 0
+        block = np.full((len(rows), len(items), len(self.years)), np.nan)
+        block[np.ix_(present, np.arange(len(items)), self._year_positions[statement])] = (
+            store.cube[np.ix_(rows[present], items, np.arange(len(store.cube_years)))]
+        )
+        return block
+
+    def matrix(self, statement: str, line_item: str) -> np.ndarray:
+        """
+        Return a line item's (company x year) values, given its exact name or taxonomy id.
+        Raises ValueError for unknown names.
+        """
+        item = self.item_index(statement, line_item)
+        positions = np.arange(len(self.duns_order))
+        return self.values(statement, positions, np.array([item]))[:, 0, :]
+
+    def previous_year(self, matrix: np.ndarray) -> np.ndarray:
+        """Shift a (company x year) matrix so each column holds the previous year's values."""
+        shifted = np.full_like(matrix, np.nan)
+        has_previous = self._previous_positions >= 0
+        shifted[:, has_previous] = matrix[:, self._previous_positions[has_previous]]
+        return shifted
+
+    def year_change(self, matrix: np.ndarray, relative: bool = False) -> np.ndarray:
+        """
+        Year-over-year change of a (company x year) matrix; with ``relative`` it is
+        divided by the previous year's absolute value (NaN when that is zero).
+        """
+        previous = self.previous_year(matrix)
+        change = matrix - previous
+        return safe_divide(change, np.abs(previous)) if relative else change
+
+    def column(self, statement: str, line_item: str, year: int, metric: str = "value") -> np.ndarray:
+        """
+        Evaluate a metric of one line item in one year for every company.
+
+        ``yoy_change`` is the difference from the previous year and ``yoy_growth``
+        the relative change against the absolute previous value. Missing inputs
+        (and growth from zero) give NaN. Raises ValueError for unknown names.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        matrix = self.matrix(statement, line_item)
+        position = int(np.searchsorted(self.years, year))
+        if position == len(self.years) or self.years[position] != year:
+            return np.full(len(self.duns_order), np.nan)
+        if metric != "value":
+            matrix = self.year_change(matrix, relative=metric == "yoy_growth")
+        return matrix[:, position]
+
+    def screen(
+        self,
+        filters: Sequence[Tuple[np.ndarray, str, float]],
+        candidates: Optional[np.ndarray] = None,
+        sort_values: Optional[np.ndarray] = None,
+        descending: bool = False,
+    ) -> np.ndarray:
+        """
+        Return positions of companies passing every ``(values, op, threshold)`` filter.
+
+        Companies whose value is missing never pass a filter. ``candidates`` restricts
+        the universe to a boolean mask; ``sort_values`` orders the result (missing
+        values last), otherwise results keep ``duns_order``.
+        """
+        mask = np.ones(len(self.duns_order), dtype=bool) if candidates is None else candidates.copy()
+        for values, op, threshold in filters:
+            with np.errstate(invalid="ignore"):
+                mask &= ~np.isnan(values) & OPERATORS[op](values, threshold)
+
+        matches = np.flatnonzero(mask)
+        if sort_values is None:
+            return matches
+        keys = sort_values[matches]
+        order = np.argsort(-keys if descending else keys, kind="stable")
+        return matches[order]
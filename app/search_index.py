@@ -0,0 +1,196 @@
+"""
+Prebuilt indexes for company search.
+
+Built once per data load so ``/companies/search`` does not scan every company:
+
+* a trigram index over lowercased ``Physical Address`` for substring queries
+* a hash index from ``Company Type`` to companies
+* an industry code -> companies posting list from ``industries_data``
+
+Companies are referred to by their position in ``duns_order``; filters are
+combined by intersecting posting sets, smallest first.
+
+Listings page through companies in DUNS order, which does not depend on the
+order files were read in. ``sorted_positions`` holds that order, so a page
+after a cursor (the last DUNS returned, see :func:`encode_cursor`) starts with
+a binary search and stops as soon as it is full.
+"""
+import base64
+import binascii
+import bisect
+import math
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional, Set, Tuple
+import numpy as np
+
+NGRAM_SIZE = 3
+
+# A filtered page scans the DUNS order while at least 1 in this many remaining companies
+# match; sparser matches are ordered directly instead
+DENSE_SCAN_RATIO = 16
+
+def normalize_industry_code(code: Any) -> Optional[str]:
+    """Normalize an industry code for lookups: 7389.0 and "7389" both become "7389"."""
+    if code is None or (isinstance(code, float) and math.isnan(code)):
+        return None
+    if isinstance(code, float) and code.is_integer():
+        return str(int(code))
+    text = str(code).strip()
+    if text.endswith(".0") and text[:-2].isdigit():
+        text = text[:-2]
+    return text or None
+
+def _ngrams(text: str) -> Set[str]:
+    """Return the distinct character n-grams in ``text``."""
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+def _text(value: Any) -> Optional[str]:
+    """Return a CSV field as a string, or None for missing (NaN) values."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return str(value)
+
+def encode_cursor(duns: str) -> str:
+    """Encode the last DUNS of a page as an opaque cursor for the next one."""
+    return base64.urlsafe_b64encode(duns.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> str:
+    """Decode a cursor from :func:`encode_cursor`. Raises ValueError if it is malformed."""
+    try:
+        duns = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    if not duns.isdigit():
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return duns
+
+class SearchIndex:
+    """Inverted indexes over company info and industries for ``/companies/search``."""
+
+    def __init__(self, company_data: Mapping, industries_data: Mapping):
+        self.duns_order: List[str] = list(company_data.keys())
+        # Fields needed for CompanyListItem, so results never re-read company_data
+        self.list_items: List[Dict[str, Optional[str]]] = []
+        self.addresses: List[str] = []
+        self.address_ngrams: Dict[str, Set[int]] = {}
+        self.company_types: Dict[str, Set[int]] = {}
+        self.industry_codes: Dict[str, Set[int]] = {}
+
+        for position, duns in enumerate(self.duns_order):
+            company_info = company_data[duns]
+            address = _text(company_info.get("Physical Address"))
+            company_type = _text(company_info.get("Company Type"))
+            self.list_items.append({
+                "duns": duns,
+                "address": address,
+                "telephone": _text(company_info.get("Telephone Number")),
+                "company_type": company_type,
+            })
+
+            lowered = (address or "").lower()
+            self.addresses.append(lowered)
+            for ngram in _ngrams(lowered):
+                self.address_ngrams.setdefault(ngram, set()).add(position)
+
+            if company_type is not None:
+                self.company_types.setdefault(company_type, set()).add(position)
+
+            for industry in industries_data.get(duns, []):
+                code = normalize_industry_code(industry.get("industry_code"))
+                if code is not None:
+                    self.industry_codes.setdefault(code, set()).add(position)
+
+        # Positions in DUNS order, each position's index in it, and the sorted DUNS for cursor lookups
+        self.sorted_positions: List[int] = sorted(range(len(self.duns_order)), key=self.duns_order.__getitem__)
+        self.ranks = np.empty(len(self.duns_order), dtype=np.int64)
+        self.ranks[self.sorted_positions] = np.arange(len(self.duns_order))
+        self.sorted_duns: List[str] = [self.duns_order[position] for position in self.sorted_positions]
+
+    def _address_matches(self, query: str) -> Set[int]:
+        """Companies whose address contains ``query`` (case-insensitive)."""
+        query = query.lower()
+        ngrams = _ngrams(query)
+        if ngrams:
+            postings = sorted((self.address_ngrams.get(ngram, set()) for ngram in ngrams), key=len)
+            candidates = set.intersection(*postings)
+        else:
+            # Too short to use the n-gram index
+            candidates = range(len(self.addresses))
+        # N-grams can match out of order, so confirm the substring on the few candidates left
+        return {position for position in candidates if query in self.addresses[position]}
+
+    def _matches(
+        self,
+        query: Optional[str] = None,
+        company_type: Optional[str] = None,
+        industry_code: Optional[str] = None,
+    ) -> Optional[Set[int]]:
+        """Return positions of companies matching every given filter, or None if no filter is given."""
+        postings: List[Set[int]] = []
+        if company_type:
+            postings.append(self.company_types.get(company_type, set()))
+        if industry_code:
+            postings.append(self.industry_codes.get(normalize_industry_code(industry_code), set()))
+
+        postings.sort(key=len)
+        if query:
+            if postings and not postings[0]:
+                return set()
+            matches = self._address_matches(query)
+            postings.insert(0, matches)
+
+        if not postings:
+            return None
+        # A single posting set is returned as is (callers do not modify it)
+        return postings[0] if len(postings) == 1 else set.intersection(*postings)
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        company_type: Optional[str] = None,
+        industry_code: Optional[str] = None,
+    ) -> List[int]:
+        """Return positions of companies matching every given filter, in load order."""
+        matches = self._matches(query, company_type, industry_code)
+        return list(range(len(self.duns_order))) if matches is None else sorted(matches)
+
+    def page(
+        self,
+        query: Optional[str] = None,
+        company_type: Optional[str] = None,
+        industry_code: Optional[str] = None,
+        after: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 100,
+    ) -> Tuple[List[int], int, bool]:
+        """
+        Return ``(positions, total, has_more)`` for one page of matching companies in
+        DUNS order: ``limit`` matches after skipping ``offset`` more past the DUNS
+        ``after`` (from the start if None). ``total`` counts every match.
+
+        When matches are dense, the DUNS order is scanned only until the page (plus
+        one match, to know whether there is more) is full; sparse matches are ordered
+        by rank without scanning.
+        """
+        matches = self._matches(query, company_type, industry_code)
+        start = bisect.bisect_right(self.sorted_duns, after) if after is not None else 0
+        wanted = offset + limit + 1
+
+        if matches is None:
+            hits = self.sorted_positions[start + offset:start + wanted]
+            return hits[:limit], len(self.duns_order), len(hits) > limit
+
+        if len(matches) * DENSE_SCAN_RATIO < len(self.sorted_positions) - start:
+            ranks = self.ranks[np.fromiter(matches, dtype=np.int64, count=len(matches))]
+            ranks = np.sort(ranks[ranks >= start])[offset:wanted]
+            hits = [self.sorted_positions[rank] for rank in ranks.tolist()]
+        else:
+            found = []
+            for index in range(start, len(self.sorted_positions)):
+                position = self.sorted_positions[index]
+                if position in matches:
+                    found.append(position)
+                    if len(found) == wanted:
+                        break
+            hits = found[offset:]
+        return hits[:limit], len(matches), len(hits) > limit
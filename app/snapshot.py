@@ -0,0 +1,214 @@
+"""
+Binary snapshot of the parsed dataset for fast worker startup.
+
+A snapshot is a single file:
+
+* ``MAGIC`` followed by the header length (little-endian uint64)
+* a JSON header with the format version, the fingerprint of the source CSV
+  tree and the dtype/shape/offset of every array
+* the raw array bytes, each aligned to ``ALIGNMENT`` bytes
+* a JSON blob with the remaining (non-array) objects: plain lists, dicts and
+  strings, so reading a snapshot never runs code from the file
+
+Arrays are read back with ``np.frombuffer`` over a read-only memory map, so
+loading a snapshot maps the file instead of copying or parsing it. Strings
+and per-company records are packed into arrays too (see :func:`pack_strings`),
+so with :class:`StringTable` and :class:`MappedRecords` several processes can
+share one mapped copy of the whole dataset through the page cache.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from collections.abc import Mapping, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: snapshot builds are not serialized across processes
+    fcntl = None
+
+MAGIC = b"CFDSNAP\x00"
+# Bump whenever the layout or the meaning of stored arrays changes
+SNAPSHOT_VERSION = 7
+ALIGNMENT = 64
+
+def source_fingerprint(data_path: Path) -> str:
+    """Hash the relative path and contents of every CSV file under ``data_path``."""
+    digest = hashlib.sha256()
+    for csv_file in sorted(data_path.glob("*/*.csv")):
+        digest.update(csv_file.relative_to(data_path).as_posix().encode())
+        digest.update(b"\0")
+        digest.update(csv_file.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+@contextmanager
+def build_lock(path: Path):
+    """Hold an exclusive lock next to ``path`` so only one process builds the snapshot at a time."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(f"{path}.lock", "w") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def pack_strings(strings: Sequence) -> Tuple[np.ndarray, np.ndarray]:
+    """Pack strings into ``(offsets, utf8_bytes)`` arrays for storing in a snapshot."""
+    encoded = [string.encode() for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(data) for data in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+class StringTable(Sequence):
+    """Read-only list of strings decoded on access from :func:`pack_strings` arrays."""
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray):
+        self.offsets = offsets
+        self.data = data
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return self.data[self.offsets[index]:self.offsets[index + 1]].tobytes().decode()
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+class MappedRecords(Mapping):
+    """Read-only DUNS -> record mapping whose records are JSON documents decoded on access."""
+
+    def __init__(self, keys: List[str], documents: StringTable):
+        self._keys = keys
+        self._positions = {key: i for i, key in enumerate(keys)}
+        self._documents = documents
+
+    def __getitem__(self, key: str) -> Any:
+        return json.loads(self._documents[self._positions[key]])
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._positions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+def _aligned(position: int) -> int:
+    """Round a file position up to the next array boundary."""
+    return (position + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def write_snapshot(path: Path, fingerprint: str, arrays: Dict[str, np.ndarray], objects: Dict[str, Any]):
+    """
+    Write a snapshot atomically (to a temporary file that then replaces ``path``).
+
+    ``objects`` must be JSON-serializable; tuples are read back as lists.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    blob = json.dumps(objects).encode()
+
+    # Array offsets are relative to the start of the data section, which follows the header
+    layout = {}
+    position = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        arrays[name] = array
+        position = _aligned(position)
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": position}
+        position += array.nbytes
+    blob_offset = _aligned(position)
+
+    header = json.dumps({
+        "version": SNAPSHOT_VERSION,
+        "fingerprint": fingerprint,
+        "arrays": layout,
+        "objects": {"offset": blob_offset, "length": len(blob)},
+    }).encode()
+    data_start = _aligned(len(MAGIC) + 8 + len(header))
+
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<Q", len(header)))
+            f.write(header)
+            for name, array in arrays.items():
+                f.seek(data_start + layout[name]["offset"])
+                f.write(array.tobytes())
+            f.seek(data_start + blob_offset)
+            f.write(blob)
+        os.replace(temp_name, path)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
+
+def _read_header(f) -> Tuple[Optional[Dict[str, Any]], int]:
+    """Read a snapshot's JSON header and its length; None if not a snapshot of this version."""
+    if f.read(len(MAGIC)) != MAGIC:
+        return None, 0
+    (header_length,) = struct.unpack("<Q", f.read(8))
+    header = json.loads(f.read(header_length))
+    if header.get("version") != SNAPSHOT_VERSION:
+        return None, header_length
+    return header, header_length
+
+def read_fingerprint(path: Path) -> Optional[str]:
+    """Return the source fingerprint of a snapshot from its header alone, or None if there is none."""
+    try:
+        with open(path, "rb") as f:
+            header, _ = _read_header(f)
+    except (OSError, ValueError, struct.error):
+        return None
+    return header.get("fingerprint") if header is not None else None
+
+def read_snapshot(path: Path, fingerprint: Optional[str]) -> Optional[Tuple[Dict[str, np.ndarray], Dict[str, Any]]]:
+    """
+    Map a snapshot and return ``(arrays, objects)``.
+
+    Returns None if the file is missing, unreadable, from another format
+    version or built from different CSV data (unless ``fingerprint`` is None,
+    which accepts a snapshot of any data).
+    """
+    try:
+        with open(path, "rb") as f:
+            header, header_length = _read_header(f)
+            if header is None:
+                return None
+            if fingerprint is not None and header.get("fingerprint") != fingerprint:
+                return None
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError, struct.error):
+        return None
+
+    data_start = _aligned(len(MAGIC) + 8 + header_length)
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        if count == 0:
+            arrays[name] = np.empty(spec["shape"], dtype=dtype)
+            continue
+        arrays[name] = np.frombuffer(
+            mapped, dtype=dtype, count=count, offset=data_start + spec["offset"]
+        ).reshape(spec["shape"])
+
+    blob = header["objects"]
+    start = data_start + blob["offset"]
+    try:
+        objects = json.loads(mapped[start:start + blob["length"]])
+    except ValueError:
+        return None
+    return arrays, objects
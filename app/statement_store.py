@@ -0,0 +1,548 @@
+"""
+Columnar in-memory storage for financial statement rows.
+
+Each statement category (balance sheet, income statement, cash flow) is held as
+a handful of typed numpy arrays instead of one Python dict per CSV row:
+
+* ``line_items`` - interned line-item dictionary; rows store an int32 code
+* ``years`` - int16 year per row
+* ``values`` - float64 parsed value per row (unit scale applied), with
+  ``null_mask`` marking blanks
+* ``raw_labels`` / ``raw_ids`` - dictionary-encoded original value strings
+* ``offsets`` - per-DUNS row ranges into the arrays above
+* ``year_order`` / ``year_index`` - rows sorted by (DUNS, year), with the
+  ``[start, end)`` slice of ``year_order`` for every (DUNS, year) pair
+* ``item_order`` - rows sorted by (DUNS, line item), so selecting a few line
+  items touches only their rows
+* ``cube`` - dense (company, line item, year) value array over ``cube_years``,
+  for pivoted views and cross-company calculations (``raw_cube`` holds the raw
+  string ids, ``company_years`` and ``company_item_ids`` what each company reports)
+* ``taxonomy`` - canonical id, section and unit of every line item (see
+  :mod:`taxonomy`), so queries can name line items by id
+"""
+import fnmatch
+import re
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from snapshot import StringTable, pack_strings
+from taxonomy import build_taxonomy, line_item_unit
+
+def parse_values(raw: pd.Series) -> np.ndarray:
+    """
+    Parse raw value strings such as "$38,406", "($67)" or "5.66%" into float64.
+
+    A lone "-" is the statements' notation for nil and parses to 0.0; blanks are NaN.
+    """
+    text = raw.astype("string").str.strip()
+    negative = (text.str.startswith("(") & text.str.endswith(")")).fillna(False)
+    cleaned = text.str.replace(r"[()$,%]", "", regex=True)
+    values = pd.to_numeric(cleaned, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    values[negative.to_numpy(dtype=bool)] *= -1
+    values[(text == "-").fillna(False).to_numpy(dtype=bool)] = 0.0
+    return values
+
+def line_item_scale(line_item: str) -> float:
+    """Return the multiplier that converts a line item's reported values into units."""
+    unit = line_item_unit(line_item)
+    return unit[1] if unit else 1.0
+
+# Fields of a statement row, in the order records list them
+RECORD_FIELDS = ("duns", "line_item", "year", "value", "raw_value")
+
+# Arrays derived by _build_cube; snapshots store them so mapped workers share them too
+CUBE_ARRAYS = ("cube", "raw_cube", "cube_years", "company_years", "company_item_ids", "company_item_offsets")
+
+# Characters that make a line-item selector a glob pattern rather than an exact name
+GLOB_CHARACTERS = re.compile(r"[*?\[]")
+
+def year_bounds(
+    year: Optional[int] = None, year_from: Optional[int] = None, year_to: Optional[int] = None
+) -> Tuple[Optional[int], Optional[int]]:
+    """Combine an exact year and a year range into inclusive ``(low, high)`` bounds (None when open)."""
+    low = max((v for v in (year, year_from) if v is not None), default=None)
+    high = min((v for v in (year, year_to) if v is not None), default=None)
+    return low, high
+
+def _reindex(ids: np.ndarray, labels: Sequence[str]) -> Tuple[np.ndarray, List[str]]:
+    """
+    Re-encode ``ids`` into ``labels`` (which may repeat) as ids into a dictionary of
+    the distinct labels in first-use order, as ``pd.factorize`` would; -1 stays -1.
+    """
+    canonical: Dict[str, int] = {}
+    first_of_label = np.array([canonical.setdefault(label, i) for i, label in enumerate(labels)], dtype=np.int64)
+    present = ids >= 0
+    merged = first_of_label[ids[present]]
+    used, first_rows = np.unique(merged, return_index=True)
+    used = used[np.argsort(first_rows)]
+
+    new_ids = np.full(len(labels), -1, dtype=np.int32)
+    new_ids[used] = np.arange(len(used), dtype=np.int32)
+    result = np.full(len(ids), -1, dtype=np.int32)
+    result[present] = new_ids[merged]
+    return result, [labels[i] for i in used.tolist()]
+
+class StatementStore(Mapping):
+    """
+    Read-only columnar store for one financial statement category.
+
+    Behaves like the ``Dict[str, List[Dict]]`` it replaces: ``store[duns]``
+    materializes that company's rows as dicts, and ``in`` / ``len`` work on
+    DUNS numbers. Routers should prefer :meth:`records`, which reads the
+    column slices directly.
+    """
+
+    def __init__(
+        self,
+        duns_order: List[str],
+        offsets: np.ndarray,
+        line_items: List[str],
+        line_item_ids: np.ndarray,
+        years: np.ndarray,
+        values: np.ndarray,
+        null_mask: np.ndarray,
+        raw_labels: Sequence[str],
+        raw_ids: np.ndarray,
+        year_order: Optional[np.ndarray] = None,
+        cube_arrays: Optional[Dict[str, np.ndarray]] = None,
+    ):
+        self.duns_order = duns_order
+        self.offsets = offsets
+        self.line_items = line_items
+        self.line_item_ids = line_item_ids
+        self.years = years
+        self.values = values
+        self.null_mask = null_mask
+        self.raw_labels = raw_labels
+        self.raw_ids = raw_ids
+        self._positions: Dict[str, int] = {duns: i for i, duns in enumerate(duns_order)}
+        self._line_item_lookup: Dict[str, int] = {name: i for i, name in enumerate(line_items)}
+        self._folded_line_items = [name.casefold() for name in line_items]
+        self._build_year_index(year_order)
+        self._build_line_item_index()
+        if cube_arrays is None:
+            self._build_cube()
+        else:
+            for name in CUBE_ARRAYS:
+                setattr(self, name, cube_arrays[name])
+        self._build_taxonomy()
+
+    def _build_year_index(self, year_order: Optional[np.ndarray] = None):
+        """Index rows by (DUNS, year) so year-filtered lookups touch only matching rows."""
+        lengths = np.diff(self.offsets)
+        company_of_row = np.repeat(np.arange(len(self.duns_order)), lengths)
+
+        # Stable sort: within a (DUNS, year) group rows keep their CSV order
+        if year_order is None:
+            year_order = np.lexsort((self.years, company_of_row))
+        self.year_order = year_order
+        sorted_companies = company_of_row[self.year_order]
+        sorted_years = self.years[self.year_order]
+        group_starts = np.flatnonzero(
+            np.diff(sorted_companies, prepend=-1) | np.diff(sorted_years, prepend=-1)
+        )
+
+        group_companies = sorted_companies[group_starts]
+        boundaries = np.append(group_starts, len(self.year_order))
+
+        self.year_index: Dict[Tuple[str, int], Tuple[int, int]] = {
+            (self.duns_order[company], year): (start, end)
+            for company, year, start, end in zip(
+                group_companies.tolist(),
+                sorted_years[group_starts].tolist(),
+                group_starts.tolist(),
+                boundaries[1:].tolist(),
+            )
+        }
+
+        # Per-DUNS sorted years and slice boundaries, used for year ranges
+        self._year_bounds: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        first_groups = np.searchsorted(group_companies, np.arange(len(self.duns_order) + 1))
+        for company, duns in enumerate(self.duns_order):
+            first, last = first_groups[company], first_groups[company + 1]
+            self._year_bounds[duns] = (sorted_years[group_starts[first:last]], boundaries[first:last + 1])
+
+    def _build_line_item_index(self):
+        """Index rows by (DUNS, line item) so line-item selections touch only matching rows."""
+        lengths = np.diff(self.offsets)
+        company_of_row = np.repeat(np.arange(len(self.duns_order)), lengths)
+
+        # Stable sort: within a (DUNS, line item) group rows keep their CSV order
+        self.item_order = np.lexsort((self.line_item_ids, company_of_row))
+        sorted_companies = company_of_row[self.item_order]
+        sorted_items = self.line_item_ids[self.item_order]
+        group_starts = np.flatnonzero(
+            np.diff(sorted_companies, prepend=-1) | np.diff(sorted_items, prepend=-1)
+        )
+        boundaries = np.append(group_starts, len(self.item_order))
+
+        # Per company: its sorted line item ids and their [start, end) slices of item_order
+        self._item_bounds: List[Tuple[np.ndarray, np.ndarray]] = []
+        first_groups = np.searchsorted(sorted_companies[group_starts], np.arange(len(self.duns_order) + 1))
+        for company in range(len(self.duns_order)):
+            first, last = first_groups[company], first_groups[company + 1]
+            self._item_bounds.append((sorted_items[group_starts[first:last]], boundaries[first:last + 1]))
+
+    def _build_cube(self):
+        """Scatter rows into a dense (company, line item, year) cube; cells without a value are NaN."""
+        lengths = np.diff(self.offsets)
+        company_of_row = np.repeat(np.arange(len(self.duns_order)), lengths)
+        self.cube_years = np.unique(self.years)
+        year_positions = np.searchsorted(self.cube_years, self.years)
+        shape = (len(self.duns_order), len(self.line_items), len(self.cube_years))
+
+        self.cube = np.full(shape, np.nan)
+        self.cube[company_of_row, self.line_item_ids, year_positions] = self.values
+        self.raw_cube = np.full(shape, -1, dtype=np.int32)
+        self.raw_cube[company_of_row, self.line_item_ids, year_positions] = self.raw_ids
+
+        # Which years each company reports, and its line items in CSV order (flattened,
+        # company i's ids are company_item_ids[company_item_offsets[i]:company_item_offsets[i + 1]])
+        self.company_years = np.zeros((shape[0], shape[2]), dtype=bool)
+        self.company_years[company_of_row, year_positions] = True
+        company_items = []
+        for company in range(shape[0]):
+            item_ids = self.line_item_ids[self.offsets[company]:self.offsets[company + 1]]
+            _, first_rows = np.unique(item_ids, return_index=True)
+            company_items.append(item_ids[np.sort(first_rows)])
+        self.company_item_offsets = np.zeros(shape[0] + 1, dtype=np.int64)
+        np.cumsum([len(items) for items in company_items], out=self.company_item_offsets[1:])
+        self.company_item_ids = np.concatenate(company_items or [np.empty(0, dtype=np.int32)]).astype(np.int32)
+
+    def _build_taxonomy(self):
+        """Classify the line items (see :mod:`taxonomy`), sampling one reported value of each."""
+        # A dash (nil) is not a sample: some files put dashes on section header rows
+        dash_ids = [i for i, label in enumerate(self.raw_labels) if label == "-"]
+        valued_rows = np.flatnonzero(~self.null_mask & ~np.isin(self.raw_ids, dash_ids))
+        item_ids, first = np.unique(self.line_item_ids[valued_rows], return_index=True)
+        samples: List[Optional[str]] = [None] * len(self.line_items)
+        for item_id, raw_id in zip(item_ids.tolist(), self.raw_ids[valued_rows[first]].tolist()):
+            samples[item_id] = self.raw_labels[raw_id]
+
+        self.taxonomy = build_taxonomy(self.line_items, samples)
+        self._taxonomy_lookup: Dict[str, int] = {entry["id"]: i for i, entry in enumerate(self.taxonomy)}
+
+    @classmethod
+    def empty(cls) -> "StatementStore":
+        """Create a store with no companies."""
+        return cls.from_frames([])
+
+    @classmethod
+    def from_frames(cls, frames: Iterable[Tuple[str, pd.DataFrame]]) -> "StatementStore":
+        """Build a store from ``(duns, DataFrame)`` pairs read from the statement CSVs."""
+        duns_order: List[str] = []
+        lengths: List[int] = []
+        parts: List[pd.DataFrame] = []
+        for duns, df in frames:
+            duns_order.append(duns)
+            lengths.append(len(df))
+            parts.append(df[["line_item", "year", "value"]])
+
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        if not parts:
+            return cls(
+                duns_order, offsets, [], np.empty(0, dtype=np.int32),
+                np.empty(0, dtype=np.int16), np.empty(0, dtype=np.float64),
+                np.empty(0, dtype=bool), [], np.empty(0, dtype=np.int32),
+            )
+
+        combined = pd.concat(parts, ignore_index=True)
+
+        # Intern line-item names: each distinct name is stored once
+        line_item_ids, line_items = pd.factorize(combined["line_item"])
+        raw = combined["value"].astype(object)
+        raw_ids, raw_labels = pd.factorize(raw)
+        scales = np.array([line_item_scale(name) for name in line_items], dtype=np.float64)
+        values = parse_values(raw) * scales[line_item_ids]
+
+        return cls(
+            duns_order=duns_order,
+            offsets=offsets,
+            line_items=[str(name) for name in line_items],
+            line_item_ids=line_item_ids.astype(np.int32),
+            years=combined["year"].to_numpy(dtype=np.int16),
+            values=values,
+            null_mask=np.isnan(values),
+            raw_labels=[str(label) for label in raw_labels],
+            raw_ids=raw_ids.astype(np.int32),
+        )
+
+    # Columns written to / read from snapshot files as raw arrays (plus CUBE_ARRAYS)
+    SNAPSHOT_ARRAYS = (
+        "offsets", "line_item_ids", "years", "values", "null_mask", "raw_ids", "year_order",
+    )
+
+    def to_snapshot(self) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """Split the store into raw arrays and small Python objects for a snapshot."""
+        arrays = {name: getattr(self, name) for name in self.SNAPSHOT_ARRAYS + CUBE_ARRAYS}
+        arrays["raw_labels.offsets"], arrays["raw_labels.data"] = pack_strings(self.raw_labels)
+        objects = {"duns_order": self.duns_order, "line_items": self.line_items}
+        return arrays, objects
+
+    @classmethod
+    def from_snapshot(
+        cls, arrays: Dict[str, np.ndarray], objects: Dict[str, Any], shared: bool = False
+    ) -> "StatementStore":
+        """
+        Rebuild a store from :meth:`to_snapshot` output.
+
+        Arrays, including the cube, stay memory-mapped. With ``shared``, raw value
+        strings are also read through the mapping instead of being decoded into a
+        per-process list.
+        """
+        raw_labels = StringTable(arrays["raw_labels.offsets"], arrays["raw_labels.data"])
+        return cls(
+            raw_labels=raw_labels if shared else list(raw_labels),
+            **objects,
+            **{name: arrays[name] for name in cls.SNAPSHOT_ARRAYS},
+            cube_arrays={name: arrays[name] for name in CUBE_ARRAYS},
+        )
+
+    def position(self, duns: str) -> Optional[int]:
+        """Return a company's index along the company axis (e.g. of ``cube``), or None if unknown."""
+        return self._positions.get(duns)
+
+    def row_range(self, duns: str) -> Tuple[int, int]:
+        """Return the ``[start, end)`` row range for a company (empty if unknown)."""
+        position = self._positions.get(duns)
+        if position is None:
+            return 0, 0
+        return int(self.offsets[position]), int(self.offsets[position + 1])
+
+    def updated(self, duns_order: List[str], frames: Mapping) -> "StatementStore":
+        """
+        Return a store of the ``duns_order`` companies, with rows from ``frames``
+        (DUNS -> DataFrame read from the statement CSV) for companies given there and
+        this store's rows for the rest.
+
+        Only the new frames are parsed; other rows are copied as arrays. The result
+        equals a store built by :meth:`from_frames` over every company's CSV.
+        """
+        fresh = StatementStore.from_frames((duns, frames[duns]) for duns in duns_order if duns in frames)
+        sources = [
+            (fresh, *fresh.row_range(duns)) if duns in frames else (self, *self.row_range(duns))
+            for duns in duns_order
+        ]
+        lengths = [end - start for _, start, end in sources]
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        def gather(name: str) -> np.ndarray:
+            parts = [getattr(store, name)[start:end] for store, start, end in sources]
+            return np.concatenate(parts) if parts else getattr(self, name)[:0]
+
+        # Ids index into this store's dictionaries followed by the fresh ones
+        line_item_ids = np.concatenate([
+            store.line_item_ids[start:end] + (len(self.line_items) if store is fresh else 0)
+            for store, start, end in sources
+        ] or [np.empty(0, dtype=np.int32)])
+        raw_ids = np.concatenate([
+            np.where(store.raw_ids[start:end] >= 0,
+                     store.raw_ids[start:end] + (len(self.raw_labels) if store is fresh else 0), -1)
+            for store, start, end in sources
+        ] or [np.empty(0, dtype=np.int32)])
+        line_item_ids, line_items = _reindex(line_item_ids, [*self.line_items, *fresh.line_items])
+        raw_ids, raw_labels = _reindex(raw_ids, [*self.raw_labels, *fresh.raw_labels])
+
+        return StatementStore(
+            duns_order=list(duns_order),
+            offsets=offsets,
+            line_items=line_items,
+            line_item_ids=line_item_ids,
+            years=gather("years"),
+            values=gather("values"),
+            null_mask=gather("null_mask"),
+            raw_labels=raw_labels,
+            raw_ids=raw_ids,
+        )
+
+    def records(
+        self,
+        duns: str,
+        year: Optional[int] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        include_raw: bool = False,
+        line_items: Optional[Iterable[str]] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Materialize a company's rows as dicts, optionally filtered by year or year range
+        and by line items (exact names or glob patterns, see :meth:`line_item_ids_for`).
+
+        ``value`` is the parsed number (None when blank); ``include_raw`` adds the
+        original string as ``raw_value``. ``fields`` keeps only the given keys of
+        ``RECORD_FIELDS`` (asking for ``raw_value`` implies ``include_raw``).
+        """
+        rows = self.row_indices(duns, year, year_from, year_to, line_items)
+        if fields is None:
+            fields = RECORD_FIELDS if include_raw else RECORD_FIELDS[:-1]
+        return self._materialize(duns, rows, fields)
+
+    def line_item_ids_for(self, selectors: Iterable[str]) -> np.ndarray:
+        """
+        Return the sorted interned ids of the line items matching any selector.
+
+        A selector is an exact name, a taxonomy id (``total_assets``), or a glob
+        pattern (``*``, ``?``, ``[...]``, e.g. ``Revenue*`` or ``*cash*``) matched
+        case-insensitively against names. Selectors matching nothing are skipped.
+        """
+        ids = set()
+        for selector in selectors:
+            item_id = self.line_item_id(selector)
+            if item_id is not None:
+                ids.add(item_id)
+            elif GLOB_CHARACTERS.search(selector):
+                pattern = selector.casefold()
+                ids.update(i for i, name in enumerate(self._folded_line_items) if fnmatch.fnmatchcase(name, pattern))
+        return np.array(sorted(ids), dtype=np.int32)
+
+    def line_item_id(self, name: str) -> Optional[int]:
+        """Return the interned id of a line item given its exact name or taxonomy id (None if unknown)."""
+        item_id = self._line_item_lookup.get(name)
+        return item_id if item_id is not None else self._taxonomy_lookup.get(name)
+
+    def row_indices(
+        self,
+        duns: str,
+        year: Optional[int] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        line_items: Optional[Iterable[str]] = None,
+    ) -> np.ndarray:
+        """
+        Return a company's row indices in CSV order, filtered by year, year range and
+        line items (see :meth:`line_item_ids_for`).
+        """
+        if line_items is None:
+            return self._year_rows(duns, year, year_from, year_to)
+
+        # Gather the selected line items' rows from the (DUNS, line item) index
+        position = self._positions.get(duns)
+        if position is None:
+            return np.empty(0, dtype=np.int64)
+        company_items, bounds = self._item_bounds[position]
+        wanted = np.flatnonzero(np.isin(company_items, self.line_item_ids_for(line_items)))
+        rows = np.sort(np.concatenate(
+            [self.item_order[bounds[i]:bounds[i + 1]] for i in wanted.tolist()] or [np.empty(0, dtype=np.int64)]
+        ))
+
+        low, high = year_bounds(year, year_from, year_to)
+        if low is not None:
+            rows = rows[self.years[rows] >= low]
+        if high is not None:
+            rows = rows[self.years[rows] <= high]
+        return rows
+
+    def _year_rows(
+        self,
+        duns: str,
+        year: Optional[int] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+    ) -> np.ndarray:
+        """Return a company's row indices in CSV order, optionally filtered by year or year range."""
+        if year is None and year_from is None and year_to is None:
+            start, end = self.row_range(duns)
+            return np.arange(start, end)
+
+        if year is not None and year_from is None and year_to is None:
+            start, end = self.year_index.get((duns, year), (0, 0))
+            return self.year_order[start:end]
+
+        # A year range (possibly narrowed by an exact year) is a contiguous slice of year_order
+        low, high = year_bounds(year, year_from, year_to)
+        if duns not in self._year_bounds or (low is not None and high is not None and low > high):
+            return np.empty(0, dtype=np.int64)
+
+        group_years, bounds = self._year_bounds[duns]
+        first = 0 if low is None else int(np.searchsorted(group_years, low, side="left"))
+        last = len(group_years) if high is None else int(np.searchsorted(group_years, high, side="right"))
+        return np.sort(self.year_order[bounds[first]:bounds[last]])
+
+    def wide(
+        self,
+        duns: str,
+        year: Optional[int] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        include_raw: bool = False,
+        line_items: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Return a company's statement pivoted into a line items x years matrix.
+
+        Line items keep CSV order and years are newest first, as in the long format;
+        ``values[i][j]`` is line item ``i`` in year ``j`` (None when blank or missing).
+        ``line_items`` selects rows as in :meth:`records`.
+        """
+        position = self._positions.get(duns)
+        if position is None:
+            wide = {"line_items": [], "years": [], "values": []}
+            if include_raw:
+                wide["raw_values"] = []
+            return wide
+
+        columns = self.company_years[position].copy()
+        low, high = year_bounds(year, year_from, year_to)
+        if low is not None:
+            columns &= self.cube_years >= low
+        if high is not None:
+            columns &= self.cube_years <= high
+        columns = np.flatnonzero(columns)[::-1]
+
+        items = self.company_item_ids[self.company_item_offsets[position]:self.company_item_offsets[position + 1]]
+        if line_items is not None:
+            items = items[np.isin(items, self.line_item_ids_for(line_items))]
+        grid = self.cube[position][np.ix_(items, columns)]
+        wide = {
+            "line_items": [self.line_items[item_id] for item_id in items.tolist()],
+            "years": self.cube_years[columns].tolist(),
+            "values": np.where(np.isnan(grid), None, grid).tolist(),
+        }
+        if include_raw:
+            raw_labels = self.raw_labels
+            wide["raw_values"] = [
+                [raw_labels[raw_id] if raw_id >= 0 else None for raw_id in row]
+                for row in self.raw_cube[position][np.ix_(items, columns)].tolist()
+            ]
+        return wide
+
+    def _materialize(self, duns: str, rows: np.ndarray, fields: Iterable[str]) -> List[Dict[str, Any]]:
+        """Convert row indices into the API's row dict format, with the given ``RECORD_FIELDS``."""
+        fields = set(fields)
+        columns: Dict[str, List[Any]] = {}
+        if "duns" in fields:
+            columns["duns"] = [duns] * len(rows)
+        if "line_item" in fields:
+            line_items = self.line_items
+            columns["line_item"] = [line_items[item_id] for item_id in self.line_item_ids[rows].tolist()]
+        if "year" in fields:
+            columns["year"] = self.years[rows].tolist()
+        if "value" in fields:
+            columns["value"] = np.where(self.null_mask[rows], None, self.values[rows]).tolist()
+        if "raw_value" in fields:
+            raw_labels = self.raw_labels
+            columns["raw_value"] = [
+                raw_labels[raw_id] if raw_id >= 0 else None for raw_id in self.raw_ids[rows].tolist()
+            ]
+
+        names = list(columns)
+        return [dict(zip(names, row)) for row in zip(*columns.values())] if names else [{} for _ in rows]
+
+    def __getitem__(self, duns: str) -> List[Dict[str, Any]]:
+        if duns not in self._positions:
+            raise KeyError(duns)
+        return self.records(duns)
+
+    def __contains__(self, duns: object) -> bool:
+        return duns in self._positions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.duns_order)
+
+    def __len__(self) -> int:
+        return len(self.duns_order)
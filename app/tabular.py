@@ -0,0 +1,217 @@
+"""
+Arrow IPC and Parquet encodings of statement rows for analytical clients.
+
+Tables are built straight from the :class:`StatementStore` column arrays
+(no per-row dicts): ``duns``, ``line_item`` and ``raw_value`` are
+dictionary-encoded, ``year`` is int16 and ``value`` is float64 with nulls
+for blanks. pyarrow is optional; without it only JSON is served and Arrow or
+Parquet requests get a 406.
+"""
+import io
+from typing import Dict, Iterable, Iterator, List, Literal, Optional, Sequence, Tuple
+import numpy as np
+from fastapi import HTTPException, Query, Request, Response
+from statement_store import StatementStore
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional dependency: Arrow/Parquet responses are unavailable
+    pa = None
+    pq = None
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+ResponseFormat = Literal["json", "arrow", "parquet"]
+
+def negotiate(accept: Optional[str], media_types: dict, default: str) -> str:
+    """
+    Return the format in ``media_types`` an Accept header rates highest.
+
+    Each media type takes the q-value of its most specific matching range
+    (``type/subtype``, then ``type/*``, then ``*/*``); q=0 rules it out.
+    Ties go to ``default`` and then to ``media_types`` order, and ``default``
+    is also the answer when nothing listed is acceptable.
+    """
+    if not accept:
+        return default
+
+    qualities: Dict[str, float] = {}
+    for part in accept.split(","):
+        media_range, *parameters = (piece.strip() for piece in part.split(";"))
+        quality = 1.0
+        for parameter in parameters:
+            if parameter.startswith("q="):
+                try:
+                    quality = float(parameter[2:])
+                except ValueError:
+                    quality = 0.0
+        if media_range:
+            qualities[media_range.lower()] = quality
+
+    best, best_quality = default, 0.0
+    for name in [default, *(name for name in media_types if name != default)]:
+        media_type = media_types[name]
+        quality = qualities.get(
+            media_type, qualities.get(media_type.split("/")[0] + "/*", qualities.get("*/*", 0.0))
+        )
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+def require_pyarrow(format: str):
+    """Reject Arrow/Parquet requests with 406 when pyarrow is not installed."""
+    if format in ("arrow", "parquet") and pa is None:
+        raise HTTPException(
+            status_code=406,
+            detail="Arrow and Parquet responses require the pyarrow package on the server"
+        )
+
+def response_format(
+    request: Request,
+    format: Optional[ResponseFormat] = Query(
+        None, description="Response format: 'json', 'arrow' (IPC stream) or 'parquet'. Defaults to the Accept header, then JSON"
+    ),
+) -> str:
+    """Dependency picking the response format from ``format`` or the Accept header."""
+    if format is None:
+        format = negotiate(request.headers.get("accept"), MEDIA_TYPES, "json")
+    require_pyarrow(format)
+    return format
+
+def _dictionary_column(indices: np.ndarray, labels: List[str], mask: Optional[np.ndarray] = None) -> "pa.DictionaryArray":
+    """Dictionary-encode a column holding only the labels actually used."""
+    valid = indices if mask is None else indices[~mask]
+    used, remapped = np.unique(valid, return_inverse=True)
+    codes = np.zeros(len(indices), dtype=np.int32)
+    if mask is None:
+        codes[:] = remapped
+    else:
+        codes[~mask] = remapped
+    return pa.DictionaryArray.from_arrays(
+        pa.array(codes, mask=mask),
+        pa.array([labels[i] for i in used.tolist()], type=pa.string()),
+    )
+
+def statement_table(
+    store: StatementStore,
+    company_rows: Iterable[Tuple[str, np.ndarray]],
+    include_raw: bool = False,
+    statement: Optional[str] = None,
+) -> "pa.Table":
+    """
+    Build an Arrow table from ``(duns, row_indices)`` pairs of one store.
+
+    ``statement`` adds a constant ``statement`` column, for responses that
+    combine several statements.
+    """
+    duns_list: List[str] = []
+    row_arrays: List[np.ndarray] = []
+    for duns, rows in company_rows:
+        duns_list.append(duns)
+        row_arrays.append(rows)
+    rows = np.concatenate(row_arrays) if row_arrays else np.empty(0, dtype=np.int64)
+    counts = [len(company) for company in row_arrays]
+
+    columns = {}
+    if statement is not None:
+        columns["statement"] = pa.DictionaryArray.from_arrays(
+            pa.array(np.zeros(len(rows), dtype=np.int32)), pa.array([statement], type=pa.string())
+        )
+    columns["duns"] = pa.DictionaryArray.from_arrays(
+        pa.array(np.repeat(np.arange(len(duns_list), dtype=np.int32), counts)),
+        pa.array(duns_list, type=pa.string()),
+    )
+    columns["line_item"] = _dictionary_column(store.line_item_ids[rows], store.line_items)
+    columns["year"] = pa.array(store.years[rows])
+    columns["value"] = pa.array(store.values[rows], mask=store.null_mask[rows])
+    if include_raw:
+        raw_ids = store.raw_ids[rows]
+        columns["raw_value"] = _dictionary_column(raw_ids, store.raw_labels, mask=raw_ids < 0)
+    return pa.table(columns)
+
+def encode_table(table: "pa.Table", format: str) -> bytes:
+    """Serialize a table as an Arrow IPC stream or a Parquet file."""
+    sink = pa.BufferOutputStream()
+    if format == "parquet":
+        pq.write_table(table, sink)
+    else:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+def statement_response(
+    stores: List[Tuple[str, StatementStore]],
+    duns: str,
+    format: str,
+    year: Optional[int] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    include_raw: bool = False,
+    line_items: Optional[Sequence[str]] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Response:
+    """
+    Encode one company's statements as Arrow or Parquet.
+
+    ``stores`` pairs statement names with their stores; with more than one
+    statement a ``statement`` column tells the rows apart. ``line_items`` and
+    ``fields`` select rows and columns as in :meth:`StatementStore.records`.
+    """
+    include_raw = include_raw or (fields is not None and "raw_value" in fields)
+    tables = [
+        statement_table(
+            store,
+            [(duns, store.row_indices(duns, year, year_from, year_to, line_items))],
+            include_raw=include_raw,
+            statement=statement if len(stores) > 1 else None,
+        )
+        for statement, store in stores
+    ]
+    table = pa.concat_tables(tables).unify_dictionaries().combine_chunks()
+    if fields is not None:
+        table = table.select([name for name in table.column_names if name == "statement" or name in fields])
+    return Response(content=encode_table(table, format), media_type=MEDIA_TYPES[format])
+
+class _StreamSink(io.RawIOBase):
+    """Write-only file that buffers output until drained, for streaming encoders."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def stream_tables(tables: Iterator["pa.Table"], schema: "pa.Schema", format: str) -> Iterator[bytes]:
+    """
+    Encode tables incrementally: one Arrow record batch or Parquet row group per
+    table, yielding the bytes written so far after each one.
+    """
+    sink = _StreamSink()
+    if format == "parquet":
+        writer = pq.ParquetWriter(sink, schema)
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+    for table in tables:
+        writer.write_table(table)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
@@ -0,0 +1,101 @@
+"""
+Canonical line-item taxonomy for the financial statements.
+
+Statement CSVs label rows with display names such as "TOTAL ASSETS ($000s)" or
+"Interest expense  ($000s)": unit suffixes, inconsistent case and spacing, and
+section headers ("Current Assets") whose values are all blank. Each
+:class:`statement_store.StatementStore` builds a taxonomy from its line-item
+dictionary once per load, giving every name:
+
+* ``id`` - a slug of the name without its unit suffix (``total_assets``), unique
+  within the statement; names that only differ in case or punctuation, such as
+  the cash flow's "Interest paid" and "Interest Paid", get ``_2``, ``_3``... in
+  statement order
+* ``unit`` / ``scale`` - what the values measure and the multiplier applied to
+  the reported figures (1000 for "($000s)")
+* ``section`` - the id of the section header it appears under (None at the top
+  level); all-caps statement totals such as "TOTAL ASSETS" close a section
+
+IDs can be used wherever statement queries take line-item names.
+"""
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Unit suffixes in line-item names -> (unit, multiplier from reported figures to the values served)
+UNIT_SUFFIXES: List[Tuple[re.Pattern, str, float]] = [
+    (re.compile(r"\s*\(\$000s\)\s*$"), "dollars", 1000.0),
+    (re.compile(r"\s*\(000s\)\s*$"), "count", 1000.0),
+    (re.compile(r"\s*\(cents\)\s*$"), "cents", 1.0),
+]
+
+def line_item_unit(line_item: str) -> Optional[Tuple[str, float]]:
+    """Return the ``(unit, scale)`` given by a line item's name suffix, or None if it has none."""
+    for pattern, unit, scale in UNIT_SUFFIXES:
+        if pattern.search(line_item):
+            return unit, scale
+    return None
+
+def line_item_label(line_item: str) -> str:
+    """Return a line-item name without its unit suffix, trailing colon or repeated spaces."""
+    for pattern, _, _ in UNIT_SUFFIXES:
+        line_item = pattern.sub("", line_item)
+    return " ".join(line_item.split()).rstrip(":")
+
+def line_item_slug(line_item: str) -> str:
+    """Return the lowercase ``snake_case`` form of a line item's label."""
+    return re.sub(r"[^0-9a-z]+", "_", line_item_label(line_item).lower()).strip("_")
+
+def _sample_unit(sample: str) -> str:
+    """Infer the unit of a line item without a name suffix from one of its reported values."""
+    if sample.endswith("%") or sample.endswith("%)"):
+        return "percent"
+    if "$" in sample:
+        return "dollars"
+    return "count"
+
+def build_taxonomy(line_items: Sequence[str], samples: Sequence[Optional[str]]) -> List[Dict[str, Any]]:
+    """
+    Build the taxonomy entries of one statement's line items, in the given order.
+
+    ``samples[i]`` is one reported (non-blank) value of ``line_items[i]``, or None
+    if it never has one; a name without a unit suffix and without values is a
+    section header. A header directly after another header is its subsection.
+    """
+    entries: List[Dict[str, Any]] = []
+    used_ids: Dict[str, int] = {}
+    section: Optional[Dict[str, Any]] = None
+    previous_was_section = False
+
+    for name, sample in zip(line_items, samples):
+        slug = line_item_slug(name) or "line_item"
+        used_ids[slug] = used_ids.get(slug, 0) + 1
+        item_id = slug if used_ids[slug] == 1 else f"{slug}_{used_ids[slug]}"
+
+        label = line_item_label(name)
+        unit = line_item_unit(name)
+        is_section = unit is None and sample is None
+        if unit is None:
+            unit = (None, 1.0) if sample is None else (_sample_unit(sample), 1.0)
+
+        if is_section:
+            parent = section["id"] if previous_was_section and section is not None else None
+        elif label.isupper():
+            # Statement-level totals ("TOTAL ASSETS", "NET ASSETS") end the current section
+            parent, section = None, None
+        else:
+            parent = section["id"] if section is not None else None
+
+        entry = {
+            "id": item_id,
+            "name": name,
+            "label": label,
+            "section": parent,
+            "is_section": is_section,
+            "unit": unit[0],
+            "scale": unit[1],
+        }
+        entries.append(entry)
+        if is_section:
+            section = entry
+        previous_was_section = is_section
+    return entries
@@ -0,0 +1,52 @@
+"""
+Tests for the multi-company batch endpoints.
+"""
+import data_loader
+
+def test_companies_batch_matches_single_endpoint(client, invalid_duns):
+    """Test that batch company info equals the per-company endpoint and reports unknown DUNS."""
+    duns_list = data_loader.get_all_duns_numbers()[:3]
+    response = client.post("/companies/batch", json={"duns": duns_list + [invalid_duns, duns_list[0]]})
+    assert response.status_code == 200
+    body = response.json()
+
+    assert [company["duns"] for company in body["companies"]] == duns_list
+    assert body["not_found"] == [invalid_duns]
+    for company in body["companies"]:
+        assert company == client.get(f"/companies/{company['duns']}").json()
+
+def test_financials_batch_matches_summary(client):
+    """Test that batch financials equal the per-company summary for the same filters."""
+    duns_list = data_loader.get_all_duns_numbers()[:2]
+    response = client.post("/financials/batch", json={"duns": duns_list, "year_from": 2022, "year_to": 2024})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["duns"] for result in results] == duns_list
+
+    for result in results:
+        summary = client.get(f"/companies/{result['duns']}/financials/summary?year_from=2022&year_to=2024").json()
+        for statement in ("balance_sheet", "income_statement", "cash_flow"):
+            assert result[statement] == summary[statement]
+
+def test_financials_batch_statement_and_line_item_selection(client, sample_duns):
+    """Test that only requested statements and line items are returned."""
+    line_item = data_loader.income_statement_data.records(sample_duns)[0]["line_item"]
+    response = client.post("/financials/batch", json={
+        "duns": [sample_duns],
+        "statements": ["income_statement"],
+        "line_items": [line_item, "No Such Line Item"],
+    })
+    assert response.status_code == 200
+    result = response.json()["results"][0]
+
+    assert result["balance_sheet"] is None
+    assert result["cash_flow"] is None
+    assert result["income_statement"]
+    assert {item["line_item"] for item in result["income_statement"]} == {line_item}
+
+def test_batch_request_validation(client):
+    """Test that empty, oversized and invalid batch requests are rejected."""
+    assert client.post("/companies/batch", json={"duns": []}).status_code == 422
+    assert client.post("/companies/batch", json={"duns": ["1"] * 1001}).status_code == 422
+    response = client.post("/financials/batch", json={"duns": ["1"], "statements": ["ledger"]})
+    assert response.status_code == 422
@@ -0,0 +1,105 @@
+"""
+Tests for the industry peer benchmark endpoint.
+"""
+import statistics
+import numpy as np
+import pytest
+import data_loader
+from benchmarks import PeerBenchmarks, _percentile_ranks, primary_industry
+
+def _peers(duns, digits=None):
+    """Companies sharing a company's primary industry (or its first ``digits`` digits)."""
+    code = primary_industry(data_loader.industries_data[duns])[0][:digits]
+    return [
+        other for other in data_loader.get_all_duns_numbers()
+        if (primary_industry(data_loader.industries_data.get(other, [])) or ("",))[0][:digits] == code
+    ]
+
+def _net_margin(duns, year):
+    """Net margin for one company and year, via the metrics endpoint data."""
+    metrics = data_loader.financial_metrics.company(duns, ["net_margin"], year=year)
+    return metrics["metrics"]["net_margin"][0] if metrics["years"] else None
+
+def test_primary_industry_skips_rows_without_code():
+    """Test that the primary industry is the first is_primary row with a valid code."""
+    rows = [
+        {"industry_code": float("nan"), "industry_description": "3568", "is_primary": 1},
+        {"industry_code": 3568.0, "industry_description": "Power Transmission", "is_primary": 0},
+        {"industry_code": 3651.0, "industry_description": "Audio Equipment", "is_primary": 1},
+    ]
+    assert primary_industry(rows) == ("3651", "Audio Equipment")
+    assert primary_industry([]) is None
+
+def test_benchmark_matches_peer_distribution(client):
+    """Test the median, peer count and percentile rank against a direct calculation."""
+    duns = next(d for d in data_loader.get_all_duns_numbers() if len(_peers(d, 2)) >= 5)
+    response = client.get(f"/companies/{duns}/benchmark?level=major_group&line_items=net_margin&year=2023")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["industry_code"] == primary_industry(data_loader.industries_data[duns])[0][:2]
+    assert body["peer_group_size"] == len(_peers(duns, 2))
+
+    benchmark = body["benchmarks"][0]
+    values = [v for v in (_net_margin(peer, 2023) for peer in _peers(duns, 2)) if v is not None]
+    own = _net_margin(duns, 2023)
+    assert benchmark["peer_count"] == [len(values)]
+    assert benchmark["median"][0] == pytest.approx(statistics.median(values))
+    lower = sum(v < own for v in values)
+    equal = sum(v == own for v in values)
+    assert benchmark["percentile_rank"][0] == pytest.approx((lower + 0.5 * equal) / len(values) * 100)
+
+def test_benchmark_statement_line_items(client, sample_duns):
+    """Test benchmarking raw statement line items; unknown names are skipped."""
+    response = client.get(
+        f"/companies/{sample_duns}/benchmark",
+        params={"source": "balance_sheet", "line_items": ["TOTAL ASSETS ($000s)", "Nope"], "year_from": 2023}
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [b["line_item"] for b in body["benchmarks"]] == ["TOTAL ASSETS ($000s)"]
+    benchmark = body["benchmarks"][0]
+    for key in ("value", "percentile_rank", "peer_count", "q1", "median", "q3"):
+        assert len(benchmark[key]) == len(body["years"])
+    for q1, median, q3 in zip(benchmark["q1"], benchmark["median"], benchmark["q3"]):
+        if median is not None:
+            assert q1 <= median <= q3
+
+def test_benchmark_not_found(client, invalid_duns):
+    """Test 404 for unknown companies and 422 for unknown sources."""
+    assert client.get(f"/companies/{invalid_duns}/benchmark").status_code == 404
+    duns = data_loader.get_all_duns_numbers()[0]
+    assert client.get(f"/companies/{duns}/benchmark?source=ledger").status_code == 422
+
+def test_percentile_ranks_match_pairwise_counts():
+    """Test the sort-based ranks against counting lower and equal peers, with ties and gaps."""
+    rng = np.random.default_rng(7)
+    values = rng.integers(0, 5, size=(40, 3, 4)).astype(float)
+    values[rng.random(values.shape) < 0.2] = np.nan
+    ranks = _percentile_ranks(values)
+    for index in np.ndindex(values.shape[1:]):
+        column = values[(slice(None),) + index]
+        peers = column[~np.isnan(column)]
+        for member, value in enumerate(column):
+            if np.isnan(value):
+                assert np.isnan(ranks[(member,) + index])
+            else:
+                expected = ((peers < value).sum() + 0.5 * (peers == value).sum()) / len(peers) * 100
+                assert ranks[(member,) + index] == pytest.approx(expected)
+
+def test_distributions_precomputed_for_every_group():
+    """Test that every peer group's distribution is built up front, in compact arrays."""
+    benchmarks = data_loader.peer_benchmarks
+    for level, source in [("industry", "metrics"), ("major_group", "balance_sheet")]:
+        quartiles, counts, doubled = benchmarks.stats[(level, source)]
+        groups = [group for group_level, group in benchmarks.groups if group_level == level]
+        assert len(quartiles) == len(counts) == len(groups)
+        assert counts.dtype.itemsize <= 2 and doubled.dtype.itemsize <= 2
+
+        group = max(groups, key=lambda group: len(benchmarks.groups[(level, group)]))
+        positions = benchmarks.groups[(level, group)]
+        values = benchmarks.values(source, positions)
+        number = benchmarks.group_numbers[(level, group)]
+        expected = _percentile_ranks(values)
+        ranks = np.where(np.isnan(expected), np.nan, doubled[positions] / (2 * counts[number]) * 100)
+        np.testing.assert_allclose(ranks, expected)
+        np.testing.assert_array_equal(counts[number], (~np.isnan(values)).sum(axis=0))
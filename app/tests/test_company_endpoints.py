@@ -2,6 +2,7 @@
 Tests for company-related API endpoints.
 """
 import pytest
+import data_loader
 
 def test_root_endpoint(client):
     """Test the root endpoint returns API info."""
@@ -123,3 +124,74 @@ def test_search_companies_with_pagination(client):
     assert response.status_code == 200
     data = response.json()
     assert len(data["companies"]) <= 5
+
+def test_search_companies_by_industry_code(client):
+    """Test searching companies by industry code."""
+    response = client.get("/companies/search?industry_code=7389")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] > 0
+    for company in data["companies"][:5]:
+        industries = client.get(f"/companies/{company['duns']}/industries").json()["industries"]
+        codes = {industry["industry_code"] for industry in industries}
+        assert 7389 in codes
+
+def test_search_industry_code_accepts_listing_format(client):
+    """Test that codes as shown by /industries (e.g. '7389.0') match the same companies."""
+    plain = client.get("/companies/search?industry_code=7389").json()
+    decimal = client.get("/companies/search?industry_code=7389.0").json()
+    assert plain["total"] == decimal["total"]
+
+def test_search_combined_filters_intersect(client):
+    """Test that combined filters return the intersection of each filter's results."""
+    by_query = client.get("/companies/search?query=nsw&limit=1000").json()
+    by_type = client.get("/companies/search?company_type=Private&limit=1000").json()
+    combined = client.get("/companies/search?query=nsw&company_type=Private&limit=1000").json()
+    expected = {c["duns"] for c in by_query["companies"]} & {c["duns"] for c in by_type["companies"]}
+    assert {c["duns"] for c in combined["companies"]} == expected
+    assert combined["total"] == len(expected)
+
+def test_search_short_query(client):
+    """Test that queries shorter than the n-gram size still match substrings."""
+    response = client.get("/companies/search?query=ns&limit=1000")
+    assert response.status_code == 200
+    for company in response.json()["companies"]:
+        assert "ns" in company["address"].lower()
+
+def test_list_companies_cursor_pagination(client):
+    """Test that following next_cursor walks every company once, in DUNS order."""
+    seen = []
+    page = client.get("/companies?limit=50").json()
+    while True:
+        seen.extend(company["duns"] for company in page["companies"])
+        if page["next_cursor"] is None:
+            break
+        page = client.get(f"/companies?limit=50&cursor={page['next_cursor']}").json()
+        assert page["total"] == 222
+    assert seen == sorted(data_loader.get_all_duns_numbers())
+
+    # Offset pages use the same order
+    offset_page = client.get("/companies?limit=10&offset=50").json()
+    assert [company["duns"] for company in offset_page["companies"]] == seen[50:60]
+
+def test_search_cursor_pagination(client):
+    """Test that cursor pages of a search cover exactly the matches of one large page."""
+    everything = client.get("/companies/search?query=nsw&limit=1000").json()
+    assert everything["next_cursor"] is None
+
+    seen = []
+    params = {"query": "nsw", "limit": 7}
+    while True:
+        page = client.get("/companies/search", params=params).json()
+        assert page["total"] == everything["total"]
+        seen.extend(company["duns"] for company in page["companies"])
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+    assert seen == [company["duns"] for company in everything["companies"]]
+    assert seen == sorted(seen)
+
+def test_invalid_cursor(client):
+    """Test that a malformed cursor is rejected."""
+    assert client.get("/companies?cursor=not-a-cursor!").status_code == 400
+    assert client.get("/companies/search?query=nsw&cursor=%%%").status_code == 400
@@ -0,0 +1,128 @@
+"""
+Tests for response compression and the cached compressed bodies.
+"""
+import asyncio
+import gzip
+import json
+import pytest
+import compression
+from compression import CompressionMiddleware, encoded_etag, negotiate_encoding
+from response_cache import response_cache
+
+def test_negotiate_encoding(monkeypatch):
+    """Test Accept-Encoding negotiation with q-values, wildcards and server preference."""
+    monkeypatch.setattr(compression, "COMPRESSION_ENCODINGS", ["br", "zstd", "gzip"])
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip, br") == "br"
+    assert negotiate_encoding("br;q=0.5, gzip") == "gzip"
+    assert negotiate_encoding("*") == "br"
+    assert negotiate_encoding("*, br;q=0") == "zstd"
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("gzip;q=0") is None
+    assert negotiate_encoding(None) is None
+
+    monkeypatch.setattr(compression, "COMPRESSION_ENCODINGS", [])
+    assert negotiate_encoding("gzip") is None
+
+def test_cached_response_compressed_once(client, sample_duns, monkeypatch):
+    """Test that a cached endpoint sends gzip and reuses the cached compressed body."""
+    calls = []
+    original = compression.compress
+    monkeypatch.setattr("response_cache.compress", lambda *args: calls.append(args) or original(*args))
+    response_cache.clear()
+
+    path = f"/companies/{sample_duns}/balance-sheet"
+    first = client.get(path, headers={"Accept-Encoding": "gzip"})
+    second = client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert first.headers["content-encoding"] == second.headers["content-encoding"] == "gzip"
+    assert first.headers["vary"] == "Accept, Accept-Encoding"
+    assert first.json() == second.json()
+    assert len(calls) == 1
+
+    identity = client.get(path, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert identity.json() == first.json()
+    assert len(first.content) == len(identity.content) > int(first.headers["content-length"])
+
+def test_etag_per_encoding(client, sample_duns):
+    """Test that each encoding has its own ETag and If-None-Match only matches that variant."""
+    path = f"/companies/{sample_duns}/income-statement"
+    gzipped = client.get(path, headers={"Accept-Encoding": "gzip"})
+    identity = client.get(path, headers={"Accept-Encoding": "identity"})
+    assert gzipped.headers["etag"] == encoded_etag(identity.headers["etag"], "gzip")
+
+    etag = gzipped.headers["etag"]
+    assert client.get(path, headers={"Accept-Encoding": "gzip", "If-None-Match": etag}).status_code == 304
+    assert client.get(path, headers={"Accept-Encoding": "identity", "If-None-Match": etag}).status_code == 200
+
+def test_export_stream_compressed(client):
+    """Test that a streamed export is gzip-compressed by the middleware."""
+    response = client.get("/export/balance_sheet?year=2024", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept, Accept-Encoding"
+    assert response.headers["etag"].endswith('-gzip"')
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert rows and all(row["year"] == 2024 for row in rows)
+
+def test_middleware_skips_small_and_encoded_bodies():
+    """Test that the middleware leaves small bodies and already encoded bodies alone."""
+    def run(body, headers):
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+
+        messages = []
+        async def send(message):
+            messages.append(message)
+        scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+        asyncio.run(CompressionMiddleware(app, minimum_size=100)(scope, None, send))
+        return dict(messages[0]["headers"]), messages[1]["body"]
+
+    assert run(b"small", []) == ({}, b"small")
+    body = gzip.compress(b"x" * 1000)
+    assert run(body, [(b"content-encoding", b"gzip")]) == ({b"content-encoding": b"gzip"}, body)
+    headers, compressed = run(b"x" * 1000, [(b"content-length", b"1000")])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert gzip.decompress(compressed) == b"x" * 1000
+
+def test_small_body_keeps_plain_etag(client, sample_duns):
+    """Test that a cached body too small to compress is sent as is under the raw body's ETag."""
+    path = f"/companies/{sample_duns}/balance-sheet?year=1900"
+    gzipped = client.get(path, headers={"Accept-Encoding": "gzip"})
+    identity = client.get(path, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in gzipped.headers
+    assert gzipped.headers["etag"] == identity.headers["etag"]
+
+    etag = gzipped.headers["etag"]
+    revalidated = client.get(path, headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+
+def test_empty_export_keeps_plain_etag(client):
+    """Test that an export too small to compress has no encoding suffix on its ETag."""
+    path = "/export/balance_sheet?year=1900"
+    response = client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert not response.headers["etag"].endswith('-gzip"')
+
+    etag = response.headers["etag"]
+    assert client.get(path, headers={"Accept-Encoding": "gzip", "If-None-Match": etag}).status_code == 304
+
+def test_brotli_and_zstd(client, sample_duns):
+    """Test that br and zstd bodies, cached and streamed, decode to the identity body."""
+    pytest.importorskip("brotli")
+    pytest.importorskip("zstandard")
+    path = f"/companies/{sample_duns}/cash-flow"
+    identity = client.get(path, headers={"Accept-Encoding": "identity"})
+    for encoding in ("br", "zstd"):
+        response = client.get(path, headers={"Accept-Encoding": encoding})
+        assert response.headers["content-encoding"] == encoding
+        assert response.headers["etag"] == encoded_etag(identity.headers["etag"], encoding)
+        assert response.json() == identity.json()
+
+        streamed = client.get("/export/cash_flow?year=2024", headers={"Accept-Encoding": encoding})
+        assert streamed.headers["content-encoding"] == encoding
+        assert streamed.headers["etag"].endswith(f'-{encoding}"')
+        assert all(json.loads(line)["year"] == 2024 for line in streamed.text.splitlines())
@@ -1,8 +1,27 @@
 """
 Tests for data loading functionality.
 """
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
 import pytest
 import data_loader
+import snapshot
+from statement_store import line_item_scale, parse_values, year_bounds
+
+@pytest.fixture
+def restore_dataset():
+    """Put the loaded dataset back after a test that swaps in another one (e.g. from a snapshot)."""
+    state = {
+        global_name: getattr(data_loader, global_name)
+        for _, global_name, _ in data_loader.CATEGORIES if hasattr(data_loader, global_name)
+    }
+    state["data_versions"] = data_loader.data_versions
+    state["file_signatures"] = data_loader.file_signatures
+    state["serving_snapshot"] = data_loader.serving_snapshot
+    state["snapshot_fingerprint"] = data_loader.snapshot_fingerprint
+    yield
+    data_loader._publish(state)
 
 def test_data_loaded(data_stats):
     """Test that data was loaded successfully."""
@@ -62,3 +81,164 @@ def test_no_duplicate_duns():
     """Test that there are no duplicate DUNS numbers."""
     duns_list = data_loader.get_all_duns_numbers()
     assert len(duns_list) == len(set(duns_list)), "Duplicate DUNS numbers found"
+
+def test_statement_store_is_columnar():
+    """Test that statement data is held in typed columns rather than row dicts."""
+    store = data_loader.balance_sheet_data
+    assert store.years.dtype == np.int16
+    assert store.values.dtype == np.float64
+    assert store.null_mask.dtype == bool
+    assert len(store.years) == len(store.values) == len(store.line_item_ids)
+    # Line-item names are interned once per statement, not once per row
+    assert len(store.line_items) < len(store.line_item_ids)
+
+def test_statement_store_row_offsets(sample_duns):
+    """Test that per-DUNS row offsets cover that company's rows."""
+    store = data_loader.income_statement_data
+    start, end = store.row_range(sample_duns)
+    assert end > start
+    records = store.records(sample_duns)
+    assert len(records) == end - start
+    assert all(item["duns"] == sample_duns for item in records)
+    assert store.row_range("999999999") == (0, 0)
+
+def test_year_bounds():
+    """Test combining an exact year with a year range into inclusive bounds."""
+    assert year_bounds() == (None, None)
+    assert year_bounds(2023) == (2023, 2023)
+    assert year_bounds(year_from=2020, year_to=2024) == (2020, 2024)
+    assert year_bounds(2019, 2020, 2024) == (2020, 2019)
+
+def test_parse_values():
+    """Test parsing of raw statement value strings."""
+    raw = pd.Series(["$38,406", "($67)", "5.66%", "(1.29%)", "-", None, "-2", "81,674,718"])
+    values = parse_values(raw)
+    assert values[0] == 38406
+    assert values[1] == -67
+    assert values[2] == 5.66
+    assert values[3] == -1.29
+    # A lone dash is nil, a blank is missing
+    assert values[4] == 0.0
+    assert np.isnan(values[5])
+    assert values[6] == -2
+    assert values[7] == 81674718
+
+def test_parallel_category_load_matches_sequential():
+    """Test that loading a category on a thread pool gives the same data."""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        company_info = data_loader.load_category("company_info", executor)
+        balance_sheet = data_loader.load_category("balance_sheet", executor)
+    assert company_info == data_loader.company_data
+    assert list(balance_sheet) == list(data_loader.balance_sheet_data)
+    assert np.array_equal(balance_sheet.raw_ids, data_loader.balance_sheet_data.raw_ids)
+
+def test_unknown_executor_type_rejected():
+    """Test that an unknown parallel loader type is reported."""
+    with pytest.raises(ValueError):
+        data_loader.load_all_data(workers=2, executor_type="fibers")
+
+def test_load_timings_recorded():
+    """Test that per-category load timings are recorded."""
+    assert set(data_loader.load_timings) == {folder for folder, _, _ in data_loader.CATEGORIES}
+
+def test_pool_size_capped_at_cpu_count(monkeypatch):
+    """Test that the loader pool is no larger than the CPU count, and sequential on one CPU."""
+    monkeypatch.setattr(data_loader.os, "cpu_count", lambda: 1)
+    assert data_loader._pool_size(4) == 1
+    assert data_loader._create_executor(data_loader._pool_size(4), "process") is None
+    monkeypatch.setattr(data_loader.os, "cpu_count", lambda: 8)
+    assert data_loader._pool_size(4) == 4
+    assert data_loader._pool_size(16) == 8
+
+def test_snapshot_round_trip(tmp_path, sample_duns, restore_dataset):
+    """Test that a snapshot reloads the same data, memory-mapped."""
+    path = tmp_path / "data.snapshot"
+    expected_company = data_loader.company_data[sample_duns]
+    expected_rows = data_loader.balance_sheet_data.records(sample_duns, year=2024)
+    expected_signatures = data_loader.file_signatures
+
+    data_loader.save_snapshot(path, "fingerprint")
+    assert data_loader.load_snapshot(path, "fingerprint")
+
+    assert data_loader.company_data[sample_duns] == expected_company
+    assert data_loader.balance_sheet_data.records(sample_duns, year=2024) == expected_rows
+    # File signatures come back as tuples, so a later reload still skips unchanged files
+    assert data_loader.file_signatures == expected_signatures
+    # Arrays are read-only views over the mapped file
+    assert not data_loader.balance_sheet_data.values.flags.writeable
+
+def test_snapshot_objects_stored_as_json(tmp_path):
+    """Test that a snapshot's non-array objects are plain JSON, and a corrupt blob is rejected."""
+    path = tmp_path / "data.snapshot"
+    data_loader.save_snapshot(path, "fingerprint")
+    _, objects = snapshot.read_snapshot(path, "fingerprint")
+    assert objects["record_keys"]["company_info"] == list(data_loader.company_data)
+    assert objects["stores"]["balance_sheet"]["line_items"] == data_loader.balance_sheet_data.line_items
+
+    content = path.read_bytes()
+    blob_start = content.rindex(b'{"stores"')
+    path.write_bytes(content[:blob_start] + b"\x80" + content[blob_start + 1:])
+    assert snapshot.read_snapshot(path, "fingerprint") is None
+
+def test_stale_snapshot_ignored(tmp_path):
+    """Test that a snapshot built from different CSV data is not used."""
+    path = tmp_path / "data.snapshot"
+    data_loader.save_snapshot(path, "old-fingerprint")
+    assert snapshot.read_snapshot(path, "new-fingerprint") is None
+    assert not data_loader.load_snapshot(path, "new-fingerprint")
+    assert snapshot.read_snapshot(tmp_path / "missing.snapshot", "old-fingerprint") is None
+
+def test_source_fingerprint_tracks_csv_changes(tmp_path):
+    """Test that editing any CSV changes the snapshot fingerprint."""
+    category = tmp_path / "company_info"
+    category.mkdir()
+    csv_file = category / "123456789.csv"
+    csv_file.write_text("duns,field,value\n123456789,Company Type,Private\n")
+    before = snapshot.source_fingerprint(tmp_path)
+    assert snapshot.source_fingerprint(tmp_path) == before
+
+    csv_file.write_text("duns,field,value\n123456789,Company Type,Public\n")
+    assert snapshot.source_fingerprint(tmp_path) != before
+
+def test_shared_snapshot_serves_mapped_views(tmp_path, client, sample_duns, restore_dataset):
+    """Test that shared mode reads records and strings through the memory map."""
+    path = tmp_path / "shared.snapshot"
+    expected_company = client.get(f"/companies/{sample_duns}").json()
+    expected_people = client.get(f"/companies/{sample_duns}/people").json()
+    expected_statement = client.get(f"/companies/{sample_duns}/cash-flow?year=2023").json()
+    expected_wide = client.get(f"/companies/{sample_duns}/cash-flow?layout=wide&include_raw=true").json()
+
+    data_loader.save_snapshot(path, "fingerprint")
+    assert data_loader.load_snapshot(path, "fingerprint", shared=True)
+
+    assert isinstance(data_loader.company_data, snapshot.MappedRecords)
+    assert isinstance(data_loader.cash_flow_data.raw_labels, snapshot.StringTable)
+    assert client.get(f"/companies/{sample_duns}").json() == expected_company
+    assert client.get(f"/companies/{sample_duns}/people").json() == expected_people
+    assert client.get(f"/companies/{sample_duns}/cash-flow?year=2023").json() == expected_statement
+    # The pivot cube is mapped from the snapshot rather than rebuilt per worker
+    assert not data_loader.cash_flow_data.cube.flags.writeable
+    assert not data_loader.cash_flow_data.raw_cube.flags.writeable
+    assert client.get(f"/companies/{sample_duns}/cash-flow?layout=wide&include_raw=true").json() == expected_wide
+
+def test_string_table_round_trip():
+    """Test packing strings into snapshot arrays and reading them back."""
+    strings = ["$38,406", "", "Café ($000s)", "(1.29%)"]
+    table = snapshot.StringTable(*snapshot.pack_strings(strings))
+    assert len(table) == 4
+    assert list(table) == strings
+    assert table[-1] == "(1.29%)"
+    assert table[1:3] == strings[1:3]
+
+def test_line_item_scale():
+    """Test unit scale detection from line-item names."""
+    assert line_item_scale("Total Assets ($000s)") == 1000
+    assert line_item_scale("Weighted average number of ordinary shares for basic earnings per share (000s)") == 1000
+    assert line_item_scale("Basic earnings per share (cents)") == 1
+    assert line_item_scale("Growth") == 1
+
+def test_dataset_restored_after_snapshot_tests():
+    """Test that the snapshot tests put the CSV-loaded dataset back."""
+    assert isinstance(data_loader.company_data, dict)
+    assert isinstance(data_loader.cash_flow_data.raw_labels, list)
+    assert data_loader.balance_sheet_data.values.flags.writeable
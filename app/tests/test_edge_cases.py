@@ -160,3 +160,21 @@ def test_multiple_search_filters(client):
             assert "sydney" in company["address"].lower()
         if company["company_type"]:
             assert company["company_type"] == "Private"
+
+def test_industries_pagination_slices_presorted_list(client):
+    """Test that industry pages are consecutive slices of the same sorted roll-up."""
+    full = client.get("/industries?limit=1000").json()
+    page = client.get("/industries?limit=5&offset=5").json()
+    assert page["total_industries"] == full["total_industries"]
+    assert page["industries"] == full["industries"][5:10]
+
+def test_industry_summary_precomputed(client):
+    """Test that the industry roll-up is computed at load time and served as-is."""
+    import data_loader
+
+    response = client.get("/industries?limit=1000")
+    data = response.json()
+    assert data["total_industries"] == len(data_loader.industry_summary)
+    assert [ind["industry_code"] for ind in data["industries"]] == [
+        ind["industry_code"] for ind in data_loader.industry_summary
+    ]
@@ -0,0 +1,43 @@
+"""
+Tests for the streaming statement export endpoints.
+"""
+import csv
+import io
+import json
+import data_loader
+
+def test_ndjson_export_covers_all_companies(client):
+    """Test that the NDJSON export has one row per line and covers every company's rows."""
+    response = client.get("/export/cash_flow?year=2024")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    expected = sum(len(data_loader.cash_flow_data.records(duns, year=2024)) for duns in data_loader.cash_flow_data)
+    assert len(rows) == expected
+    assert {row["year"] for row in rows} == {2024}
+
+def test_ndjson_export_matches_statement_endpoint(client, sample_duns):
+    """Test that exported rows for a company equal its statement endpoint response."""
+    response = client.get("/export/balance_sheet?year_from=2023")
+    exported = [row for row in map(json.loads, response.text.splitlines()) if row["duns"] == sample_duns]
+    single = client.get(f"/companies/{sample_duns}/balance-sheet?year_from=2023").json()["data"]
+    assert exported == single
+
+def test_csv_export_with_line_item_filter(client, sample_duns):
+    """Test the CSV format, its header and the line-item filter."""
+    line_item = data_loader.income_statement_data.records(sample_duns)[0]["line_item"]
+    response = client.get("/export/income_statement", params={"format": "csv", "line_items": line_item})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert list(rows[0].keys()) == ["duns", "line_item", "year", "value"]
+    assert {row["line_item"] for row in rows} == {line_item}
+
+def test_export_etag_and_invalid_statement(client):
+    """Test conditional export requests and rejection of unknown statements/formats."""
+    etag = client.get("/export/cash_flow?year=2024").headers["etag"]
+    assert client.get("/export/cash_flow?year=2024", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/export/ledger").status_code == 422
+    assert client.get("/export/cash_flow?format=xml").status_code == 422
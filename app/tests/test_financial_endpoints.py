@@ -106,3 +106,152 @@ def test_financial_data_has_expected_fields(client, sample_duns):
         assert "duns" in item
         # line_item should be present in financial data
         assert "line_item" in item or "field_name" in item
+
+def test_get_balance_sheet_with_year_range(client, sample_duns):
+    """Test getting balance sheet with a year range."""
+    response = client.get(f"/companies/{sample_duns}/balance-sheet?year_from=2020&year_to=2022")
+    assert response.status_code == 200
+    data = response.json()
+    years = {item["year"] for item in data["data"]}
+    assert years
+    assert years <= {2020, 2021, 2022}
+
+def test_year_range_preserves_row_order(client, sample_duns):
+    """Test that year-range results keep the same order as the unfiltered statement."""
+    full = client.get(f"/companies/{sample_duns}/income-statement").json()["data"]
+    ranged = client.get(f"/companies/{sample_duns}/income-statement?year_from=2021").json()["data"]
+    assert ranged == [item for item in full if item["year"] >= 2021]
+
+def test_year_filter_matches_linear_scan(client, sample_duns):
+    """Test that indexed year lookups return the same rows as a full scan."""
+    full = client.get(f"/companies/{sample_duns}/cash-flow").json()["data"]
+    filtered = client.get(f"/companies/{sample_duns}/cash-flow?year=2023").json()["data"]
+    assert filtered == [item for item in full if item["year"] == 2023]
+
+def test_inverted_year_range_is_empty(client, sample_duns):
+    """Test that a year range with year_from after year_to returns no rows."""
+    response = client.get(f"/companies/{sample_duns}/balance-sheet?year_from=2024&year_to=2020")
+    assert response.status_code == 200
+    assert response.json()["data"] == []
+
+def test_get_financial_summary_with_year_range(client, sample_duns_with_all_data):
+    """Test getting combined financial summary with a year range."""
+    if sample_duns_with_all_data:
+        response = client.get(
+            f"/companies/{sample_duns_with_all_data}/financials/summary?year_from=2023&year_to=2024"
+        )
+        assert response.status_code == 200
+        data = response.json()
+        for statement in ("balance_sheet", "income_statement", "cash_flow"):
+            assert data[statement]
+            for item in data[statement]:
+                assert item["year"] in (2023, 2024)
+
+def test_statement_values_are_numeric(client, sample_duns):
+    """Test that statement values are returned as parsed numbers."""
+    response = client.get(f"/companies/{sample_duns}/balance-sheet")
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert any(item["value"] is not None for item in data)
+    for item in data:
+        assert item["value"] is None or isinstance(item["value"], (int, float))
+        assert "raw_value" not in item
+
+def test_include_raw_returns_original_strings(client, sample_duns):
+    """Test that include_raw adds the original value strings alongside parsed values."""
+    response = client.get(f"/companies/{sample_duns}/income-statement?year=2024&include_raw=true")
+    assert response.status_code == 200
+    for item in response.json()["data"]:
+        assert "raw_value" in item
+        raw = item["raw_value"]
+        if raw and raw.startswith("$") and item["line_item"].endswith("($000s)"):
+            # Thousands-scaled line items are multiplied out into units
+            assert item["value"] == float(raw.strip("$").replace(",", "")) * 1000
+        if raw is None:
+            assert item["value"] is None
+        if raw == "-":
+            # A dash is nil, not missing
+            assert item["value"] == 0.0
+
+def test_wide_layout_matches_long_layout(client, sample_duns):
+    """Test that every long-format row appears in the wide matrix at its line item and year."""
+    wide = client.get(f"/companies/{sample_duns}/balance-sheet?layout=wide").json()
+    long_rows = client.get(f"/companies/{sample_duns}/balance-sheet").json()["data"]
+    assert wide["statement_type"] == "balance_sheet"
+
+    matrix = wide["data"]
+    assert matrix["years"] == sorted(matrix["years"], reverse=True)
+    assert matrix["line_items"] == list(dict.fromkeys(row["line_item"] for row in long_rows))
+    assert len(matrix["values"]) == len(matrix["line_items"])
+    for row in long_rows:
+        i = matrix["line_items"].index(row["line_item"])
+        j = matrix["years"].index(row["year"])
+        assert matrix["values"][i][j] == row["value"]
+
+def test_wide_layout_year_filter_and_raw(client, sample_duns):
+    """Test that year filters narrow the years axis and include_raw adds a raw value grid."""
+    response = client.get(f"/companies/{sample_duns}/cash-flow?layout=wide&year_from=2022&year_to=2023&include_raw=true")
+    assert response.status_code == 200
+    matrix = response.json()["data"]
+    assert matrix["years"] == [2023, 2022]
+    assert all(len(row) == 2 for row in matrix["values"])
+    assert len(matrix["raw_values"]) == len(matrix["values"])
+
+def test_wide_layout_summary(client, sample_duns):
+    """Test the wide layout on the combined summary endpoint."""
+    response = client.get(f"/companies/{sample_duns}/financials/summary?layout=wide&year=2024")
+    assert response.status_code == 200
+    data = response.json()
+    for statement in ("balance_sheet", "income_statement", "cash_flow"):
+        assert data[statement]["years"] == [2024]
+        assert data[statement]["line_items"]
+    assert client.get(f"/companies/{sample_duns}/balance-sheet?layout=tall").status_code == 422
+
+def test_line_items_exact_and_glob(client, sample_duns):
+    """Test selecting line items by exact name and by case-insensitive glob pattern."""
+    url = f"/companies/{sample_duns}/income-statement"
+    all_rows = client.get(url).json()["data"]
+    revenue = "Revenue from continuing operations ($000s)"
+
+    exact = client.get(url, params={"line_items": revenue}).json()["data"]
+    assert exact == [row for row in all_rows if row["line_item"] == revenue]
+
+    pattern = client.get(url, params={"line_items": ["revenue*", "*EBIT*"], "year_from": 2020}).json()["data"]
+    assert pattern == [
+        row for row in all_rows
+        if (row["line_item"].lower().startswith("revenue") or "ebit" in row["line_item"].lower())
+        and row["year"] >= 2020
+    ]
+    assert pattern
+
+    assert client.get(url, params={"line_items": "No such item"}).json()["data"] == []
+
+def test_fields_projection(client, sample_duns):
+    """Test that fields trims each row, and that raw_value implies include_raw."""
+    url = f"/companies/{sample_duns}/balance-sheet"
+    full = client.get(url, params={"year": 2024, "include_raw": True}).json()["data"]
+
+    projected = client.get(url, params={"year": 2024, "fields": ["line_item", "value"]}).json()["data"]
+    assert projected == [{"line_item": row["line_item"], "value": row["value"]} for row in full]
+
+    raw = client.get(url, params={"year": 2024, "fields": "raw_value"}).json()["data"]
+    assert raw == [{"raw_value": row["raw_value"]} for row in full]
+
+    assert client.get(url, params={"fields": "colour"}).status_code == 422
+    assert client.get(url, params={"fields": "value", "layout": "wide"}).status_code == 400
+
+def test_line_items_on_wide_layout_and_summary(client, sample_duns_with_all_data):
+    """Test line item selection on the wide layout and the summary endpoint."""
+    duns = sample_duns_with_all_data
+    wide = client.get(
+        f"/companies/{duns}/balance-sheet", params={"layout": "wide", "line_items": "TOTAL*"}
+    ).json()["data"]
+    assert wide["line_items"] and all(name.lower().startswith("total") for name in wide["line_items"])
+    assert len(wide["values"]) == len(wide["line_items"])
+
+    summary = client.get(
+        f"/companies/{duns}/financials/summary", params={"line_items": "*cash*", "fields": "line_item"}
+    ).json()
+    for statement in ("balance_sheet", "income_statement", "cash_flow"):
+        assert all("cash" in row["line_item"].lower() and set(row) == {"line_item"} for row in summary[statement])
+    assert summary["cash_flow"]
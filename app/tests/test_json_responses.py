@@ -0,0 +1,64 @@
+"""
+Tests for the model-free JSON responses and the configurable encoder.
+"""
+import json
+import pytest
+import json_encoding
+from models import (
+    CombinedFinancialResponse,
+    FinancialBatchResponse,
+    FinancialStatementResponse,
+    MetricsBatchResponse,
+    WideCombinedFinancialResponse,
+    WideStatementResponse,
+)
+from response_cache import response_cache
+
+@pytest.fixture
+def uncached(monkeypatch):
+    """Disable the response cache so every request builds its body."""
+    monkeypatch.setattr(response_cache, "max_bytes", 0)
+
+@pytest.mark.parametrize("path, model", [
+    ("balance-sheet", FinancialStatementResponse),
+    ("balance-sheet?include_raw=true", FinancialStatementResponse),
+    ("cash-flow?layout=wide", WideStatementResponse),
+    ("income-statement?layout=wide&include_raw=true&year_from=2022", WideStatementResponse),
+    ("financials/summary?year=2024", CombinedFinancialResponse),
+    ("financials/summary?layout=wide", WideCombinedFinancialResponse),
+])
+def test_statement_payloads_match_models(client, uncached, sample_duns, path, model):
+    """Test that model-free statement responses are exactly what their response models produce."""
+    response = client.get(f"/companies/{sample_duns}/{path}")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    data = response.json()
+    assert model(**data).model_dump(mode="json") == data
+
+def test_batch_payloads_match_models(client, sample_duns):
+    """Test that batch responses match their response models, including unrequested statements."""
+    response = client.post("/financials/batch", json={"duns": [sample_duns, "000"], "statements": ["income_statement"]})
+    data = response.json()
+    assert FinancialBatchResponse(**data).model_dump(mode="json") == data
+    assert data["results"][0]["balance_sheet"] is None
+
+    response = client.post("/metrics/batch", json={"duns": [sample_duns]})
+    data = response.json()
+    assert MetricsBatchResponse(**data).model_dump(mode="json") == data
+
+def test_openapi_keeps_response_models(client):
+    """Test that endpoints answering without models still document them."""
+    paths = client.get("/openapi.json").json()["paths"]
+    schema = paths["/companies/{duns}/balance-sheet"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert {"$ref": "#/components/schemas/FinancialStatementResponse"} in schema["anyOf"]
+    schema = paths["/financials/batch"]["post"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert schema == {"$ref": "#/components/schemas/FinancialBatchResponse"}
+
+def test_standard_encoder(client, uncached, sample_duns, monkeypatch):
+    """Test that the stdlib encoder gives the same documents, with non-finite floats as null."""
+    expected = client.get(f"/companies/{sample_duns}/financials/summary").json()
+    monkeypatch.setattr(json_encoding, "JSON_ENCODER", "standard")
+    assert client.get(f"/companies/{sample_duns}/financials/summary").json() == expected
+
+    body = json_encoding.dumps({"value": float("nan"), "values": [1.5, float("inf")], "name": "é"})
+    assert json.loads(body) == {"value": None, "values": [1.5, None], "name": "é"}
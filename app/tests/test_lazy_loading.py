@@ -0,0 +1,102 @@
+"""
+Tests for the lazy loading mode.
+"""
+import pytest
+import data_loader
+
+@pytest.fixture
+def lazy_data(monkeypatch):
+    """Load the data lazily, restoring a full load afterwards."""
+    data_loader.load_all_data(lazy=True)
+    yield
+    monkeypatch.undo()
+    data_loader.load_all_data(lazy=False)
+
+def test_lazy_load_defers_categories(client, lazy_data, sample_duns):
+    """Test that listing and search work without loading statements, people or operations."""
+    resident = client.get("/health").json()["resident"]
+    assert resident["lazy"] is True
+    assert resident["categories"]["company_info"]["resident"] is True
+    assert resident["categories"]["balance_sheet"] == {"resident": False, "companies": 222}
+    assert not any(resident["indexes"].values())
+
+    assert client.get("/companies?limit=5").status_code == 200
+    assert client.get(f"/companies/{sample_duns}").status_code == 200
+    assert "balance_sheet_data" not in vars(data_loader)
+    assert "people_data" not in vars(data_loader)
+
+def test_lazy_category_loads_on_first_access(client, lazy_data, sample_duns):
+    """Test that a deferred category loads on first use and serves the same data."""
+    response = client.get(f"/companies/{sample_duns}/balance-sheet")
+    assert response.status_code == 200
+    assert response.json()["data"]
+
+    resident = client.get("/health").json()["resident"]
+    assert resident["categories"]["balance_sheet"]["resident"] is True
+    assert resident["categories"]["income_statement"]["resident"] is False
+    assert data_loader.get_data_version("balance_sheet", sample_duns) != ""
+
+def test_lazy_category_replaces_published_versions(lazy_data, sample_duns):
+    """Test that loading a deferred category publishes new version dicts instead of updating the old ones."""
+    data_versions, file_signatures = data_loader.data_versions, data_loader.file_signatures
+    data_version = data_loader.data_version
+    assert data_loader.income_statement_data
+
+    assert "income_statement" not in data_versions
+    assert data_loader.data_versions is not data_versions
+    assert data_loader.file_signatures is not file_signatures
+    assert sample_duns in data_loader.data_versions["income_statement"]
+    assert data_loader.data_version == data_version + 1
+
+def test_eager_load_reports_not_lazy(client):
+    """Test that /health reports the mode the data was actually loaded in."""
+    assert client.get("/health").json()["resident"]["lazy"] is False
+
+def test_lazy_statement_indexes(client, lazy_data, sample_duns):
+    """Test that screening, metrics and benchmarks build their indexes (and load statements) on demand."""
+    response = client.post("/screen", json={"filters": [
+        {"statement": "balance_sheet", "line_item": "TOTAL ASSETS ($000s)", "year": 2024, "op": ">", "value": 0}
+    ]})
+    assert response.status_code == 200
+    assert response.json()["total"] > 0
+    assert client.get(f"/companies/{sample_duns}/metrics").status_code == 200
+    assert not client.get("/health").json()["resident"]["indexes"]["peer_benchmarks"]
+    assert client.get(f"/companies/{sample_duns}/benchmark").status_code == 200
+    assert all(client.get("/health").json()["resident"]["indexes"].values())
+
+def test_per_company_cache_is_bounded(client, monkeypatch, sample_duns):
+    """Test that people are read per company, keeping only the most recently used."""
+    monkeypatch.setattr(data_loader, "LAZY_COMPANY_CACHE_SIZE", 2)
+    data_loader.load_all_data(lazy=True)
+    try:
+        duns_list = [duns for duns in data_loader.get_all_duns_numbers() if duns in data_loader.people_data][:3]
+        responses = [client.get(f"/companies/{duns}/people").json() for duns in duns_list]
+        assert all(response["people"] for response in responses)
+
+        people = client.get("/health").json()["resident"]["categories"]["people"]
+        assert people["resident_companies"] == 2
+        assert people["max_companies"] == 2
+        assert people["companies"] == len(data_loader.people_data)
+    finally:
+        monkeypatch.undo()
+        data_loader.load_all_data(lazy=False)
+
+    # The same records as a full load
+    for response in responses:
+        assert response == client.get(f"/companies/{response['duns']}/people").json()
+
+def test_lazy_reload(client, lazy_data, sample_duns, monkeypatch):
+    """Test that a reload only lists unloaded categories, and rechecks loaded ones by content."""
+    client.get(f"/companies/{sample_duns}/cash-flow")
+    cash_flow = data_loader.cash_flow_data
+    dataset_version = data_loader.dataset_version
+    for folder_name in ("cash_flow_statement", "balance_sheet"):
+        monkeypatch.setitem(data_loader.file_signatures[folder_name], sample_duns, (0, 0))
+
+    result = data_loader.reload_data()
+    assert result["changed_categories"] == ["balance_sheet"]
+    assert result["parsed_files"] == 0
+    assert data_loader.cash_flow_data is cash_flow
+    assert "balance_sheet_data" not in vars(data_loader)
+    # Only the signatures were faked, so the dataset hash is the same
+    assert data_loader.dataset_version == dataset_version
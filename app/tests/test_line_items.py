@@ -0,0 +1,79 @@
+"""
+Tests for the line-item taxonomy and lookups by canonical id.
+"""
+import data_loader
+from taxonomy import build_taxonomy, line_item_label, line_item_slug, line_item_unit
+
+def test_line_item_normalization():
+    """Test the label, id and unit derived from a line-item name."""
+    assert line_item_label("Interest expense  ($000s)") == "Interest expense"
+    assert line_item_slug("Income tax payable/(refundable) ($000s)") == "income_tax_payable_refundable"
+    assert line_item_slug("TOTAL ASSETS ($000s)") == "total_assets"
+    assert line_item_unit("Total Assets ($000s)") == ("dollars", 1000.0)
+    assert line_item_unit("Weighted average number of ordinary shares (000s)") == ("count", 1000.0)
+    assert line_item_unit("Basic earnings per share (cents)") == ("cents", 1.0)
+    assert line_item_unit("Growth") is None
+
+def test_build_taxonomy_sections_and_collisions():
+    """Test section headers, nesting, statement totals and colliding ids."""
+    entries = build_taxonomy(
+        ["Equity", "Attributable To:", "Reserves ($000s)", "Growth", "TOTAL EQUITY ($000s)",
+         "Interest paid ($000s)", "Interest Paid ($000s)"],
+        [None, None, "$5", "(1.29%)", "$9", "$1", "$2"],
+    )
+    by_id = {entry["id"]: entry for entry in entries}
+    assert list(by_id) == [
+        "equity", "attributable_to", "reserves", "growth", "total_equity", "interest_paid", "interest_paid_2"
+    ]
+    assert by_id["equity"]["is_section"] and by_id["equity"]["unit"] is None
+    assert by_id["attributable_to"]["section"] == "equity"
+    assert by_id["reserves"]["section"] == "attributable_to"
+    assert by_id["growth"]["unit"] == "percent"
+    assert by_id["total_equity"]["section"] is None
+    assert by_id["interest_paid"]["section"] is None
+
+def test_list_line_items(client):
+    """Test listing the taxonomy, and filtering it by statement and section."""
+    response = client.get("/line-items")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == len(data["line_items"]) > 0
+    assert {item["statement"] for item in data["line_items"]} == {"balance_sheet", "income_statement", "cash_flow"}
+
+    cash_flow = client.get("/line-items?statement=cash_flow").json()["line_items"]
+    interest = [item for item in cash_flow if item["id"].startswith("interest_paid")]
+    assert [item["name"] for item in interest] == ["Interest paid ($000s)", "Interest Paid ($000s)"]
+    assert [item["id"] for item in interest] == ["interest_paid", "interest_paid_2"]
+
+    current_assets = client.get(
+        "/line-items?statement=balance_sheet&section=current_assets&include_sections=false"
+    ).json()["line_items"]
+    assert "total_current_assets" in [item["id"] for item in current_assets]
+    assert all(item["section"] == "current_assets" and not item["is_section"] for item in current_assets)
+
+def test_statement_query_by_id(client, sample_duns):
+    """Test that taxonomy ids select the same rows as exact names."""
+    by_id = client.get(f"/companies/{sample_duns}/balance-sheet?line_items=total_assets").json()["data"]
+    by_name = client.get(
+        f"/companies/{sample_duns}/balance-sheet", params={"line_items": "TOTAL ASSETS ($000s)"}
+    ).json()["data"]
+    assert by_id and by_id == by_name
+
+    response = client.post("/financials/batch", json={
+        "duns": [sample_duns], "statements": ["cash_flow"], "line_items": ["interest_paid_2"]
+    })
+    rows = response.json()["results"][0]["cash_flow"]
+    assert rows and {row["line_item"] for row in rows} == {"Interest Paid ($000s)"}
+
+def test_screen_and_benchmark_by_id(client):
+    """Test that screen filters and benchmarks accept taxonomy ids."""
+    screen_filter = {"statement": "balance_sheet", "year": 2024, "op": ">", "value": 0}
+    by_id = client.post("/screen", json={"filters": [{**screen_filter, "line_item": "total_assets"}]})
+    by_name = client.post("/screen", json={"filters": [{**screen_filter, "line_item": "TOTAL ASSETS ($000s)"}]})
+    assert by_id.status_code == 200
+    assert by_id.json()["total"] == by_name.json()["total"] > 0
+
+    benchmarks = data_loader.peer_benchmarks
+    duns = next(duns for duns, industry in zip(benchmarks.duns_order, benchmarks.industries) if industry)
+    response = client.get(f"/companies/{duns}/benchmark?source=income_statement&line_items=ebitda")
+    assert [item["line_item"] for item in response.json()["benchmarks"]] == ["EBITDA ($000s)"]
@@ -0,0 +1,83 @@
+"""
+Tests for the financial ratios and growth metrics endpoints.
+"""
+import pytest
+import data_loader
+from metrics import METRIC_NAMES
+
+def _value(store, duns, line_item, year):
+    """Look up one value from the long-format rows."""
+    for row in store.records(duns, year=year):
+        if row["line_item"] == line_item:
+            return row["value"]
+    return None
+
+def test_company_metrics_match_raw_rows(client, sample_duns):
+    """Test that ratios and growth equal the same calculation over the statement rows."""
+    response = client.get(f"/companies/{sample_duns}/metrics")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["years"] == sorted(body["years"], reverse=True)
+    assert set(body["metrics"]) == set(METRIC_NAMES)
+
+    income = data_loader.income_statement_data
+    revenue_item = "Revenue from continuing operations ($000s)"
+    for i, year in enumerate(body["years"]):
+        revenue = _value(income, sample_duns, revenue_item, year)
+        net_profit = _value(income, sample_duns, "Net profit for the period ($000s)", year)
+        previous_revenue = _value(income, sample_duns, revenue_item, year - 1)
+
+        net_margin = body["metrics"]["net_margin"][i]
+        if None in (revenue, net_profit) or revenue == 0:
+            assert net_margin is None
+        else:
+            assert net_margin == pytest.approx(net_profit / revenue)
+
+        growth = body["metrics"]["revenue_growth"][i]
+        if None in (revenue, previous_revenue) or previous_revenue == 0:
+            assert growth is None
+        else:
+            assert growth == pytest.approx((revenue - previous_revenue) / abs(previous_revenue))
+
+def test_debt_to_equity_uses_borrowings(client, sample_duns):
+    """Test that debt to equity is interest-bearing borrowings over equity, not total liabilities."""
+    body = client.get(f"/companies/{sample_duns}/metrics?metrics=debt_to_equity").json()
+    balance_sheet = data_loader.balance_sheet_data
+    for i, year in enumerate(body["years"]):
+        current = _value(balance_sheet, sample_duns, "Total current interest-bearing loans and borrowings ($000s)", year)
+        non_current = _value(balance_sheet, sample_duns, "Total non-current interest-bearing loans and borrowings ($000s)", year)
+        equity = _value(balance_sheet, sample_duns, "TOTAL EQUITY ($000s)", year)
+
+        ratio = body["metrics"]["debt_to_equity"][i]
+        if None in (current, non_current, equity) or equity == 0:
+            assert ratio is None
+        else:
+            assert ratio == pytest.approx((current + non_current) / equity)
+
+def test_metrics_selection_and_year_filter(client, sample_duns):
+    """Test selecting metrics and narrowing the years."""
+    response = client.get(
+        f"/companies/{sample_duns}/metrics",
+        params={"metrics": ["current_ratio", "debt_to_equity"], "year_from": 2022, "year_to": 2023}
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["years"] == [2023, 2022]
+    assert list(body["metrics"]) == ["current_ratio", "debt_to_equity"]
+    assert all(len(values) == 2 for values in body["metrics"].values())
+
+    assert client.get(f"/companies/{sample_duns}/metrics?metrics=magic_ratio").status_code == 422
+
+def test_metrics_not_found(client, invalid_duns):
+    """Test that unknown companies return 404."""
+    assert client.get(f"/companies/{invalid_duns}/metrics").status_code == 404
+
+def test_metrics_batch(client, invalid_duns):
+    """Test that the batch variant matches the per-company endpoint."""
+    duns_list = data_loader.get_all_duns_numbers()[:3]
+    response = client.post("/metrics/batch", json={"duns": duns_list + [invalid_duns], "year": 2024})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["not_found"] == [invalid_duns]
+    for result in body["results"]:
+        assert result == client.get(f"/companies/{result['duns']}/metrics?year=2024").json()
@@ -0,0 +1,194 @@
+"""
+Tests for reloading the data without a restart.
+"""
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+import data_loader
+import snapshot
+from routers import admin
+
+@pytest.fixture
+def data_copy(tmp_path, monkeypatch):
+    """Serve the data from a copy (with the same modification times) that tests may edit."""
+    original_path = data_loader.get_data_path()
+    copy_path = tmp_path / "CompanyData"
+    shutil.copytree(original_path, copy_path)
+    monkeypatch.setattr(data_loader, "get_data_path", lambda: copy_path)
+    monkeypatch.setattr(data_loader, "serving_snapshot", None)
+    monkeypatch.setattr(data_loader, "snapshot_fingerprint", None)
+    yield copy_path
+    # Reload from the original files, restoring anything a test changed
+    monkeypatch.setattr(data_loader, "get_data_path", lambda: original_path)
+    monkeypatch.setattr(data_loader, "serving_snapshot", None)
+    data_loader.reload_data()
+
+def _rebuild_in_other_worker(data_path: Path, snapshot_path: Path):
+    """Start another worker process on ``data_path``, which rewrites the stale snapshot."""
+    script = (
+        "import data_loader\n"
+        "from pathlib import Path\n"
+        f"data_loader.get_data_path = lambda: Path({str(data_path)!r})\n"
+        f"data_loader.load_all_data(workers=0, snapshot_path={str(snapshot_path)!r}, shared=True)\n"
+    )
+    app_dir = Path(data_loader.__file__).parent
+    subprocess.run([sys.executable, "-c", script], cwd=app_dir, check=True, capture_output=True)
+
+def test_reload_without_changes_keeps_data(data_copy):
+    """Test that a reload of unchanged files parses nothing and keeps the data version."""
+    version = data_loader.data_version
+    store = data_loader.balance_sheet_data
+
+    result = data_loader.reload_data()
+    assert result["changed"] is False
+    assert result["parsed_files"] == 0
+    assert result["reused_files"] > 0
+    assert data_loader.data_version == version
+    assert data_loader.balance_sheet_data is store
+
+def test_reload_parses_only_modified_files(data_copy, sample_duns):
+    """Test that editing one file reparses only that file and swaps in its new values."""
+    csv_file = data_copy / "balance_sheet" / f"{sample_duns}.csv"
+    lines = csv_file.read_text().splitlines()
+    lines[1:] = [line for line in lines[1:] if ",2024," not in line]
+    csv_file.write_text("\n".join(lines) + "\n")
+    version = data_loader.data_version
+    other_duns = next(duns for duns in data_loader.get_all_duns_numbers() if duns != sample_duns)
+    other_rows = data_loader.balance_sheet_data.records(other_duns)
+
+    result = data_loader.reload_data()
+    assert result["changed"] is True
+    assert result["parsed_files"] == 1
+    assert data_loader.data_version == version + 1
+    assert data_loader.balance_sheet_data.records(sample_duns, year=2024) == []
+    assert data_loader.balance_sheet_data.records(other_duns) == other_rows
+
+def test_reload_drops_removed_files(data_copy, client, sample_duns):
+    """Test that removing a company's file removes it from that category."""
+    (data_copy / "cash_flow_statement" / f"{sample_duns}.csv").unlink()
+
+    result = data_loader.reload_data()
+    assert result["changed"] is True
+    assert result["parsed_files"] == 0
+    assert sample_duns not in data_loader.cash_flow_data
+    assert client.get(f"/companies/{sample_duns}/cash-flow").json()["data"] == []
+    assert client.get(f"/companies/{sample_duns}/balance-sheet").json()["data"] != []
+
+def test_reload_skips_files_with_unchanged_content(data_copy, sample_duns):
+    """Test that a touched file is hashed but not parsed, and nothing is rebuilt."""
+    csv_file = data_copy / "people" / f"{sample_duns}.csv"
+    os.utime(csv_file, ns=(0, 0))
+    version = data_loader.data_version
+
+    result = data_loader.reload_data()
+    assert result["changed"] is False
+    assert result["parsed_files"] == 0
+    assert data_loader.data_version == version
+    assert data_loader.file_signatures["people"][sample_duns] == data_loader.file_signature(csv_file)
+
+def test_reload_rebuilds_only_affected_categories(data_copy, sample_duns):
+    """Test that untouched categories and indexes built only from them are kept."""
+    csv_file = data_copy / "income_statement" / f"{sample_duns}.csv"
+    csv_file.write_text(csv_file.read_text().replace(",2024,", ",2030,", 1))
+    balance_sheet = data_loader.balance_sheet_data
+    search_index = data_loader.search_index
+
+    result = data_loader.reload_data()
+    assert result["changed_categories"] == ["income_statement"]
+    assert data_loader.balance_sheet_data is balance_sheet
+    assert data_loader.search_index is search_index
+    assert 2030 in data_loader.screener.years
+
+def test_reloaded_store_matches_full_load(data_copy, sample_duns):
+    """Test that a store rebuilt from reused companies equals one parsed from every file."""
+    other_duns = data_loader.get_all_duns_numbers()[-1]
+    for duns in (sample_duns, other_duns):
+        csv_file = data_copy / "income_statement" / f"{duns}.csv"
+        csv_file.write_text(csv_file.read_text().replace(",2023,", ",2019,"))
+    (data_copy / "income_statement" / f"{data_loader.get_all_duns_numbers()[1]}.csv").unlink()
+    data_loader.reload_data()
+    reloaded = data_loader.income_statement_data
+
+    full = data_loader.load_category("income_statement")
+    assert reloaded.duns_order == full.duns_order
+    assert reloaded.line_items == full.line_items
+    for duns in full.duns_order:
+        assert reloaded.records(duns, include_raw=True) == full.records(duns, include_raw=True)
+
+def test_stale_snapshot_parses_only_changed_files(data_copy, tmp_path, sample_duns):
+    """Test that startup from a snapshot of older CSVs parses just the files changed since."""
+    path = tmp_path / "data.snapshot"
+    data_loader.save_snapshot(path, "old-fingerprint")
+    csv_file = data_copy / "operations" / f"{sample_duns}.csv"
+    csv_file.write_text("duns,field_name,field_value\n")
+
+    data_loader.load_all_data(workers=0, snapshot_path=str(path), shared=False)
+    assert data_loader.last_reload["parsed_files"] == 1
+    assert data_loader.last_reload["changed_categories"] == ["operations"]
+    assert snapshot.read_snapshot(path, snapshot.source_fingerprint(data_copy)) is not None
+
+def test_reload_rewrites_shared_snapshot(data_copy, tmp_path, sample_duns):
+    """Test that a reload rewrites the snapshot and keeps serving the shared mapping."""
+    path = tmp_path / "shared.snapshot"
+    data_loader.load_all_data(workers=0, snapshot_path=str(path), shared=True)
+    csv_file = data_copy / "balance_sheet" / f"{sample_duns}.csv"
+    csv_file.write_text(csv_file.read_text().replace(",2024,", ",2031,"))
+
+    result = data_loader.reload_data()
+    assert result["parsed_files"] == 1
+    fingerprint = snapshot.source_fingerprint(data_copy)
+    assert snapshot.read_fingerprint(path) == fingerprint == data_loader.snapshot_fingerprint
+    assert 2031 in data_loader.balance_sheet_data.wide(sample_duns)["years"]
+    assert not data_loader.balance_sheet_data.values.flags.writeable
+
+def test_workers_follow_snapshot_rewritten_elsewhere(data_copy, tmp_path, sample_duns):
+    """Test that a worker loads a snapshot another worker rebuilt, on reload or when polling."""
+    path = tmp_path / "shared.snapshot"
+    data_loader.load_all_data(workers=0, snapshot_path=str(path), shared=True)
+    assert data_loader.sync_snapshot() is False
+
+    csv_file = data_copy / "operations" / f"{sample_duns}.csv"
+    csv_file.write_text("duns,field_name,field_value\n")
+    _rebuild_in_other_worker(data_copy, path)
+    result = data_loader.reload_data()
+    assert result["changed"] is True
+    assert result["parsed_files"] == 0
+    assert result["changed_categories"] == ["operations"]
+    assert data_loader.operations_data[sample_duns] == []
+
+    csv_file = data_copy / "income_statement" / f"{sample_duns}.csv"
+    csv_file.write_text(csv_file.read_text().replace(",2024,", ",2032,"))
+    _rebuild_in_other_worker(data_copy, path)
+    assert data_loader.sync_snapshot() is True
+    assert data_loader.snapshot_fingerprint == snapshot.source_fingerprint(data_copy)
+    assert 2032 in data_loader.income_statement_data.wide(sample_duns)["years"]
+    assert not data_loader.income_statement_data.values.flags.writeable
+    assert data_loader.sync_snapshot() is False
+
+def test_admin_reload_requires_token(client, monkeypatch):
+    """Test that the reload endpoint is disabled without ADMIN_TOKEN and checks the token."""
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", None)
+    assert client.post("/admin/reload").status_code == 403
+
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secret")
+    assert client.post("/admin/reload").status_code == 401
+    assert client.post("/admin/reload", headers={"X-Admin-Token": "wrong"}).status_code == 401
+
+def test_admin_reload(client, data_copy, monkeypatch):
+    """Test reloading through the admin endpoint, waiting for the outcome or in the background."""
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secret")
+    headers = {"X-Admin-Token": "secret"}
+
+    response = client.post("/admin/reload?wait=true", headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "completed"
+    assert body["result"]["changed"] is False
+
+    response = client.post("/admin/reload", headers=headers)
+    assert response.status_code == 202
+    assert response.json()["status"] == "started"
+    assert client.get("/health").json()["last_reload"]["parsed_files"] == 0
@@ -0,0 +1,107 @@
+"""
+Tests for the pre-serialized response cache.
+"""
+import data_loader
+from response_cache import ResponseCache, compute_etag, response_cache
+
+def test_cached_response_matches_fresh_response(client, sample_duns):
+    """Test that a cache hit returns the same body as the first (uncached) request."""
+    response_cache.clear()
+    first = client.get(f"/companies/{sample_duns}/balance-sheet?year=2024")
+    hits_before = response_cache.hits
+    second = client.get(f"/companies/{sample_duns}/balance-sheet?year=2024")
+    assert first.status_code == second.status_code == 200
+    assert second.content == first.content
+    assert second.headers["content-type"] == "application/json"
+    assert response_cache.hits == hits_before + 1
+
+def test_cache_keys_include_query_params(client, sample_duns):
+    """Test that different query parameters are cached separately."""
+    response_2024 = client.get(f"/companies/{sample_duns}/income-statement?year=2024").json()
+    response_2023 = client.get(f"/companies/{sample_duns}/income-statement?year=2023").json()
+    assert {item["year"] for item in response_2024["data"]} == {2024}
+    assert {item["year"] for item in response_2023["data"]} == {2023}
+
+def test_not_found_is_not_cached(client, invalid_duns):
+    """Test that 404 responses still come from the endpoint."""
+    for _ in range(2):
+        response = client.get(f"/companies/{invalid_duns}/people")
+        assert response.status_code == 404
+
+def test_lru_eviction_bounds_size():
+    """Test that the least recently used entries are evicted to stay within the byte limit."""
+    cache = ResponseCache(max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("b", b"5678")
+    assert cache.get("a") == b"1234"  # "a" is now most recently used
+    cache.put("c", b"90ab")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+    assert cache.get("c") == b"90ab"
+    assert cache.current_bytes <= 10
+
+    cache.put("huge", b"x" * 11)
+    assert cache.get("huge") is None
+
+def test_cache_invalidated_on_data_reload(monkeypatch):
+    """Test that entries are dropped once the data version changes."""
+    cache = ResponseCache(max_bytes=100)
+    cache.put("key", b"body")
+    assert cache.get("key") == b"body"
+    monkeypatch.setattr(data_loader, "data_version", data_loader.data_version + 1)
+    assert cache.get("key") is None
+    assert cache.current_bytes == 0
+
+def test_etag_and_conditional_get(client, sample_duns):
+    """Test that data endpoints emit ETags and answer matching If-None-Match with 304."""
+    response = client.get(f"/companies/{sample_duns}/balance-sheet?year=2024")
+    etag = response.headers["etag"]
+    assert etag.startswith('"') and etag.endswith('"')
+
+    not_modified = client.get(
+        f"/companies/{sample_duns}/balance-sheet?year=2024", headers={"If-None-Match": etag}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    weak = client.get(
+        f"/companies/{sample_duns}/balance-sheet?year=2024", headers={"If-None-Match": f'"other", W/{etag}'}
+    )
+    assert weak.status_code == 304
+
+def test_conditional_get_for_unknown_company(client, sample_duns, invalid_duns):
+    """Test that If-None-Match never turns a 404 into a 304, and that * matches an existing resource."""
+    path = f"/companies/{invalid_duns}"
+    unknown_etag = compute_etag("get_company", ("company_info",), {"duns": invalid_duns})
+    assert client.get(path, headers={"If-None-Match": "*"}).status_code == 404
+    assert client.get(path, headers={"If-None-Match": unknown_etag}).status_code == 404
+    assert client.get(f"/companies/{sample_duns}", headers={"If-None-Match": "*"}).status_code == 304
+
+def test_etag_varies_with_query_and_route(client, sample_duns):
+    """Test that ETags differ between routes and query parameters, and are stable across calls."""
+    etag_2024 = client.get(f"/companies/{sample_duns}/cash-flow?year=2024").headers["etag"]
+    etag_2023 = client.get(f"/companies/{sample_duns}/cash-flow?year=2023").headers["etag"]
+    etag_income = client.get(f"/companies/{sample_duns}/income-statement?year=2024").headers["etag"]
+    assert len({etag_2024, etag_2023, etag_income}) == 3
+    assert client.get(f"/companies/{sample_duns}/cash-flow?year=2024").headers["etag"] == etag_2024
+
+    stale = client.get(f"/companies/{sample_duns}/cash-flow?year=2023", headers={"If-None-Match": etag_2024})
+    assert stale.status_code == 200
+
+def test_etag_tracks_data_versions(monkeypatch, sample_duns):
+    """Test that a company's ETag changes when its source file changes."""
+    arguments = {"duns": sample_duns, "year": None}
+    before = compute_etag("get_people", ("people",), arguments)
+    versions = dict(data_loader.data_versions)
+    versions["people"] = {**versions["people"], sample_duns: "changed"}
+    monkeypatch.setattr(data_loader, "data_versions", versions)
+    assert compute_etag("get_people", ("people",), arguments) != before
+
+def test_listing_endpoints_have_etags(client):
+    """Test that listing endpoints use the dataset-wide version for ETags."""
+    for path in ("/companies?limit=5", "/companies/search?query=sydney", "/industries"):
+        response = client.get(path)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        assert client.get(path, headers={"If-None-Match": etag}).status_code == 304
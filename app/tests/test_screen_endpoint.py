@@ -0,0 +1,87 @@
+"""
+Tests for the cross-company screening endpoint.
+"""
+import numpy as np
+import data_loader
+from screener import Screener
+
+REVENUE = "Revenue from continuing operations ($000s)"
+TOTAL_ASSETS = "TOTAL ASSETS ($000s)"
+
+def _value(store, duns, line_item, year):
+    """Look up one value the slow way, from the long-format rows."""
+    for row in store.records(duns, year=year):
+        if row["line_item"] == line_item:
+            return row["value"]
+    return None
+
+def test_screen_matches_linear_scan(client):
+    """Test that a value filter plus a YoY growth filter equals a per-company scan."""
+    response = client.post("/screen", json={
+        "filters": [
+            {"statement": "income_statement", "line_item": REVENUE, "year": 2024, "op": ">", "value": 1000000},
+            {"statement": "balance_sheet", "line_item": TOTAL_ASSETS, "year": 2024, "metric": "yoy_growth", "op": ">", "value": 0},
+        ],
+        "limit": 1000,
+    })
+    assert response.status_code == 200
+    body = response.json()
+
+    expected = []
+    for duns in data_loader.get_all_duns_numbers():
+        revenue = _value(data_loader.income_statement_data, duns, REVENUE, 2024)
+        assets = _value(data_loader.balance_sheet_data, duns, TOTAL_ASSETS, 2024)
+        previous = _value(data_loader.balance_sheet_data, duns, TOTAL_ASSETS, 2023)
+        if revenue is not None and revenue > 1000000 and None not in (assets, previous) and previous != 0 and assets > previous:
+            expected.append(duns)
+
+    assert expected
+    assert [result["duns"] for result in body["results"]] == expected
+    assert body["total"] == len(expected)
+    assert len(body["columns"]) == 2
+
+def test_screen_sort_and_pagination(client):
+    """Test that results are sorted by the sort field with missing values last, then paginated."""
+    request = {
+        "sort_by": {"statement": "income_statement", "line_item": REVENUE, "year": 2024},
+        "sort_order": "desc",
+        "limit": 1000,
+    }
+    results = client.post("/screen", json=request).json()["results"]
+    values = [result["values"][0] for result in results]
+    present = [value for value in values if value is not None]
+    assert values[:len(present)] == sorted(present, reverse=True)
+    assert all(value is None for value in values[len(present):])
+
+    page = client.post("/screen", json={**request, "limit": 5, "offset": 5}).json()
+    assert page["results"] == results[5:10]
+    assert page["total"] == len(data_loader.company_data)
+
+def test_screen_company_filters(client):
+    """Test that company_type restricts the screened universe."""
+    company_type = data_loader.search_index.list_items[0]["company_type"]
+    body = client.post("/screen", json={"company_type": company_type, "limit": 1000}).json()
+    assert body["results"]
+    for result in body["results"]:
+        assert data_loader.company_data[result["duns"]]["Company Type"] == company_type
+
+def test_screen_rejects_unknown_line_item(client):
+    """Test that unknown line items and operators are rejected."""
+    response = client.post("/screen", json={"filters": [
+        {"statement": "balance_sheet", "line_item": "Nope", "year": 2024, "op": ">", "value": 0}
+    ]})
+    assert response.status_code == 400
+    response = client.post("/screen", json={"filters": [
+        {"statement": "balance_sheet", "line_item": TOTAL_ASSETS, "year": 2024, "op": "~", "value": 0}
+    ]})
+    assert response.status_code == 422
+
+def test_screener_reads_store_cubes(sample_duns):
+    """Test that screener values come from the stores' own cubes, aligned by company and year."""
+    store = data_loader.balance_sheet_data
+    screener = Screener(["000000000", sample_duns], {"balance_sheet": store})
+    matrix = screener.matrix("balance_sheet", "total_assets")
+    assert np.isnan(matrix[0]).all()
+    for year, value in zip(screener.years.tolist(), matrix[1].tolist()):
+        expected = _value(store, sample_duns, TOTAL_ASSETS, year)
+        assert (value if value == value else None) == expected
@@ -0,0 +1,91 @@
+"""
+Tests for Arrow IPC and Parquet responses.
+"""
+import io
+import pytest
+import data_loader
+import tabular
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+def test_arrow_statement_matches_json(client, sample_duns):
+    """Test that an Arrow response holds the same rows as the JSON response, with numeric values."""
+    response = client.get(f"/companies/{sample_duns}/income-statement?year_from=2023&format=arrow")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == tabular.MEDIA_TYPES["arrow"]
+
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column_names == ["duns", "line_item", "year", "value"]
+    assert table.schema.field("value").type == pa.float64()
+    json_rows = client.get(f"/companies/{sample_duns}/income-statement?year_from=2023").json()["data"]
+    assert table.to_pylist() == json_rows
+
+def test_parquet_negotiated_from_accept_header(client, sample_duns):
+    """Test that the Accept header selects Parquet and that ETags differ per format."""
+    path = f"/companies/{sample_duns}/financials/summary?year=2024"
+    response = client.get(path, headers={"Accept": tabular.MEDIA_TYPES["parquet"]})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == tabular.MEDIA_TYPES["parquet"]
+    assert response.headers["vary"] == "Accept, Accept-Encoding"
+
+    table = pq.read_table(io.BytesIO(response.content))
+    summary = client.get(path).json()
+    assert set(table.column("statement").to_pylist()) == {"balance_sheet", "income_statement", "cash_flow"}
+    assert table.num_rows == sum(len(summary[name]) for name in ("balance_sheet", "income_statement", "cash_flow"))
+    assert client.get(path).headers["etag"] != response.headers["etag"]
+
+def test_raw_values_in_arrow(client, sample_duns):
+    """Test that include_raw adds a raw_value column with nulls for missing strings."""
+    response = client.get(f"/companies/{sample_duns}/cash-flow?year=2024&include_raw=true&format=arrow")
+    table = pa.ipc.open_stream(response.content).read_all()
+    json_rows = client.get(f"/companies/{sample_duns}/cash-flow?year=2024&include_raw=true").json()["data"]
+    assert table.column("raw_value").to_pylist() == [row["raw_value"] for row in json_rows]
+
+def test_export_parquet_streams_all_rows(client):
+    """Test that the Parquet export contains every row, split into several row groups."""
+    response = client.get("/export/cash_flow?format=parquet&year=2024")
+    assert response.status_code == 200
+    parquet_file = pq.ParquetFile(io.BytesIO(response.content))
+    expected = sum(len(data_loader.cash_flow_data.row_indices(duns, 2024)) for duns in data_loader.cash_flow_data)
+    assert parquet_file.metadata.num_rows == expected
+    assert parquet_file.num_row_groups > 1
+
+def test_missing_pyarrow_returns_406(client, sample_duns, monkeypatch):
+    """Test that Arrow/Parquet requests are refused when pyarrow is unavailable."""
+    monkeypatch.setattr(tabular, "pa", None)
+    assert client.get(f"/companies/{sample_duns}/balance-sheet?format=arrow").status_code == 406
+    assert client.get("/export/balance_sheet?format=parquet").status_code == 406
+    assert client.get(f"/companies/{sample_duns}/balance-sheet").status_code == 200
+
+def test_arrow_line_items_and_fields(client, sample_duns):
+    """Test that line item selection and field projection apply to Arrow responses."""
+    params = {"format": "arrow", "line_items": "TOTAL*", "fields": ["line_item", "value"]}
+    response = client.get(f"/companies/{sample_duns}/balance-sheet", params=params)
+    assert response.status_code == 200
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column_names == ["line_item", "value"]
+
+    expected = client.get(
+        f"/companies/{sample_duns}/balance-sheet", params={"line_items": "TOTAL*", "fields": ["line_item", "value"]}
+    ).json()["data"]
+    assert table.to_pylist() == expected
+
+def test_accept_header_q_values():
+    """Test that Accept negotiation honours q-values and wildcards rather than matching substrings."""
+    media_types = tabular.MEDIA_TYPES
+    assert tabular.negotiate("application/vnd.apache.arrow.stream;q=0", media_types, "json") == "json"
+    assert tabular.negotiate(
+        "application/json;q=0.5, application/vnd.apache.parquet;q=0.9", media_types, "json"
+    ) == "parquet"
+    assert tabular.negotiate("application/*;q=0.8, application/json;q=0.1", media_types, "json") == "arrow"
+    assert tabular.negotiate("text/html, */*;q=0.8", media_types, "json") == "json"
+    assert tabular.negotiate("*/*, application/json;q=0", media_types, "json") == "arrow"
+
+def test_wide_layout_rejected_for_arrow(client, sample_duns):
+    """Test that layout=wide is refused for Arrow/Parquet instead of silently returning long rows."""
+    url = f"/companies/{sample_duns}/balance-sheet"
+    assert client.get(url, params={"layout": "wide", "format": "arrow"}).status_code == 400
+    response = client.get(url, params={"layout": "wide"}, headers={"Accept": tabular.MEDIA_TYPES["parquet"]})
+    assert response.status_code == 400
+    assert client.get(url, params={"layout": "wide"}).status_code == 200